@@ -0,0 +1,61 @@
+"""Report cosine agreement between an embedding backend and the reference model."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import List, Sequence
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src.embedder import BgeEmbedder, check_parity  # noqa: E402
+from src.exceptions import EmbeddingError  # noqa: E402
+
+DEFAULT_SAMPLES = (
+    Path(__file__).resolve().parents[1] / "tests" / "data" / "qa_pairs.json"
+)
+
+
+def load_samples(path: Path) -> List[str]:
+    """Collect question and context strings from a QA dataset."""
+    pairs = json.loads(path.read_text(encoding="utf-8"))
+    return [
+        item[key] for item in pairs for key in ("question", "context") if key in item
+    ]
+
+
+async def run_parity(backend: str, samples: List[str], threshold: float) -> bool:
+    """Print parity statistics and return whether ``min`` meets ``threshold``."""
+    report = await check_parity(
+        BgeEmbedder(backend=backend), BgeEmbedder(backend="torch"), samples
+    )
+    print(
+        f"{backend}: min={report['min']:.4f} mean={report['mean']:.4f} "
+        f"samples={int(report['samples'])}"
+    )
+    return report["min"] >= threshold
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Entry point for the parity check."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("backend", choices=["onnx", "int8"])
+    parser.add_argument("--samples", type=Path, default=DEFAULT_SAMPLES)
+    parser.add_argument("--threshold", type=float, default=0.99)
+    args = parser.parse_args(argv)
+    try:
+        ok = asyncio.run(
+            run_parity(args.backend, load_samples(args.samples), args.threshold)
+        )
+    except EmbeddingError as exc:
+        print(exc)
+        sys.exit(1)
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Fit a vector reducer on a corpus sample and report held-out neighbor recall.
+
+The sample is read from an existing local index snapshot (``--snapshot``) or
+embedded from the chunks of a document directory (``--documents``). A random
+``--holdout`` fraction is kept out of fitting; its rows measure how many of
+each query's full-space nearest neighbors the reduced space still finds.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+from pathlib import Path
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src.document_parser import iter_document  # noqa: E402
+from src.embedder import BgeEmbedder  # noqa: E402
+from src.exceptions import (  # noqa: E402
+    DocumentParsingError,
+    EmbeddingError,
+    IndexingError,
+)
+from src.index_snapshot import read_snapshot  # noqa: E402
+from src.reduction import VectorReducer, neighbor_recall  # noqa: E402
+
+
+def snapshot_sample(root: Path, limit: int, seed: int) -> np.ndarray:
+    """Read up to ``limit`` random rows of the snapshot published at ``root``."""
+    vectors = read_snapshot(root).vectors
+    if not len(vectors):
+        raise IndexingError("snapshot holds no vectors")
+    rows = np.random.default_rng(seed).permutation(len(vectors))[:limit]
+    return np.asarray(vectors[np.sort(rows)], dtype=np.float32)
+
+
+async def documents_sample(
+    directory: Path, limit: int, max_chars: int, seed: int
+) -> np.ndarray:
+    """Embed up to ``limit`` chunks from files under ``directory``.
+
+    Files are visited in random order so the sample is not drawn from the
+    first few documents alone; unsupported or unreadable files are skipped.
+    """
+    paths = sorted(p for p in directory.rglob("*") if p.is_file())
+    random.Random(seed).shuffle(paths)
+    texts: List[str] = []
+    for path in paths:
+        try:
+            async for chunk in iter_document(path, directory, max_chars=max_chars):
+                if chunk.text.strip():
+                    texts.append(chunk.text)
+                if len(texts) >= limit:
+                    break
+        except DocumentParsingError:
+            continue
+        if len(texts) >= limit:
+            break
+    if not texts:
+        raise IndexingError("no text found in documents directory")
+    return await BgeEmbedder().embed_bulk(texts)
+
+
+def split_holdout(
+    sample: np.ndarray, fraction: float, seed: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Shuffle ``sample`` and split it into fitting and held-out rows."""
+    held = int(len(sample) * fraction)
+    if not 0 < fraction < 1 or held < 2 or held == len(sample):
+        raise IndexingError("sample too small for the requested holdout")
+    order = np.random.default_rng(seed).permutation(len(sample))
+    return sample[order[held:]], sample[order[:held]]
+
+
+async def fit(args: argparse.Namespace) -> None:
+    """Fit and save the reducer, then print recall@k on the held-out rows."""
+    if args.snapshot is not None:
+        sample = snapshot_sample(args.snapshot, args.sample, args.seed)
+    else:
+        sample = await documents_sample(
+            args.documents.resolve(), args.sample, args.chunk_chars, args.seed
+        )
+    fit_rows, held = split_holdout(sample, args.holdout, args.seed)
+    if args.kind == "pca":
+        reducer = VectorReducer.fit_pca(fit_rows, args.dimension)
+    else:
+        reducer = VectorReducer.truncate(sample.shape[1], args.dimension)
+    queries = max(1, len(held) // 5)
+    recall = neighbor_recall(reducer, held[queries:], held[:queries], args.k)
+    print(
+        f"fitted on {len(fit_rows)} vectors; "
+        f"{queries} held-out queries against {len(held) - queries} held-out vectors"
+    )
+    for k in args.k:
+        print(f"neighbor recall@{k}: {recall[k]:.3f}")
+    reducer.save(args.output)
+    print(
+        f"saved {args.kind} reducer {reducer.input_dimension}->{args.dimension} "
+        f"to {args.output}"
+    )
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Entry point for fitting a reducer."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("kind", choices=["pca", "truncate"])
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--snapshot", type=Path, help="local index snapshot root")
+    source.add_argument("--documents", type=Path, help="document directory")
+    parser.add_argument("--dimension", type=int, default=192)
+    parser.add_argument("--sample", type=int, default=5000)
+    parser.add_argument("--holdout", type=float, default=0.2)
+    parser.add_argument(
+        "--chunk-chars",
+        type=int,
+        default=int(os.getenv("INGEST_CHUNK_CHARS", "1000")),
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, default=Path("reducer.npz"))
+    parser.add_argument("--k", type=int, nargs="+", default=[1, 5, 10])
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(fit(args))
+    except (DocumentParsingError, EmbeddingError, IndexingError) as exc:
+        print(exc)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Incrementally sync a document directory into the configured vector store.
+
+Added and modified files are ingested through the concurrent pipeline, whose
+per-stage throughput and queue depth are printed while it runs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import sys
+from pathlib import Path
+from typing import Sequence
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src.dedup import NearDuplicateFilter  # noqa: E402
+from src.document_store import DocumentStore  # noqa: E402
+from src.embedder import BgeEmbedder  # noqa: E402
+from src.exceptions import (  # noqa: E402
+    DocumentParsingError,
+    EmbeddingError,
+    IndexingError,
+    OpenRouterError,
+)
+from src.ingestion import (  # noqa: E402
+    IngestionPipeline,
+    Manifest,
+    PipelineReport,
+    sync_directory,
+)
+from src.openrouter_client import OpenRouterClient  # noqa: E402
+from src.parse_cache import ParseCache  # noqa: E402
+from src.propositionizer import PropositionCache, Propositionizer  # noqa: E402
+from src.splitter import RuleSplitter  # noqa: E402
+from src.vector_store import create_vector_store  # noqa: E402
+
+_SETTINGS = ("parse_workers", "embed_workers", "upsert_workers", "queue_size")
+
+
+def _print_progress(report: PipelineReport) -> None:
+    print(f"[{report.elapsed:.0f}s] " + " | ".join(report.summary()), flush=True)
+
+
+async def sync(directory: Path, args: argparse.Namespace) -> int:
+    """Run one sync, print its report and return the number of failed files."""
+    manifest = Manifest(args.manifest) if args.manifest else Manifest()
+    documents = DocumentStore() if os.getenv("DOCUMENT_STORE_PATH") else None
+    dedup = NearDuplicateFilter() if os.getenv("DEDUP_PATH") else None
+    parse_cache = ParseCache() if os.getenv("PARSE_CACHE_PATH") else None
+    llm = args.propositions and bool(os.getenv("OPENROUTER_API_KEY"))
+    propositions = PropositionCache() if llm else None
+    overrides = {
+        name: getattr(args, name)
+        for name in (*_SETTINGS, "batch_size")
+        if getattr(args, name) is not None
+    }
+    pipeline = IngestionPipeline(
+        embedder=BgeEmbedder(),
+        index=create_vector_store(),
+        documents=documents,
+        dedup=dedup,
+        parse_cache=parse_cache,
+        splitter=RuleSplitter() if args.propositions else None,
+        propositionizer=(
+            Propositionizer(client=OpenRouterClient(), cache=propositions)
+            if llm
+            else None
+        ),
+        **overrides,
+    )
+    try:
+        report = await sync_directory(
+            directory,
+            pipeline=pipeline,
+            manifest=manifest,
+            on_progress=_print_progress,
+            interval=args.interval,
+        )
+        snapshot = os.getenv("VECTOR_STORE_PATH")
+        if snapshot and hasattr(pipeline.index, "save"):
+            await pipeline.index.save(Path(snapshot))
+    finally:
+        manifest.close()
+        for store in (documents, dedup, parse_cache, propositions):
+            if store is not None:
+                store.close()
+    if report.pipeline is not None:
+        for line in report.pipeline.summary():
+            print(line)
+    print(
+        f"added={len(report.added)} modified={len(report.modified)} "
+        f"removed={len(report.removed)} unchanged={report.unchanged} "
+        f"upserted={report.upserted} deleted={report.deleted}"
+        + (f" duplicates={report.pipeline.duplicates}" if report.pipeline else "")
+    )
+    for source, error in sorted(report.failed.items()):
+        print(f"failed {source}: {error}")
+    return len(report.failed)
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    """Entry point for the incremental sync."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("directory", type=Path)
+    parser.add_argument("--manifest", default=None)
+    parser.add_argument("--parse-workers", type=int)
+    parser.add_argument("--embed-workers", type=int)
+    parser.add_argument("--upsert-workers", type=int)
+    parser.add_argument("--queue-size", type=int)
+    parser.add_argument("--batch-size", type=int)
+    parser.add_argument("--interval", type=float, default=5.0)
+    parser.add_argument(
+        "--propositions",
+        action="store_true",
+        help="index propositions instead of raw chunks, chosen per SPLITTER_MODES",
+    )
+    args = parser.parse_args(argv)
+    try:
+        failed = asyncio.run(sync(args.directory, args))
+    except (
+        DocumentParsingError,
+        EmbeddingError,
+        IndexingError,
+        OpenRouterError,
+    ) as exc:
+        print(exc)
+        sys.exit(1)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,20 +2,29 @@
 
 from __future__ import annotations
 
-from typing import List
+from typing import List, Optional
 
 import gradio as gr  # type: ignore[import-not-found]
 
+from .document_store import DocumentStore
 from .embedder import BgeEmbedder
-from .exceptions import ChatError, RetryError
-from .pinecone_index import PineconeIndex
+from .exceptions import ChatError, IndexingError, RetryError
 from .utils.retry import async_retry
+from .vector_store import VectorStore
 
 
 async def handle_message(
-    message: str, *, embedder: BgeEmbedder, index: PineconeIndex
+    message: str,
+    *,
+    embedder: BgeEmbedder,
+    index: VectorStore,
+    documents: Optional[DocumentStore] = None,
 ) -> str:
-    """Respond to a user query using Dense X Retrieval."""
+    """Respond to a user query using Dense X Retrieval.
+
+    With a ``documents`` store the answer text is read locally instead of
+    from index metadata, which then only needs to carry ids.
+    """
     if not isinstance(message, str) or not message.strip():
         raise ChatError("message must be a non-empty string")
     try:
@@ -34,16 +43,25 @@ async def handle_message(
         raise ChatError("index query failed") from exc
     if not results:
         return "No results found."
+    if documents is not None:
+        try:
+            results = await documents.hydrate(results[:1])
+        except IndexingError as exc:
+            raise ChatError("document lookup failed") from exc
     return results[0]["metadata"].get("text", "")
 
 
 def build_interface(
     embedder: BgeEmbedder,
-    index: PineconeIndex,
+    index: VectorStore,
+    *,
+    documents: Optional[DocumentStore] = None,
 ) -> gr.ChatInterface:
     """Construct a Gradio chat interface for Dense X Retrieval."""
 
     async def responder(message: str, history: List[List[str]]) -> str:
-        return await handle_message(message, embedder=embedder, index=index)
+        return await handle_message(
+            message, embedder=embedder, index=index, documents=documents
+        )
 
     return gr.ChatInterface(responder)
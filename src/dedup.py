@@ -0,0 +1,235 @@
+"""Near-duplicate proposition filtering with MinHash and LSH banding.
+
+Each proposition is reduced to a MinHash signature over word shingles. The
+signature is split into bands, and propositions sharing any band bucket are
+candidate duplicates. Candidates are confirmed by their estimated Jaccard
+similarity. Only the first proposition of each near-duplicate group is kept
+for embedding. Its metadata lists the ids of the dropped ``aliases``.
+
+Signatures and buckets persist in SQLite, so later ingestion runs are
+deduplicated against everything already indexed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import unicodedata
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from .exceptions import IndexingError
+from .utils.sqlite_store import SqliteStore
+
+Proposition = Tuple[str, str, Dict[str, Any]]
+"""An ``(id, text, metadata)`` triple awaiting embedding."""
+
+_PRIME = np.uint64((1 << 61) - 1)
+_MASK = np.uint64(0xFFFFFFFF)
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS signatures (id TEXT PRIMARY KEY, signature BLOB)",
+    "CREATE TABLE IF NOT EXISTS buckets (key INTEGER, id TEXT, PRIMARY KEY (key, id))",
+    "CREATE TABLE IF NOT EXISTS aliases (alias TEXT PRIMARY KEY, canonical TEXT)",
+)
+
+
+def shingles(text: str, size: int = 3) -> Set[str]:
+    """Return word ``size``-grams of normalized ``text``."""
+    words = unicodedata.normalize("NFKC", text).casefold().split()
+    if len(words) <= size:
+        return {" ".join(words)}
+    return {" ".join(words[i : i + size]) for i in range(len(words) - size + 1)}
+
+
+@dataclass
+class DedupResult:
+    """Propositions to embed plus duplicates mapped to their canonical id."""
+
+    unique: List[Proposition] = field(default_factory=list)
+    aliases: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class NearDuplicateFilter(SqliteStore):
+    """Drop propositions too similar to one already kept.
+
+    A candidate is a duplicate when its estimated Jaccard similarity to a
+    kept proposition reaches ``threshold``. ``num_perm`` hash permutations
+    are split into ``bands`` LSH bands. ``path`` (``DEDUP_PATH``) stores
+    signatures across runs; ``":memory:"`` keeps them for this process only.
+    """
+
+    path: str = field(default_factory=lambda: os.getenv("DEDUP_PATH", ":memory:"))
+    threshold: float = field(
+        default_factory=lambda: float(os.getenv("DEDUP_THRESHOLD", "0.8"))
+    )
+    num_perm: int = 128
+    bands: int = 16
+    seed: int = 1
+
+    _schema = _SCHEMA
+    _db_error = IndexingError
+    _db_unavailable = "dedup store unavailable"
+
+    def __post_init__(self) -> None:
+        if self.bands < 1 or self.num_perm % self.bands:
+            raise IndexingError("bands must divide num_perm")
+        if not 0 < self.threshold <= 1:
+            raise IndexingError("threshold must be in (0, 1]")
+        rng = np.random.default_rng(self.seed)
+        self._a = rng.integers(1, 1 << 32, self.num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 32, self.num_perm, dtype=np.uint64)
+
+    def signature(self, text: str) -> np.ndarray:
+        """MinHash signature of ``text`` as ``num_perm`` uint32 values."""
+        hashes = np.fromiter(
+            (zlib.crc32(s.encode("utf-8")) for s in shingles(text)), dtype=np.uint64
+        )
+        permuted = (self._a[:, None] * hashes[None, :] + self._b[:, None]) % _PRIME
+        return (permuted & _MASK).min(axis=1).astype(np.uint32)
+
+    def band_keys(self, signature: np.ndarray) -> List[int]:
+        """One signed 64-bit bucket key per band."""
+        keys = []
+        for band, rows in enumerate(np.split(signature, self.bands)):
+            digest = hashlib.blake2b(rows.tobytes(), digest_size=8, salt=bytes([band]))
+            keys.append(int.from_bytes(digest.digest(), "big", signed=True))
+        return keys
+
+    async def filter(self, propositions: Sequence[Proposition]) -> DedupResult:
+        """Split ``propositions`` into canonical ones and duplicates.
+
+        Canonical propositions are returned in input order with an
+        ``aliases`` metadata list when batch duplicates were folded into
+        them. Duplicates of propositions stored by earlier runs appear only
+        in :attr:`DedupResult.aliases`. Signatures of new canonical
+        propositions are persisted.
+        """
+        signatures = [self.signature(text) for _, text, _ in propositions]
+        keys = [self.band_keys(sig) for sig in signatures]
+        buckets, known = await self._run_db(
+            self._lookup, sorted({k for row in keys for k in row})
+        )
+        result = DedupResult()
+        kept: Dict[str, int] = {}
+        new_rows: List[Tuple[str, np.ndarray, List[int]]] = []
+        for (prop_id, text, meta), sig, bands in zip(propositions, signatures, keys):
+            match = self._best_match(prop_id, sig, bands, buckets, known)
+            if match is None:
+                kept[prop_id] = len(result.unique)
+                result.unique.append((prop_id, text, dict(meta)))
+                new_rows.append((prop_id, sig, bands))
+                known[prop_id] = sig
+                for key in bands:
+                    buckets.setdefault(key, set()).add(prop_id)
+                continue
+            result.aliases[prop_id] = match
+            if match in kept:
+                canonical = result.unique[kept[match]][2]
+                canonical.setdefault("aliases", []).append(prop_id)
+        await self._run_db(self._store, (new_rows, result.aliases))
+        return result
+
+    async def canonical_of(self, ids: Sequence[str]) -> Dict[str, str]:
+        """Return the canonical id recorded for each aliased id in ``ids``."""
+        return await self._run_db(self._aliases, list(ids))
+
+    async def forget(self, ids: Sequence[str]) -> List[str]:
+        """Drop the signatures, buckets and aliases of ``ids``.
+
+        Returns the remaining aliases of forgotten propositions. They were
+        never embedded, so their sources must be ingested again.
+        """
+        return await self._run_db(self._forget, list(dict.fromkeys(ids)))
+
+    def _best_match(
+        self,
+        prop_id: str,
+        sig: np.ndarray,
+        bands: List[int],
+        buckets: Dict[int, Set[str]],
+        known: Dict[str, np.ndarray],
+    ) -> Optional[str]:
+        """Most similar confirmed candidate, or ``None``.
+
+        A proposition re-ingested under its own id is never its own alias.
+        """
+        candidates = set().union(*(buckets.get(key, set()) for key in bands))
+        if prop_id in candidates:
+            return None
+        best, best_score = None, self.threshold
+        for candidate in sorted(candidates):
+            score = float(np.mean(known[candidate] == sig))
+            if score >= best_score:
+                best, best_score = candidate, score
+        return best
+
+    def _lookup(
+        self, keys: List[int]
+    ) -> Tuple[Dict[int, Set[str]], Dict[str, np.ndarray]]:
+        """Fetch stored bucket members for ``keys`` and their signatures."""
+        with self._db_lock:
+            db = self._connect()
+            members = self._select(
+                db, "SELECT key, id FROM buckets WHERE key IN ({marks})", keys
+            )
+            ids = sorted({_id for _, _id in members})
+            sigs = self._select(
+                db, "SELECT id, signature FROM signatures WHERE id IN ({marks})", ids
+            )
+        buckets: Dict[int, Set[str]] = {}
+        for key, _id in members:
+            buckets.setdefault(key, set()).add(_id)
+        known = {_id: np.frombuffer(blob, dtype=np.uint32) for _id, blob in sigs}
+        return buckets, known
+
+    def _store(
+        self, payload: Tuple[List[Tuple[str, np.ndarray, List[int]]], Dict[str, str]]
+    ) -> None:
+        rows, aliases = payload
+        with self._db_lock:
+            db = self._connect()
+            db.executemany(
+                "DELETE FROM buckets WHERE id = ?", [(_id,) for _id, _, _ in rows]
+            )
+            db.executemany(
+                "INSERT OR REPLACE INTO signatures VALUES (?, ?)",
+                [(_id, sig.tobytes()) for _id, sig, _ in rows],
+            )
+            db.executemany(
+                "INSERT OR IGNORE INTO buckets VALUES (?, ?)",
+                [(key, _id) for _id, _, keys in rows for key in keys],
+            )
+            db.executemany(
+                "INSERT OR REPLACE INTO aliases VALUES (?, ?)", list(aliases.items())
+            )
+            db.commit()
+
+    def _forget(self, ids: List[str]) -> List[str]:
+        with self._db_lock:
+            db = self._connect()
+            orphans = self._select(
+                db, "SELECT alias FROM aliases WHERE canonical IN ({marks})", ids
+            )
+            rows = [(_id,) for _id in ids]
+            db.executemany("DELETE FROM signatures WHERE id = ?", rows)
+            db.executemany("DELETE FROM buckets WHERE id = ?", rows)
+            db.executemany(
+                "DELETE FROM aliases WHERE alias = ? OR canonical = ?",
+                [(_id, _id) for _id in ids],
+            )
+            db.commit()
+        return sorted({alias for (alias,) in orphans} - set(ids))
+
+    def _aliases(self, ids: List[str]) -> Dict[str, str]:
+        with self._db_lock:
+            rows = self._select(
+                self._connect(),
+                "SELECT alias, canonical FROM aliases WHERE alias IN ({marks})",
+                ids,
+            )
+        return dict(rows)
@@ -3,14 +3,57 @@
 from __future__ import annotations
 
 import asyncio
+import multiprocessing
 import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Awaitable, Callable, Dict
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 
 import aiofiles  # type: ignore[import-not-found,import-untyped]
 from PyPDF2 import PdfReader  # type: ignore[import-not-found]
 
 from .exceptions import DocumentParsingError
+from .parse_cache import ParseCache
+
+# Bump when extraction output changes so cached text is not reused.
+PARSER_VERSION = "1"
+
+# Streamed pages are cached under their own version so they never collide
+# with whole-text parse_document entries.
+_PAGES_VERSION = PARSER_VERSION + "-pages"
+
+# Block size for streaming plain-text files when no chunk size is given.
+_TEXT_BLOCK = 65536
+# The last whitespace character before the end of the searched range.
+_LAST_SPACE = re.compile(r"\s(?=\S*\Z)")
+
+
+@dataclass
+class PageChunk:
+    """A piece of document text and the 1-based page it came from.
+
+    ``index`` numbers chunks across the whole document and ``start`` is the
+    offset of ``text`` within its page; plain-text files report every chunk
+    as page 1, so there ``start`` is the offset within the file.
+    """
+
+    page: int
+    index: int
+    text: str
+    start: int = 0
 
 
 async def _read_text(path: Path) -> str:
@@ -19,14 +62,111 @@ async def _read_text(path: Path) -> str:
         return await handle.read()
 
 
+def _extract_pdf(path: Path) -> str:
+    """Extract all PDF text synchronously; runs in threads or pool workers."""
+    reader = PdfReader(path)
+    return "\n".join(page.extract_text() or "" for page in reader.pages)
+
+
 async def _read_pdf(path: Path) -> str:
     """Read a PDF file asynchronously."""
+    return await asyncio.to_thread(_extract_pdf, path)
 
-    def _sync_read() -> str:
-        reader = PdfReader(path)
-        return "\n".join(page.extract_text() or "" for page in reader.pages)
 
-    return await asyncio.to_thread(_sync_read)
+@dataclass
+class ParseResult:
+    """Outcome of parsing one file in a batch."""
+
+    path: Path
+    text: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def split_text(text: str, max_chars: Optional[int]) -> Iterator[Tuple[int, str]]:
+    """Cut ``text`` into ``(offset, piece)`` pairs of at most ``max_chars``.
+
+    Each cut falls before the last whitespace character in reach, or at
+    ``max_chars`` when there is none. No character is dropped, so the pieces
+    concatenate back to ``text``.
+    """
+    if not max_chars:
+        if text:
+            yield 0, text
+        return
+    start = 0
+    while len(text) - start > max_chars:
+        space = _LAST_SPACE.search(text, start + 1, start + max_chars + 1)
+        cut = space.start() if space else start + max_chars
+        yield start, text[start:cut]
+        start = cut
+    if start < len(text):
+        yield start, text[start:]
+
+
+async def _stream_text(
+    path: Path, max_chars: Optional[int]
+) -> AsyncIterator[Tuple[int, int, str]]:
+    """Yield a text file as page-1 ``(page, offset, piece)`` triples.
+
+    The file is read block by block rather than loaded whole.
+    """
+    size = max_chars or _TEXT_BLOCK
+    buffer, offset = "", 0
+    async with aiofiles.open(path, "r", encoding="utf-8") as handle:
+        while block := await handle.read(size):
+            pieces = list(split_text(buffer + block, size))
+            rest, buffer = pieces.pop()
+            for start, piece in pieces:
+                yield 1, offset + start, piece
+            offset += rest
+    if buffer:
+        yield 1, offset, buffer
+
+
+def _page_text(reader: Any, number: int) -> str:
+    return reader.pages[number].extract_text() or ""
+
+
+async def _stream_pdf(
+    path: Path, max_chars: Optional[int]
+) -> AsyncIterator[Tuple[int, int, str]]:
+    """Yield ``(page, offset, text)`` pieces, extracting one page at a time."""
+    reader = await asyncio.to_thread(PdfReader, path)
+    for number in range(len(reader.pages)):
+        text = await asyncio.to_thread(_page_text, reader, number)
+        for start, piece in split_text(text, max_chars):
+            yield number + 1, start, piece
+
+
+async def _stream_pdf_cached(
+    path: Path, max_chars: Optional[int], cache: ParseCache
+) -> AsyncIterator[Tuple[int, int, str]]:
+    """Like :func:`_stream_pdf`, but read and record each page in ``cache``.
+
+    Pages are cached as separate rows and held in memory one at a time. The
+    PDF is only opened when the page count or a page is missing.
+    """
+    key = await cache.key(path, _PAGES_VERSION)
+    count = await cache.page_count(key)
+    reader = None
+    if count is None:
+        reader = await asyncio.to_thread(PdfReader, path)
+        count = len(reader.pages)
+    for number in range(1, count + 1):
+        text = await cache.get_page(key, number)
+        if text is None:
+            if reader is None:
+                reader = await asyncio.to_thread(PdfReader, path)
+            text = await asyncio.to_thread(_page_text, reader, number - 1)
+            await cache.put_page(key, number, text)
+        for start, piece in split_text(text, max_chars):
+            yield number, start, piece
+    if reader is not None:
+        await cache.set_page_count(key, count)
 
 
 _PARSERS: Dict[str, Callable[[Path], Awaitable[str]]] = {
@@ -35,6 +175,24 @@ _PARSERS: Dict[str, Callable[[Path], Awaitable[str]]] = {
     ".pdf": _read_pdf,
 }
 
+_STREAMERS: Dict[
+    str, Callable[[Path, Optional[int]], AsyncIterator[Tuple[int, int, str]]]
+] = {
+    ".txt": _stream_text,
+    ".md": _stream_text,
+    ".pdf": _stream_pdf,
+}
+
+# Streamers that cache pages; text files are cheap to read and streamed as is.
+_CACHED_STREAMERS: Dict[
+    str,
+    Callable[[Path, Optional[int], ParseCache], AsyncIterator[Tuple[int, int, str]]],
+] = {".pdf": _stream_pdf_cached}
+
+
+SUPPORTED_SUFFIXES = frozenset(_STREAMERS)
+"""Lower-case file suffixes :func:`iter_document` and :func:`parse_document` accept."""
+
 
 def _resolve_base_dir(base_dir: Path | None) -> Path:
     """Resolve the base directory from an argument or environment variable."""
@@ -52,27 +210,207 @@ def _validate_path(path: Path, base_dir: Path) -> Path:
     return resolved_path
 
 
-async def parse_document(path: Path, base_dir: Path | None = None) -> str:
+async def parse_document(
+    path: Path, base_dir: Path | None = None, *, cache: ParseCache | None = None
+) -> str:
     """Parse ``path`` into text ensuring it resides under ``base_dir``.
 
     Args:
         path: The document to parse.
         base_dir: Optional directory that ``path`` must reside in. Defaults to the
             project root or ``DOCUMENT_BASE_DIR`` environment variable.
+        cache: Optional parse cache; unchanged files are served from it
+            without running a parser.
 
     Returns:
         Parsed text content.
     """
+    resolved_path = _checked_file(path, base_dir)
+    parser = _PARSERS.get(resolved_path.suffix.lower())
+    if parser is None:
+        raise DocumentParsingError("unsupported file type")
+    return await _cached(resolved_path, cache, parser)
+
+
+async def _cached(
+    path: Path, cache: ParseCache | None, parse: Callable[[Path], Awaitable[str]]
+) -> str:
+    """Return cached text for ``path`` or run ``parse`` and cache its result."""
+    if cache is None:
+        return await _run_parser(parse, path)
+    key = await cache.key(path, PARSER_VERSION)
+    text = await cache.get(key)
+    if text is None:
+        text = await _run_parser(parse, path)
+        await cache.put(key, text)
+    return text
+
+
+async def _run_parser(parse: Callable[[Path], Awaitable[str]], path: Path) -> str:
+    try:
+        return await parse(path)
+    except Exception as exc:  # noqa: BLE001
+        raise DocumentParsingError("failed to parse document") from exc
+
+
+async def iter_document(
+    path: Path,
+    base_dir: Path | None = None,
+    *,
+    max_chars: int | None = None,
+    cache: ParseCache | None = None,
+) -> AsyncIterator[PageChunk]:
+    """Stream ``path`` as page-level text chunks.
+
+    PDF pages are extracted one at a time, so memory stays bounded by a
+    single page and consumers can start before the last page is read.
+
+    Args:
+        path: The document to parse.
+        base_dir: Directory that ``path`` must reside in, as for
+            :func:`parse_document`.
+        max_chars: Optional upper bound on chunk length; longer pages are
+            split, preferably at whitespace.
+        cache: Optional parse cache; pages of unchanged PDFs are served from
+            it without extraction.
+
+    Yields:
+        :class:`PageChunk` objects in document order; whitespace-only
+        chunks are skipped.
+    """
+    if max_chars is not None and max_chars < 1:
+        raise DocumentParsingError("max_chars must be positive")
+    resolved_path = _checked_file(path, base_dir)
+    streamer = _STREAMERS.get(resolved_path.suffix.lower())
+    if streamer is None:
+        raise DocumentParsingError("unsupported file type")
+    cached = _CACHED_STREAMERS.get(resolved_path.suffix.lower())
+    if cache is not None and cached is not None:
+        pieces = cached(resolved_path, max_chars, cache)
+    else:
+        pieces = streamer(resolved_path, max_chars)
+    index = 0
+    try:
+        async for page, start, text in pieces:
+            if not text.strip():
+                continue
+            yield PageChunk(page, index, text, start)
+            index += 1
+    except DocumentParsingError:
+        raise
+    except Exception as exc:  # noqa: BLE001
+        raise DocumentParsingError("failed to parse document") from exc
+
+
+def _checked_file(path: Path, base_dir: Path | None) -> Path:
+    """Validate ``path`` against ``base_dir`` and return the resolved file."""
     if not isinstance(path, Path):
         raise DocumentParsingError("path must be a pathlib.Path instance")
     base = _resolve_base_dir(base_dir)
     resolved_path = _validate_path(path, base)
     if not resolved_path.exists() or not resolved_path.is_file():
         raise DocumentParsingError("file does not exist")
-    parser = _PARSERS.get(resolved_path.suffix.lower())
-    if parser is None:
-        raise DocumentParsingError("unsupported file type")
+    return resolved_path
+
+
+# Suffixes whose parsing is CPU-bound and worth a separate process.
+_CPU_BOUND = {".pdf": _extract_pdf}
+
+
+async def parse_documents(
+    paths: Iterable[Path],
+    base_dir: Path | None = None,
+    *,
+    workers: int | None = None,
+    mp_context: str = "spawn",
+    cache: ParseCache | None = None,
+) -> AsyncIterator[ParseResult]:
+    """Parse many files, yielding each result as soon as it completes.
+
+    PDFs are extracted in a pool of ``workers`` processes (default
+    ``PARSE_WORKERS`` or the CPU count), sidestepping the GIL; text files are
+    read on the event loop. Every path passes the same base-directory checks
+    as :func:`parse_document`. A file that fails to validate or parse yields
+    a :class:`ParseResult` with ``error`` set instead of aborting the batch.
+    At most two files per worker are in flight. With a ``cache``, unchanged
+    files skip extraction entirely.
+    """
+    count = workers or int(os.getenv("PARSE_WORKERS", str(os.cpu_count() or 1)))
+    if count < 1:
+        raise DocumentParsingError("workers must be positive")
+    executor = ProcessPoolExecutor(
+        max_workers=count, mp_context=multiprocessing.get_context(mp_context)
+    )
+    running: Dict[asyncio.Future, Path] = {}
     try:
-        return await parser(resolved_path)
+        for path in paths:
+            task = _parse_one(path, base_dir, executor, cache)
+            running[asyncio.ensure_future(task)] = path
+            if len(running) >= count * 2:
+                for result in await _completed(running, asyncio.FIRST_COMPLETED):
+                    yield result
+        for result in await _completed(running, asyncio.ALL_COMPLETED):
+            yield result
+    finally:
+        for future in running:
+            future.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def parse_directory(
+    directory: Path,
+    base_dir: Path | None = None,
+    *,
+    pattern: str = "**/*",
+    workers: int | None = None,
+    mp_context: str = "spawn",
+    cache: ParseCache | None = None,
+) -> AsyncIterator[ParseResult]:
+    """Parse every supported file under ``directory`` matching ``pattern``."""
+    if not isinstance(directory, Path) or not directory.is_dir():
+        raise DocumentParsingError("directory does not exist")
+    files = sorted(
+        path
+        for path in directory.glob(pattern)
+        if path.is_file() and path.suffix.lower() in _PARSERS
+    )
+    async for result in parse_documents(
+        files, base_dir, workers=workers, mp_context=mp_context, cache=cache
+    ):
+        yield result
+
+
+async def _parse_one(
+    path: Path,
+    base_dir: Path | None,
+    executor: ProcessPoolExecutor,
+    cache: ParseCache | None,
+) -> ParseResult:
+    """Validate and parse one file, capturing any failure in the result."""
+    try:
+        resolved_path = _checked_file(path, base_dir)
+        extract = _CPU_BOUND.get(resolved_path.suffix.lower())
+        if extract is None:
+            text = await parse_document(resolved_path, base_dir, cache=cache)
+        else:
+            loop = asyncio.get_running_loop()
+
+            async def _in_pool(file: Path) -> str:
+                return await loop.run_in_executor(executor, extract, file)
+
+            text = await _cached(resolved_path, cache, _in_pool)
     except Exception as exc:  # noqa: BLE001
-        raise DocumentParsingError("failed to parse document") from exc
+        return ParseResult(path, error=repr(exc))
+    return ParseResult(path, text)
+
+
+async def _completed(
+    running: Dict[asyncio.Future, Path], when: str
+) -> List[ParseResult]:
+    """Wait for in-flight files and return the results that finished."""
+    if not running:
+        return []
+    done, _ = await asyncio.wait(running, return_when=when)
+    for future in done:
+        running.pop(future)
+    return [future.result() for future in done]
@@ -0,0 +1,123 @@
+"""Local SQLite store for proposition text and source metadata.
+
+Vector indexes keep only ids and a few small filterable fields; the text and
+full metadata of each proposition live here and are joined back onto query
+matches with one batched lookup (see :meth:`DocumentStore.hydrate`).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .exceptions import IndexingError
+from .utils.sqlite_store import SqliteStore
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS documents ("
+    "id TEXT PRIMARY KEY, text TEXT NOT NULL, metadata TEXT NOT NULL)",
+)
+
+
+def index_fields() -> List[str]:
+    """Metadata keys kept in the vector index, from ``DOCUMENT_INDEX_FIELDS``."""
+    raw = os.getenv("DOCUMENT_INDEX_FIELDS", "source")
+    return [name.strip() for name in raw.split(",") if name.strip()]
+
+
+def slim_metadata(
+    metadata: Dict[str, Any], fields: Optional[Sequence[str]] = None
+) -> Dict[str, Any]:
+    """Return only the small, filterable ``fields`` of ``metadata``."""
+    keep = index_fields() if fields is None else fields
+    return {key: metadata[key] for key in keep if key in metadata}
+
+
+@dataclass
+class Document:
+    """Stored text and source metadata for one proposition."""
+
+    id: str
+    text: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class DocumentStore(SqliteStore):
+    """Proposition text keyed by vector id, persisted at ``path``.
+
+    ``path`` defaults to ``DOCUMENT_STORE_PATH``; ``":memory:"`` keeps the
+    store in process memory.
+    """
+
+    path: str = field(
+        default_factory=lambda: os.getenv("DOCUMENT_STORE_PATH", ":memory:")
+    )
+
+    _schema = _SCHEMA
+    _db_error = IndexingError
+    _db_unavailable = "document store unavailable"
+
+    async def put_many(self, documents: Sequence[Document]) -> None:
+        """Insert or replace ``documents``."""
+        rows = [
+            (doc.id, doc.text, json.dumps(doc.metadata, separators=(",", ":")))
+            for doc in documents
+        ]
+        await self._run_db(self._put, rows)
+
+    async def get_many(self, ids: Sequence[str]) -> Dict[str, Document]:
+        """Return stored documents for ``ids``; unknown ids are omitted."""
+        unique = list(dict.fromkeys(ids))
+        if not unique:
+            return {}
+        return await self._run_db(self._get, unique)
+
+    async def delete_many(self, ids: Sequence[str]) -> None:
+        """Remove documents by id."""
+        await self._run_db(self._delete, list(ids))
+
+    async def hydrate(self, matches: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Join stored text and metadata onto index ``matches``.
+
+        All ids are fetched in one lookup. Matches without a stored document
+        are returned unchanged, so indexes that still carry ``text`` in their
+        metadata keep working.
+        """
+        found = await self.get_many([match["id"] for match in matches if "id" in match])
+        hydrated = []
+        for match in matches:
+            doc = found.get(match.get("id", ""))
+            if doc is None:
+                hydrated.append(match)
+                continue
+            metadata = {**doc.metadata, **(match.get("metadata") or {})}
+            metadata["text"] = doc.text
+            hydrated.append({**match, "metadata": metadata})
+        return hydrated
+
+    def _put(self, rows: List[Tuple[str, str, str]]) -> None:
+        with self._db_lock:
+            db = self._connect()
+            db.executemany("INSERT OR REPLACE INTO documents VALUES (?, ?, ?)", rows)
+            db.commit()
+
+    def _get(self, ids: List[str]) -> Dict[str, Document]:
+        with self._db_lock:
+            rows = self._select(
+                self._connect(),
+                "SELECT id, text, metadata FROM documents WHERE id IN ({marks})",
+                ids,
+            )
+        return {
+            _id: Document(_id, text, json.loads(metadata))
+            for _id, text, metadata in rows
+        }
+
+    def _delete(self, ids: List[str]) -> None:
+        with self._db_lock:
+            db = self._connect()
+            db.executemany("DELETE FROM documents WHERE id = ?", [(i,) for i in ids])
+            db.commit()
@@ -3,38 +3,289 @@
 from __future__ import annotations
 
 import asyncio
-from typing import List
+import os
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    Tuple,
+)
 
+import numpy as np
 from sentence_transformers import SentenceTransformer  # type: ignore[import-not-found]
 
+from .embedding_cache import EmbeddingCache
 from .exceptions import EmbeddingError
+from .utils.batching import MicroBatcher
+from .vectors import VectorBatch, as_batch
+
+if TYPE_CHECKING:  # pragma: no cover - import cycle guard
+    from .embedding_pool import EmbeddingPool
+
+
+def _load_torch(model_name: str) -> SentenceTransformer:
+    """Load the full-precision PyTorch model."""
+    return SentenceTransformer(model_name)
+
+
+def _load_onnx(model_name: str) -> SentenceTransformer:
+    """Load the model on ONNX Runtime.
+
+    Needs the ``sentence-transformers[onnx]`` extra, which pulls in Optimum
+    and ONNX Runtime. ``EMBED_ONNX_FILE`` selects a specific export inside the model repository,
+    e.g. a pre-quantized ``onnx/model_qint8_avx512_vnni.onnx``.
+    """
+    file_name = os.getenv("EMBED_ONNX_FILE")
+    kwargs = {"model_kwargs": {"file_name": file_name}} if file_name else {}
+    return SentenceTransformer(model_name, backend="onnx", **kwargs)
+
+
+def _load_int8(model_name: str) -> SentenceTransformer:
+    """Load the model with dynamically quantized int8 linear layers on CPU."""
+    import torch  # type: ignore[import-not-found]
+
+    model = SentenceTransformer(model_name, device="cpu")
+    return torch.quantization.quantize_dynamic(
+        model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+    )
+
+
+_BACKENDS: Dict[str, Callable[[str], SentenceTransformer]] = {
+    "torch": _load_torch,
+    "onnx": _load_onnx,
+    "int8": _load_int8,
+}
 
 
 class BgeEmbedder:
-    """Asynchronous wrapper around the BGE embedding model."""
+    """Asynchronous wrapper around the BGE embedding model.
 
-    def __init__(self, model_name: str = "BAAI/bge-small-en-v1.5") -> None:
+    When ``max_batch_size`` is greater than one, concurrent ``embed`` calls are
+    coalesced into a single ``encode`` call (see :class:`MicroBatcher`). When a
+    ``cache`` is given, only texts missing from it reach the model. ``backend``
+    selects the inference runtime: ``torch`` (default), ``onnx`` or ``int8``.
+    Embeddings are returned as contiguous float32 matrices (:data:`VectorBatch`).
+    """
+
+    def __init__(
+        self,
+        model_name: str = "BAAI/bge-small-en-v1.5",
+        *,
+        max_batch_size: int | None = None,
+        max_wait_ms: float | None = None,
+        cache: EmbeddingCache | None = None,
+        backend: str | None = None,
+    ) -> None:
         self.model_name = model_name
+        self.cache = cache
+        self.backend = backend or os.getenv("EMBED_BACKEND", "torch")
+        if self.backend not in _BACKENDS:
+            raise EmbeddingError(f"unsupported embedding backend: {self.backend}")
+        # Quantized backends produce slightly different vectors; keep them apart.
+        self._cache_name = (
+            model_name if self.backend == "torch" else f"{model_name}#{self.backend}"
+        )
         self._model: SentenceTransformer | None = None
+        self._ready = False
+        if max_batch_size is None:
+            max_batch_size = int(os.getenv("EMBED_BATCH_SIZE", "1"))
+        if max_wait_ms is None:
+            max_wait_ms = float(os.getenv("EMBED_BATCH_WAIT_MS", "5"))
+        self._batcher: MicroBatcher[str, np.ndarray] | None = None
+        if max_batch_size > 1:
+            try:
+                self._batcher = MicroBatcher(
+                    self._encode,
+                    max_batch_size=max_batch_size,
+                    max_wait_ms=max_wait_ms,
+                )
+            except ValueError as exc:
+                raise EmbeddingError("invalid batching configuration") from exc
 
     async def _load(self) -> SentenceTransformer:
         if self._model is None:
             try:
                 self._model = await asyncio.to_thread(
-                    SentenceTransformer, self.model_name
+                    _BACKENDS[self.backend], self.model_name
                 )
             except Exception as exc:  # noqa: BLE001
                 raise EmbeddingError("failed to load embedding model") from exc
         return self._model
 
-    async def embed(self, texts: List[str]) -> List[List[float]]:
-        """Generate embeddings for Dense X Retrieval."""
-        if not texts or not all(isinstance(t, str) and t.strip() for t in texts):
-            raise EmbeddingError("texts must be non-empty strings")
+    @property
+    def ready(self) -> bool:
+        """Whether the model is loaded and has completed a warm-up encode."""
+        return self._ready
+
+    async def warm_up(self, sample: str = "warm-up") -> None:
+        """Load the model and run one encode so the first query pays no setup cost.
+
+        The warm-up bypasses the cache and batcher so it always reaches the model.
+        """
+        await self._encode([sample])
+        self._ready = True
+
+    async def _encode(self, texts: List[str], **kwargs: Any) -> VectorBatch:
+        """Run the model on ``texts`` in a worker thread."""
         model = await self._load()
         try:
-            return await asyncio.to_thread(
-                model.encode, texts, normalize_embeddings=True
+            vectors = await asyncio.to_thread(
+                model.encode, texts, normalize_embeddings=True, **kwargs
             )
+            return as_batch(vectors)
         except Exception as exc:  # noqa: BLE001
             raise EmbeddingError("embedding generation failed") from exc
+
+    async def embed(self, texts: List[str]) -> VectorBatch:
+        """Generate embeddings for Dense X Retrieval."""
+        if not texts or not all(isinstance(t, str) and t.strip() for t in texts):
+            raise EmbeddingError("texts must be non-empty strings")
+        if self.cache is None:
+            return await self._compute(texts)
+        cached = await self.cache.get_many(self._cache_name, texts)
+        missing = list(dict.fromkeys(t for t, v in zip(texts, cached) if v is None))
+        if not missing:
+            return np.stack(cached)  # type: ignore[arg-type]
+        vectors = await self._compute(missing)
+        await self.cache.put_many(self._cache_name, missing, vectors)
+        fresh = dict(zip(missing, vectors))
+        return np.stack(
+            [v if v is not None else fresh[t] for t, v in zip(texts, cached)]
+        )
+
+    async def _compute(self, texts: List[str]) -> VectorBatch:
+        """Encode ``texts`` through the batcher when enabled."""
+        if self._batcher is not None:
+            return await self._batcher.submit(texts)  # type: ignore[return-value]
+        return await self._encode(texts)
+
+    async def iter_embeddings(
+        self,
+        texts: List[str],
+        *,
+        batch_size: int = 64,
+        pool: EmbeddingPool | None = None,
+    ) -> AsyncIterator[Tuple[List[int], VectorBatch]]:
+        """Stream bulk embeddings as ``(positions, vectors)`` per finished batch.
+
+        Cached vectors are yielded first. Remaining texts are sorted by token
+        length and encoded in length-homogeneous buckets of ``batch_size`` so
+        short and long texts are never padded together. ``positions`` index
+        into ``texts`` so callers can restore the original order. With a
+        ``pool``, buckets are encoded in worker processes and yielded in
+        completion order; texts are then sorted by character length unless
+        the model is already loaded here.
+        """
+        if batch_size < 1:
+            raise EmbeddingError("batch_size must be positive")
+        if pool is not None and (pool.model_name, pool.backend) != (
+            self.model_name,
+            self.backend,
+        ):
+            raise EmbeddingError("embedding pool runs a different model")
+        if not texts or not all(isinstance(t, str) and t.strip() for t in texts):
+            raise EmbeddingError("texts must be non-empty strings")
+        pending = list(range(len(texts)))
+        if self.cache is not None:
+            cached = await self.cache.get_many(self._cache_name, texts)
+            pending = [i for i, vector in enumerate(cached) if vector is None]
+            hits = [i for i, vector in enumerate(cached) if vector is not None]
+            if hits:
+                yield hits, np.stack([cached[i] for i in hits])  # type: ignore[misc]
+        buckets = self._iter_buckets(texts, pending, batch_size, pool)
+        async for positions, vectors in buckets:
+            if self.cache is not None:
+                chunk = [texts[i] for i in positions]
+                await self.cache.put_many(self._cache_name, chunk, vectors)
+            yield positions, vectors
+
+    async def embed_bulk(
+        self,
+        texts: List[str],
+        *,
+        batch_size: int = 64,
+        pool: EmbeddingPool | None = None,
+    ) -> VectorBatch:
+        """Embed a large list via :meth:`iter_embeddings`, preserving input order.
+
+        The output matrix is allocated once and filled in place per bucket.
+        """
+        results: VectorBatch | None = None
+        async for positions, vectors in self.iter_embeddings(
+            texts, batch_size=batch_size, pool=pool
+        ):
+            if results is None:
+                results = np.empty((len(texts), vectors.shape[1]), dtype=np.float32)
+            results[positions] = vectors
+        return results  # type: ignore[return-value]
+
+    async def _iter_buckets(
+        self,
+        texts: List[str],
+        pending: List[int],
+        batch_size: int,
+        pool: EmbeddingPool | None,
+    ) -> AsyncIterator[Tuple[List[int], VectorBatch]]:
+        """Encode ``pending`` positions in buckets sorted by token length."""
+        if not pending:
+            return
+        order = await self._length_order([texts[i] for i in pending], load=pool is None)
+        ordered = [pending[i] for i in order]
+        buckets: List[Tuple[List[int], List[str]]] = []
+        for start in range(0, len(ordered), batch_size):
+            positions = ordered[start : start + batch_size]
+            buckets.append((positions, [texts[i] for i in positions]))
+        if pool is not None:
+            async for item in pool.iter_encode(buckets):
+                yield item
+            return
+        for positions, chunk in buckets:
+            yield positions, await self._encode(chunk, batch_size=len(chunk))
+
+    async def _length_order(self, texts: List[str], *, load: bool = True) -> List[int]:
+        """Return indices of ``texts`` sorted by tokenized length.
+
+        With ``load=False`` an unloaded model stays unloaded and texts are
+        ordered by character length instead, so a process that only feeds an
+        :class:`EmbeddingPool` never holds its own copy of the model.
+        """
+        model = await self._load() if load else self._model
+        tokenizer = getattr(model, "tokenizer", None)
+
+        def _lengths() -> List[int]:
+            if tokenizer is None:
+                return [len(text) for text in texts]
+            encoded = tokenizer(texts, add_special_tokens=False)["input_ids"]
+            return [len(ids) for ids in encoded]
+
+        try:
+            lengths = await asyncio.to_thread(_lengths)
+        except Exception as exc:  # noqa: BLE001
+            raise EmbeddingError("tokenization failed") from exc
+        return sorted(range(len(texts)), key=lengths.__getitem__)
+
+
+async def check_parity(
+    candidate: BgeEmbedder, reference: BgeEmbedder, samples: List[str]
+) -> Dict[str, float]:
+    """Report cosine agreement between two embedders on ``samples``.
+
+    Both models are queried directly, bypassing caches and batching.
+
+    Returns:
+        Mapping with ``min`` and ``mean`` cosine similarity and ``samples`` count.
+    """
+    if not samples or not all(isinstance(s, str) and s.strip() for s in samples):
+        raise EmbeddingError("samples must be non-empty strings")
+    left = await candidate._encode(samples)
+    right = await reference._encode(samples)
+    norms = np.linalg.norm(left, axis=1) * np.linalg.norm(right, axis=1)
+    scores = np.einsum("ij,ij->i", left, right) / np.maximum(norms, 1e-12)
+    return {
+        "min": float(scores.min()),
+        "mean": float(scores.mean()),
+        "samples": float(len(scores)),
+    }
@@ -0,0 +1,177 @@
+"""Two-tier embedding cache: in-memory LRU backed by a persistent SQLite store."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import sqlite3
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .exceptions import EmbeddingError
+from .utils.sqlite_store import SqliteStore
+from .vectors import Vector, VectorLike, as_vector, storage_dtype
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS embeddings ("
+    "key TEXT PRIMARY KEY, vector BLOB NOT NULL, accessed REAL NOT NULL)",
+)
+
+
+def cache_key(model_name: str, text: str) -> str:
+    """Return a stable key for ``text`` embedded by ``model_name``.
+
+    Text is NFC-normalized and whitespace-collapsed so trivially different
+    spellings of the same input share one entry.
+    """
+    normalized = " ".join(unicodedata.normalize("NFC", text).split())
+    digest = hashlib.sha256(f"{model_name}\0{normalized}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+@dataclass
+class EmbeddingCache(SqliteStore):
+    """Cache embeddings by (model name, normalized text hash).
+
+    The memory tier is bounded by entry count; the optional disk tier at
+    ``path`` is bounded by total vector bytes and evicts least recently used
+    rows first. Both tiers hold raw ``dtype`` buffers (``float16`` halves the
+    footprint); lookups always return float32 vectors.
+    """
+
+    max_entries: int = field(
+        default_factory=lambda: int(os.getenv("EMBED_CACHE_MAX_ENTRIES", "10000"))
+    )
+    path: Optional[str] = field(default_factory=lambda: os.getenv("EMBED_CACHE_PATH"))
+    max_disk_bytes: int = field(
+        default_factory=lambda: int(os.getenv("EMBED_CACHE_MAX_BYTES", "536870912"))
+    )
+    dtype: str = field(
+        default_factory=lambda: os.getenv("EMBED_CACHE_DTYPE", "float32")
+    )
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    _memory: "OrderedDict[str, np.ndarray]" = field(
+        default_factory=OrderedDict, init=False
+    )
+
+    _schema = _SCHEMA
+    _db_error = EmbeddingError
+    _db_unavailable = "embedding cache unavailable"
+
+    def __post_init__(self) -> None:
+        try:
+            self._dtype = np.dtype(storage_dtype(self.dtype))
+        except ValueError as exc:
+            raise EmbeddingError("invalid embedding cache dtype") from exc
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and the current memory tier size."""
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "memory_entries": len(self._memory),
+        }
+
+    async def get_many(
+        self, model_name: str, texts: Sequence[str]
+    ) -> List[Optional[Vector]]:
+        """Return cached vectors for ``texts`` with ``None`` for misses."""
+        keys = [self._key(model_name, text) for text in texts]
+        warm: Dict[str, np.ndarray] = {}
+        for key in keys:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                warm[key] = self._memory[key]
+        cold = [key for key in dict.fromkeys(keys) if key not in warm]
+        disk: Dict[str, np.ndarray] = {}
+        if cold and self.path:
+            disk = await self._run_db(self._disk_get, cold)
+            for key, vector in disk.items():
+                self._remember(key, vector)
+        for key in keys:
+            if key in warm:
+                self.memory_hits += 1
+            elif key in disk:
+                self.disk_hits += 1
+            else:
+                self.misses += 1
+        found = {**disk, **warm}
+        return [found[key].astype(np.float32) if key in found else None for key in keys]
+
+    async def put_many(
+        self,
+        model_name: str,
+        texts: Sequence[str],
+        vectors: Sequence[VectorLike],
+    ) -> None:
+        """Store ``vectors`` for ``texts`` in both tiers."""
+        if len(texts) != len(vectors):
+            raise EmbeddingError("texts and vectors must have equal length")
+        rows = {
+            self._key(model_name, text): as_vector(vector).astype(self._dtype)
+            for text, vector in zip(texts, vectors)
+        }
+        for key, vector in rows.items():
+            self._remember(key, vector)
+        if self.path:
+            await self._run_db(self._disk_put, rows)
+
+    def _key(self, model_name: str, text: str) -> str:
+        """Namespace keys by storage dtype so raw buffers are never misread."""
+        if self._dtype != np.float32:
+            model_name = f"{model_name}|{self._dtype.name}"
+        return cache_key(model_name, text)
+
+    def _remember(self, key: str, vector: np.ndarray) -> None:
+        """Insert into the memory tier, evicting the least recently used entry."""
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _disk_get(self, keys: List[str]) -> Dict[str, np.ndarray]:
+        with self._db_lock:
+            db = self._connect()
+            rows = self._select(
+                db, "SELECT key, vector FROM embeddings WHERE key IN ({marks})", keys
+            )
+            now = time.time()
+            db.executemany(
+                "UPDATE embeddings SET accessed = ? WHERE key = ?",
+                [(now, key) for key, _ in rows],
+            )
+            db.commit()
+        return {key: np.frombuffer(blob, dtype=self._dtype) for key, blob in rows}
+
+    def _disk_put(self, rows: Dict[str, np.ndarray]) -> None:
+        now = time.time()
+        with self._db_lock:
+            db = self._connect()
+            db.executemany(
+                "INSERT OR REPLACE INTO embeddings VALUES (?, ?, ?)",
+                [(key, vector.tobytes(), now) for key, vector in rows.items()],
+            )
+            self._evict_disk(db)
+            db.commit()
+
+    def _evict_disk(self, db: sqlite3.Connection) -> None:
+        """Delete least recently used rows until under ``max_disk_bytes``."""
+        total, count = db.execute(
+            "SELECT COALESCE(SUM(LENGTH(vector)), 0), COUNT(*) FROM embeddings"
+        ).fetchone()
+        if total <= self.max_disk_bytes or not count:
+            return
+        excess_rows = -(-(total - self.max_disk_bytes) * count // total)
+        db.execute(
+            "DELETE FROM embeddings WHERE key IN "
+            "(SELECT key FROM embeddings ORDER BY accessed, rowid LIMIT ?)",
+            (excess_rows,),
+        )
@@ -0,0 +1,141 @@
+"""Multi-process embedding pool for corpus-scale ingestion.
+
+Each worker process loads its own copy of the model and caps its intra-op
+thread count, so a large host can run several encoders side by side instead
+of sharing one interpreter. The online chat path never uses this pool.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, AsyncIterator, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .embedder import _BACKENDS
+from .exceptions import EmbeddingError
+from .vectors import VectorBatch, as_batch
+
+_WORKER_MODEL: Any = None
+
+
+def _init_worker(backend: str, model_name: str, threads: int) -> None:
+    """Load the model once per worker process with a capped thread count."""
+    global _WORKER_MODEL
+    try:
+        import torch  # type: ignore[import-not-found]
+
+        torch.set_num_threads(threads)
+    except ImportError:  # pragma: no cover - torch is optional for onnx
+        pass
+    _WORKER_MODEL = _BACKENDS[backend](model_name)
+
+
+def _encode_shard(texts: List[str]) -> np.ndarray:
+    """Encode one shard inside a worker process."""
+    return _WORKER_MODEL.encode(texts, normalize_embeddings=True, batch_size=len(texts))
+
+
+class EmbeddingPool:
+    """Process pool that encodes shards of texts in parallel."""
+
+    def __init__(
+        self,
+        model_name: str = "BAAI/bge-small-en-v1.5",
+        *,
+        backend: Optional[str] = None,
+        processes: Optional[int] = None,
+        threads_per_process: Optional[int] = None,
+        shard_size: int = 256,
+        mp_context: str = "spawn",
+    ) -> None:
+        self.model_name = model_name
+        self.backend = backend or os.getenv("EMBED_BACKEND", "torch")
+        if self.backend not in _BACKENDS:
+            raise EmbeddingError(f"unsupported embedding backend: {self.backend}")
+        self.processes = processes or int(
+            os.getenv("EMBED_POOL_PROCESSES", str(os.cpu_count() or 1))
+        )
+        threads = threads_per_process or int(os.getenv("EMBED_POOL_THREADS", "1"))
+        if self.processes < 1 or threads < 1 or shard_size < 1:
+            raise EmbeddingError("invalid embedding pool configuration")
+        self.shard_size = shard_size
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.processes,
+            mp_context=multiprocessing.get_context(mp_context),
+            initializer=_init_worker,
+            initargs=(self.backend, model_name, threads),
+        )
+
+    async def __aenter__(self) -> "EmbeddingPool":
+        return self
+
+    async def __aexit__(self, *_: object) -> None:
+        await asyncio.to_thread(self.close)
+
+    def close(self) -> None:
+        """Shut down worker processes."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    async def encode(self, texts: List[str]) -> VectorBatch:
+        """Shard ``texts`` across workers and return vectors in input order."""
+        if not texts:
+            raise EmbeddingError("texts must be non-empty")
+        shards = [
+            texts[start : start + self.shard_size]
+            for start in range(0, len(texts), self.shard_size)
+        ]
+        results = await asyncio.gather(*(self._submit(shard) for shard in shards))
+        return np.concatenate(results)
+
+    async def iter_encode(
+        self, shards: Iterable[Tuple[List[int], List[str]]]
+    ) -> AsyncIterator[Tuple[List[int], VectorBatch]]:
+        """Encode ``(positions, texts)`` shards, yielding each as it completes.
+
+        At most two shards per worker are in flight, which keeps finished but
+        unconsumed results from piling up in memory.
+        """
+        limit = self.processes * 2
+        running: dict[asyncio.Future, List[int]] = {}
+        for positions, texts in shards:
+            running[asyncio.ensure_future(self._submit(texts))] = positions
+            if len(running) >= limit:
+                async for item in self._drain(running, asyncio.FIRST_COMPLETED):
+                    yield item
+        async for item in self._drain(running, asyncio.ALL_COMPLETED):
+            yield item
+
+    async def _drain(
+        self, running: dict[asyncio.Future, List[int]], when: str
+    ) -> AsyncIterator[Tuple[List[int], VectorBatch]]:
+        """Wait for in-flight shards and yield those that finished.
+
+        If a shard failed, every other in-flight shard is cancelled before the
+        error propagates.
+        """
+        if not running:
+            return
+        done, _ = await asyncio.wait(running, return_when=when)
+        for future in done:
+            positions = running.pop(future)
+            try:
+                vectors = future.result()
+            except BaseException:
+                for other in running:
+                    other.cancel()
+                await asyncio.gather(*running, return_exceptions=True)
+                running.clear()
+                raise
+            yield positions, vectors
+
+    async def _submit(self, texts: List[str]) -> VectorBatch:
+        loop = asyncio.get_running_loop()
+        try:
+            vectors = await loop.run_in_executor(self._executor, _encode_shard, texts)
+            return as_batch(vectors)
+        except Exception as exc:  # noqa: BLE001
+            raise EmbeddingError("pooled embedding failed") from exc
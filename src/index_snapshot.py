@@ -0,0 +1,206 @@
+"""Atomic, memory-mappable snapshots for the local vector indexes.
+
+A snapshot root directory looks like::
+
+    <root>/CURRENT                       name of the live snapshot directory
+    <root>/snapshot-<ns>/vectors.npy     row-major vector matrix
+    <root>/snapshot-<ns>/ids.json        id of each row
+    <root>/snapshot-<ns>/metadata.jsonl  one JSON object per row
+    <root>/snapshot-<ns>/metadata_offsets.npy
+    <root>/snapshot-<ns>/info.json       index-specific settings
+    <root>/snapshot-<ns>/<name>.npy      index-specific arrays
+
+Snapshots are written to a temporary directory, fsynced, renamed into place
+and published by atomically replacing ``CURRENT``. Readers map the arrays
+read-only, so worker processes share one copy through the OS page cache.
+Publishing keeps the previous generation on disk, so a reader that resolved
+``CURRENT`` just before a publish can still open every file it names.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import shutil
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Sequence
+
+import numpy as np
+
+from .exceptions import IndexingError
+
+_RESERVED = {"vectors", "metadata_offsets"}
+# Published generations kept on disk: the live one and its predecessor.
+_KEEP = 2
+
+
+class MappedMetadata(Sequence[Dict[str, Any]]):
+    """Read-only metadata rows decoded lazily from a memory-mapped JSONL file."""
+
+    def __init__(self, path: Path, offsets: np.ndarray) -> None:
+        self._offsets = offsets
+        with open(path, "rb") as handle:
+            size = os.fstat(handle.fileno()).st_size
+            self._data: Any = (
+                mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+            )
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:  # type: ignore[override]
+        if not -len(self) <= index < len(self):
+            raise IndexError(index)
+        index %= len(self)
+        start, end = int(self._offsets[index]), int(self._offsets[index + 1])
+        return json.loads(self._data[start:end])
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return (self[i] for i in range(len(self)))
+
+
+@dataclass
+class Snapshot:
+    """A loaded snapshot; arrays are read-only memory maps."""
+
+    path: Path
+    vectors: np.ndarray
+    ids: List[str]
+    metadata: MappedMetadata
+    arrays: Dict[str, np.ndarray]
+    info: Dict[str, Any]
+
+
+def has_snapshot(root: Path) -> bool:
+    """Return whether ``root`` contains a published snapshot."""
+    return (Path(root) / "CURRENT").is_file()
+
+
+def write_snapshot(
+    root: Path,
+    *,
+    vectors: np.ndarray,
+    ids: Sequence[str],
+    metadata: Iterable[Dict[str, Any]],
+    arrays: Dict[str, np.ndarray] | None = None,
+    info: Dict[str, Any] | None = None,
+) -> Path:
+    """Atomically publish a new snapshot under ``root`` and prune older ones.
+
+    Raises:
+        IndexingError: If the snapshot cannot be written.
+    """
+    root = Path(root)
+    try:
+        root.mkdir(parents=True, exist_ok=True)
+        tmp = Path(tempfile.mkdtemp(prefix=".tmp-", dir=root))
+        try:
+            _write_files(tmp, vectors, ids, metadata, arrays or {}, info or {})
+            final = root / f"snapshot-{time.time_ns()}"
+            os.replace(tmp, final)
+            _publish(root, final.name)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+    except OSError as exc:
+        raise IndexingError("failed to write index snapshot") from exc
+    _prune(root, keep=_KEEP)
+    return final
+
+
+def read_snapshot(root: Path) -> Snapshot:
+    """Map the snapshot currently published under ``root``.
+
+    A snapshot pruned between reading ``CURRENT`` and opening its files is
+    retried once against the newly published one.
+
+    Raises:
+        IndexingError: If no readable snapshot exists.
+    """
+    try:
+        return _read(Path(root))
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError) as exc:
+        raise IndexingError("failed to read index snapshot") from exc
+    try:
+        return _read(Path(root))
+    except (OSError, ValueError) as exc:
+        raise IndexingError("failed to read index snapshot") from exc
+
+
+def _read(root: Path) -> Snapshot:
+    path = root / (root / "CURRENT").read_text().strip()
+    offsets = np.load(path / "metadata_offsets.npy", mmap_mode="r")
+    arrays = {
+        file.stem: np.load(file, mmap_mode="r")
+        for file in path.glob("*.npy")
+        if file.stem not in _RESERVED
+    }
+    return Snapshot(
+        path=path,
+        vectors=np.load(path / "vectors.npy", mmap_mode="r"),
+        ids=json.loads((path / "ids.json").read_text(encoding="utf-8")),
+        metadata=MappedMetadata(path / "metadata.jsonl", offsets),
+        arrays=arrays,
+        info=json.loads((path / "info.json").read_text(encoding="utf-8")),
+    )
+
+
+def _write_files(
+    path: Path,
+    vectors: np.ndarray,
+    ids: Sequence[str],
+    metadata: Iterable[Dict[str, Any]],
+    arrays: Dict[str, np.ndarray],
+    info: Dict[str, Any],
+) -> None:
+    """Write every snapshot file into ``path`` and fsync them."""
+    np.save(path / "vectors.npy", np.ascontiguousarray(vectors))
+    (path / "ids.json").write_text(json.dumps(list(ids)), encoding="utf-8")
+    offsets = [0]
+    with open(path / "metadata.jsonl", "wb") as handle:
+        for meta in metadata:
+            line = json.dumps(meta, separators=(",", ":")).encode("utf-8") + b"\n"
+            handle.write(line)
+            offsets.append(offsets[-1] + len(line))
+    np.save(path / "metadata_offsets.npy", np.asarray(offsets, dtype=np.int64))
+    for name, array in arrays.items():
+        np.save(path / f"{name}.npy", array)
+    (path / "info.json").write_text(json.dumps(info), encoding="utf-8")
+    for file in path.iterdir():
+        _fsync(file)
+    _fsync(path)
+
+
+def _publish(root: Path, name: str) -> None:
+    """Atomically point ``CURRENT`` at snapshot ``name``."""
+    pointer = root / "CURRENT.tmp"
+    pointer.write_text(name, encoding="utf-8")
+    _fsync(pointer)
+    os.replace(pointer, root / "CURRENT")
+    _fsync(root)
+
+
+def _prune(root: Path, *, keep: int) -> None:
+    """Remove all but the ``keep`` newest snapshots.
+
+    Files already mapped stay valid for open readers after removal.
+    """
+    snapshots = sorted(
+        root.glob("snapshot-*"), key=lambda p: int(p.name.rpartition("-")[2])
+    )
+    for path in snapshots[:-keep]:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+def _fsync(path: Path) -> None:
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
@@ -0,0 +1,15 @@
+"""Ingestion utilities for keeping the vector store in sync with documents."""
+
+from .manifest import Manifest, SourceEntry
+from .pipeline import IngestionPipeline, PipelineReport, StageStats
+from .sync import SyncReport, sync_directory
+
+__all__ = [
+    "IngestionPipeline",
+    "Manifest",
+    "PipelineReport",
+    "SourceEntry",
+    "StageStats",
+    "SyncReport",
+    "sync_directory",
+]
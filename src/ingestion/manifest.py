@@ -0,0 +1,97 @@
+"""Ingestion manifest: which source files produced which vectors."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List
+
+from ..exceptions import IndexingError
+from ..utils.sqlite_store import SqliteStore, hash_file
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS sources ("
+    "source TEXT PRIMARY KEY, size INTEGER NOT NULL, mtime_ns INTEGER NOT NULL, "
+    "digest TEXT NOT NULL, vector_ids TEXT NOT NULL)",
+)
+
+
+@dataclass
+class SourceEntry:
+    """Fingerprint of one ingested file and the vector ids it produced.
+
+    ``digest`` hashes the file content together with the parser version.
+    """
+
+    source: str
+    size: int
+    mtime_ns: int
+    digest: str
+    vector_ids: List[str] = field(default_factory=list)
+
+
+def content_digest(path: Path, version: str) -> str:
+    """Hash the bytes of ``path`` together with the parser ``version``."""
+    return hash_file(path, hashlib.sha256(version.encode("utf-8") + b"\0")).hexdigest()
+
+
+@dataclass
+class Manifest(SqliteStore):
+    """SQLite-backed record of ingested sources at ``path``.
+
+    ``path`` defaults to ``INGEST_MANIFEST_PATH``.
+    """
+
+    path: str = field(
+        default_factory=lambda: os.getenv(
+            "INGEST_MANIFEST_PATH", "ingest_manifest.sqlite3"
+        )
+    )
+
+    _schema = _SCHEMA
+    _db_error = IndexingError
+    _db_unavailable = "ingestion manifest unavailable"
+
+    async def entries(self) -> Dict[str, SourceEntry]:
+        """Return every recorded source keyed by its relative path."""
+        return await self._run_db(self._entries, None)
+
+    async def record(self, entry: SourceEntry) -> None:
+        """Insert or replace the entry for ``entry.source``."""
+        await self._run_db(self._record, entry)
+
+    async def remove(self, source: str) -> None:
+        """Forget ``source``."""
+        await self._run_db(self._remove, source)
+
+    def _entries(self, _: None) -> Dict[str, SourceEntry]:
+        with self._db_lock:
+            rows = self._connect().execute("SELECT * FROM sources").fetchall()
+        return {
+            source: SourceEntry(source, size, mtime_ns, digest, json.loads(ids))
+            for source, size, mtime_ns, digest, ids in rows
+        }
+
+    def _record(self, entry: SourceEntry) -> None:
+        with self._db_lock:
+            db = self._connect()
+            db.execute(
+                "INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?, ?)",
+                (
+                    entry.source,
+                    entry.size,
+                    entry.mtime_ns,
+                    entry.digest,
+                    json.dumps(entry.vector_ids),
+                ),
+            )
+            db.commit()
+
+    def _remove(self, source: str) -> None:
+        with self._db_lock:
+            db = self._connect()
+            db.execute("DELETE FROM sources WHERE source = ?", (source,))
+            db.commit()
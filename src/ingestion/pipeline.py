@@ -0,0 +1,437 @@
+"""Concurrent parse, chunk, embed and upsert stages over bounded queues.
+
+Each stage runs its own workers and hands items to the next stage through an
+``asyncio.Queue`` of at most ``queue_size`` entries. A full queue suspends
+the producing worker, so a fast parser pauses mid-document instead of
+buffering the corpus while the embedder catches up.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+)
+
+from ..dedup import NearDuplicateFilter
+from ..document_parser import PageChunk, iter_document
+from ..document_store import Document, DocumentStore, slim_metadata
+from ..exceptions import (
+    DocumentParsingError,
+    EmbeddingError,
+    IndexingError,
+    OpenRouterError,
+)
+from ..parse_cache import ParseCache
+from ..propositionizer import Proposition, Propositionizer, proposition_records
+from ..splitter import PropositionSource, RuleSplitter, select_propositionizer
+from ..vector_store import VectorStore
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from ..embedder import BgeEmbedder
+
+_DONE = object()
+
+Chunk = Tuple[str, str, Dict[str, Any]]
+"""An ``(id, text, metadata)`` chunk awaiting embedding."""
+
+
+def vector_id(source: str, index: int) -> str:
+    """Deterministic id of chunk ``index`` of ``source``."""
+    prefix = hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+    return f"{prefix}-{index}"
+
+
+@dataclass
+class StageStats:
+    """Counters for one pipeline stage.
+
+    ``busy`` is time spent working and ``blocked`` time spent waiting for
+    room in the next stage's queue; a stage with high ``blocked`` is being
+    held back by backpressure. ``max_depth`` is the deepest its input queue
+    got.
+    """
+
+    name: str
+    workers: int
+    items: int = 0
+    busy: float = 0.0
+    blocked: float = 0.0
+    depth: int = 0
+    max_depth: int = 0
+
+    def throughput(self, elapsed: float) -> float:
+        """Items handled per second over ``elapsed`` wall-clock seconds."""
+        return self.items / elapsed if elapsed > 0 else 0.0
+
+
+@dataclass
+class PipelineReport:
+    """Per-stage statistics and the outcome of one pipeline run.
+
+    ``sources`` maps every source that was parsed to the ids of the chunks
+    it produced, and ``failed`` maps sources to the first error that
+    affected them; a failed source may have been partially written.
+    ``duplicates`` counts chunks the near-duplicate filter kept from being
+    embedded.
+    """
+
+    stages: Dict[str, StageStats] = field(default_factory=dict)
+    elapsed: float = 0.0
+    chunks: int = 0
+    upserted: int = 0
+    duplicates: int = 0
+    sources: Dict[str, List[str]] = field(default_factory=dict)
+    failed: Dict[str, str] = field(default_factory=dict)
+
+    def summary(self) -> List[str]:
+        """One human-readable line per stage."""
+        return [
+            f"{s.name}: {s.items} items {s.throughput(self.elapsed):.1f}/s "
+            f"busy={s.busy:.2f}s blocked={s.blocked:.2f}s "
+            f"queue={s.depth} max_queue={s.max_depth}"
+            for s in self.stages.values()
+        ]
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+
+@dataclass
+class IngestionPipeline:
+    """Ingest documents into ``index`` through four concurrent stages.
+
+    ``parse`` streams chunks of at most ``max_chars`` from ``parse_workers``
+    files at a time through :func:`~src.document_parser.iter_document`,
+    ``chunk`` groups the resulting records into batches of ``batch_size``,
+    ``embed`` encodes batches on ``embed_workers`` workers and ``upsert``
+    writes them on ``upsert_workers`` workers. With a ``documents`` store the
+    chunk text is stored there and the index keeps slim metadata. With a
+    ``dedup`` filter, ``embed`` skips chunks that nearly duplicate one
+    already kept, and with a ``parse_cache`` unchanged PDFs are not
+    extracted again. Every setting defaults to a ``PIPELINE_*`` environment
+    variable.
+
+    With a ``splitter`` or ``propositionizer``, files are indexed as
+    propositions instead of raw chunks, using whichever of the two
+    :func:`~src.splitter.select_propositionizer` picks for the file type; a
+    default :class:`~src.splitter.RuleSplitter` stands in for a missing
+    ``splitter``. Whole pages are propositionized so the LLM gets full
+    passages to batch, and each proposition keeps its offsets in the page.
+    """
+
+    embedder: BgeEmbedder
+    index: VectorStore
+    documents: Optional[DocumentStore] = None
+    dedup: Optional[NearDuplicateFilter] = None
+    parse_cache: Optional[ParseCache] = None
+    propositionizer: Optional[Propositionizer] = None
+    splitter: Optional[RuleSplitter] = None
+    parse_workers: int = field(
+        default_factory=lambda: _env_int("PIPELINE_PARSE_WORKERS", 4)
+    )
+    embed_workers: int = field(
+        default_factory=lambda: _env_int("PIPELINE_EMBED_WORKERS", 1)
+    )
+    upsert_workers: int = field(
+        default_factory=lambda: _env_int("PIPELINE_UPSERT_WORKERS", 2)
+    )
+    queue_size: int = field(default_factory=lambda: _env_int("PIPELINE_QUEUE_SIZE", 64))
+    batch_size: int = field(default_factory=lambda: _env_int("PIPELINE_BATCH_SIZE", 64))
+    max_chars: int = field(default_factory=lambda: _env_int("INGEST_CHUNK_CHARS", 1000))
+
+    def __post_init__(self) -> None:
+        settings = (
+            self.parse_workers,
+            self.embed_workers,
+            self.upsert_workers,
+            self.queue_size,
+            self.batch_size,
+            self.max_chars,
+        )
+        if min(settings) < 1:
+            raise IndexingError("pipeline settings must be positive")
+
+    async def run(
+        self,
+        paths: Iterable[Path],
+        base_dir: Path,
+        *,
+        on_progress: Optional[Callable[[PipelineReport], None]] = None,
+        interval: float = 5.0,
+    ) -> PipelineReport:
+        """Ingest ``paths`` and return the final report.
+
+        Files must lie under ``base_dir`` and are identified in metadata by
+        their POSIX path relative to it. ``on_progress``, when given,
+        receives the live report every ``interval`` seconds.
+
+        A file outside ``base_dir`` or that fails to parse, or a batch that
+        fails to embed or upsert, is recorded in
+        :attr:`PipelineReport.failed` and the run continues.
+        """
+        base = Path(base_dir).resolve()
+        report = PipelineReport()
+        names = ("parse", "chunk", "embed", "upsert")
+        counts = (self.parse_workers, 1, self.embed_workers, self.upsert_workers)
+        stats = [StageStats(n, w) for n, w in zip(names, counts)]
+        report.stages = {s.name: s for s in stats}
+        queues: List[asyncio.Queue] = [
+            asyncio.Queue(self.queue_size) for _ in range(len(names))
+        ]
+        outboxes: List[Optional[asyncio.Queue]] = [*queues[1:], None]
+        handlers = (
+            lambda path: self._parse(path, base, report),
+            self._batcher(report),
+            lambda batch: self._embed(batch, report),
+            lambda item: self._upsert(item, report),
+        )
+        started = time.perf_counter()
+        tasks = [asyncio.create_task(self._feed(paths, queues[0], stats[0]))]
+        for position, handler in enumerate(handlers):
+            downstream = counts[position + 1] if position + 1 < len(counts) else 0
+            tasks.append(
+                asyncio.create_task(
+                    self._stage(
+                        stats[position],
+                        queues[position],
+                        outboxes[position],
+                        handler,
+                        downstream,
+                        stats[position + 1] if downstream else None,
+                    )
+                )
+            )
+        monitor = None
+        if on_progress is not None:
+            monitor = asyncio.create_task(
+                self._monitor(report, started, on_progress, interval)
+            )
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            for task in tasks if monitor is None else [*tasks, monitor]:
+                task.cancel()
+            report.elapsed = time.perf_counter() - started
+        return report
+
+    async def _feed(
+        self, paths: Iterable[Path], queue: asyncio.Queue, stats: StageStats
+    ) -> None:
+        for path in paths:
+            await self._put(queue, path, stats)
+        for _ in range(self.parse_workers):
+            await queue.put(_DONE)
+
+    async def _stage(
+        self,
+        stats: StageStats,
+        inbox: asyncio.Queue,
+        outbox: Optional[asyncio.Queue],
+        handler: Callable[[Any], AsyncIterator[Any]],
+        downstream: int,
+        next_stats: Optional[StageStats],
+    ) -> None:
+        """Run ``stats.workers`` workers, then signal ``downstream`` workers."""
+
+        async def worker() -> None:
+            while (item := await inbox.get()) is not _DONE:
+                stats.depth = inbox.qsize()
+                await self._handle(item, handler, outbox, stats, next_stats)
+            await self._handle(_DONE, handler, outbox, stats, next_stats)
+
+        await asyncio.gather(*(worker() for _ in range(stats.workers)))
+        if outbox is not None:
+            for _ in range(downstream):
+                await outbox.put(_DONE)
+
+    async def _handle(
+        self,
+        item: Any,
+        handler: Callable[[Any], AsyncIterator[Any]],
+        outbox: Optional[asyncio.Queue],
+        stats: StageStats,
+        next_stats: Optional[StageStats],
+    ) -> None:
+        """Drive ``handler`` over ``item``, timing work apart from blocking."""
+        if item is not _DONE:
+            stats.items += 1
+        start = time.perf_counter()
+        async for result in handler(item):
+            waiting = time.perf_counter()
+            stats.busy += waiting - start
+            if outbox is not None and next_stats is not None:
+                await self._put(outbox, result, next_stats)
+            start = time.perf_counter()
+            stats.blocked += start - waiting
+        stats.busy += time.perf_counter() - start
+
+    @staticmethod
+    async def _put(queue: asyncio.Queue, item: Any, stats: StageStats) -> None:
+        await queue.put(item)
+        stats.depth = queue.qsize()
+        stats.max_depth = max(stats.max_depth, stats.depth)
+
+    async def _monitor(
+        self,
+        report: PipelineReport,
+        started: float,
+        on_progress: Callable[[PipelineReport], None],
+        interval: float,
+    ) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            report.elapsed = time.perf_counter() - started
+            on_progress(report)
+
+    async def _parse(
+        self, path: Any, base: Path, report: PipelineReport
+    ) -> AsyncIterator[Tuple[str, List[Chunk]]]:
+        """Yield ``(source, records)`` for every page chunk of ``path``."""
+        if path is _DONE:
+            return
+        try:
+            source = _source(Path(path), base)
+            proposer = self._proposer(Path(path))
+        except (DocumentParsingError, OpenRouterError, ValueError) as exc:
+            report.failed.setdefault(str(path), str(exc))
+            return
+        report.sources[source] = []
+        count = 0
+        try:
+            chunks = iter_document(
+                Path(path),
+                base,
+                max_chars=None if proposer else self.max_chars,
+                cache=self.parse_cache,
+            )
+            async for chunk in chunks:
+                records = await _records(source, chunk, proposer, count)
+                count += len(records)
+                yield source, records
+        except (DocumentParsingError, OpenRouterError) as exc:
+            report.failed.setdefault(source, str(exc))
+
+    def _proposer(self, path: Path) -> Optional[PropositionSource]:
+        """The propositionizer for ``path``, or ``None`` to keep raw chunks."""
+        if self.propositionizer is None and self.splitter is None:
+            return None
+        rules = self.splitter or RuleSplitter()
+        return select_propositionizer(path, self.propositionizer, rules)
+
+    def _batcher(
+        self, report: PipelineReport
+    ) -> Callable[[Any], AsyncIterator[List[Chunk]]]:
+        """Build the chunk handler, which fills batches across calls."""
+        batch: List[Chunk] = []
+
+        async def chunk(item: Any) -> AsyncIterator[List[Chunk]]:
+            nonlocal batch
+            if item is _DONE:
+                if batch:
+                    yield batch
+                    batch = []
+                return
+            source, records = item
+            report.sources[source] += [_id for _id, _, _ in records]
+            report.chunks += len(records)
+            batch += records
+            while len(batch) >= self.batch_size:
+                yield batch[: self.batch_size]
+                batch = batch[self.batch_size :]
+
+        return chunk
+
+    async def _embed(
+        self, batch: Any, report: PipelineReport
+    ) -> AsyncIterator[Tuple[List[Chunk], Any]]:
+        if batch is _DONE:
+            return
+        try:
+            if self.dedup is not None:
+                unique = (await self.dedup.filter(batch)).unique
+                report.duplicates += len(batch) - len(unique)
+                batch = unique
+            if not batch:
+                return
+            vectors = await self.embedder.embed_bulk([text for _, text, _ in batch])
+        except (EmbeddingError, IndexingError) as exc:
+            _fail(report, batch, exc)
+            return
+        yield batch, vectors
+
+    async def _upsert(self, item: Any, report: PipelineReport) -> AsyncIterator[int]:
+        if item is _DONE:
+            return
+        batch, vectors = item
+        try:
+            if self.documents is not None:
+                await self.documents.put_many([Document(*chunk) for chunk in batch])
+                metas = [slim_metadata(meta) for _, _, meta in batch]
+            else:
+                metas = [{**meta, "text": text} for _, text, meta in batch]
+            await self.index.upsert(
+                [(c[0], vec, meta) for c, vec, meta in zip(batch, vectors, metas)]
+            )
+        except IndexingError as exc:
+            _fail(report, batch, exc)
+            return
+        report.upserted += len(batch)
+        yield len(batch)
+
+
+def _source(path: Path, base: Path) -> str:
+    """``path`` relative to ``base`` in POSIX form.
+
+    Raises:
+        DocumentParsingError: If ``path`` is not inside ``base``.
+    """
+    resolved = path.resolve()
+    if base not in resolved.parents:
+        raise DocumentParsingError("access outside base directory is forbidden")
+    return resolved.relative_to(base).as_posix()
+
+
+async def _records(
+    source: str, chunk: PageChunk, proposer: Optional[PropositionSource], first: int
+) -> List[Chunk]:
+    """Records of one page chunk: itself, or its propositions numbered from ``first``.
+
+    ``start`` and ``end`` in the metadata are offsets within the page.
+    """
+    where = {"source": source, "page": chunk.page, "chunk": chunk.index}
+    if proposer is None:
+        return [
+            (
+                vector_id(source, chunk.index),
+                chunk.text,
+                {**where, "start": chunk.start},
+            )
+        ]
+    found = await proposer.propositionize(chunk.text)
+    shifted = [
+        Proposition(p.text, chunk.start + p.start, chunk.start + p.end) for p in found
+    ]
+    return [
+        (_id, text, {**meta, **where})
+        for _id, text, meta in proposition_records(source, shifted, first=first)
+    ]
+
+
+def _fail(report: PipelineReport, batch: List[Chunk], exc: Exception) -> None:
+    for _, _, meta in batch:
+        report.failed.setdefault(meta["source"], str(exc))
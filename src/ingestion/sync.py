@@ -0,0 +1,191 @@
+"""Incremental synchronization of a document directory into a vector store.
+
+Every supported file under the directory is compared with its manifest
+entry. Unchanged files are skipped without reading them when size and mtime
+match, and after a content hash otherwise. Added and modified files are
+ingested in one run of an :class:`~.pipeline.IngestionPipeline`; vectors of
+removed files, and chunks a modified file no longer produces, are deleted.
+
+When the pipeline deduplicates, the signatures of changed and removed files
+are forgotten first, and files whose chunks were folded into a forgotten
+chunk are ingested again.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from ..dedup import NearDuplicateFilter
+from ..document_parser import PARSER_VERSION, SUPPORTED_SUFFIXES
+from ..document_store import DocumentStore
+from ..exceptions import DocumentParsingError
+from ..vector_store import VectorStore
+from .manifest import Manifest, SourceEntry, content_digest
+from .pipeline import IngestionPipeline, PipelineReport
+
+
+@dataclass
+class SyncReport:
+    """Sources touched by one sync and the vector counts written or removed.
+
+    ``failed`` maps sources that could not be processed to their error.
+    Their manifest entries keep every id they may have written and a blank
+    digest, so the next sync retries them and cleans up after itself.
+    ``pipeline`` is the report of the ingestion run, if one was needed.
+    """
+
+    added: List[str] = field(default_factory=list)
+    modified: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    unchanged: int = 0
+    upserted: int = 0
+    deleted: int = 0
+    failed: Dict[str, str] = field(default_factory=dict)
+    pipeline: Optional[PipelineReport] = None
+
+
+def _scan(directory: Path) -> Dict[str, Path]:
+    """Supported files under ``directory`` keyed by POSIX relative path."""
+    return {
+        path.relative_to(directory).as_posix(): path
+        for path in sorted(directory.rglob("*"))
+        if path.is_file() and path.suffix.lower() in SUPPORTED_SUFFIXES
+    }
+
+
+def _fingerprint(
+    source: str, path: Path, entry: Optional[SourceEntry]
+) -> Optional[SourceEntry]:
+    """Fresh entry for ``path``, or ``None`` when size and mtime still match.
+
+    The content is only hashed once the cheap stat comparison fails.
+    """
+    stat = path.stat()
+    if entry and (entry.size, entry.mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+        return None
+    digest = content_digest(path, PARSER_VERSION)
+    return SourceEntry(source, stat.st_size, stat.st_mtime_ns, digest)
+
+
+async def sync_directory(
+    directory: Path,
+    *,
+    pipeline: IngestionPipeline,
+    manifest: Manifest,
+    on_progress: Optional[Callable[[PipelineReport], None]] = None,
+    interval: float = 5.0,
+) -> SyncReport:
+    """Bring ``pipeline.index`` in line with the files under ``directory``.
+
+    Changed files go through ``pipeline``, so chunking, embedding and
+    storage follow its settings; ``on_progress`` and ``interval`` are
+    passed to :meth:`IngestionPipeline.run`.
+    """
+    directory = Path(directory).resolve()
+    if not directory.is_dir():
+        raise DocumentParsingError("directory does not exist")
+    known = await manifest.entries()
+    files = _scan(directory)
+    report = SyncReport()
+    changed: Dict[str, Tuple[SourceEntry, Optional[SourceEntry]]] = {}
+    for source, path in files.items():
+        entry = known.get(source)
+        fresh = await asyncio.to_thread(_fingerprint, source, path, entry)
+        if fresh is None:
+            report.unchanged += 1
+        elif entry and entry.digest == fresh.digest:
+            fresh.vector_ids = entry.vector_ids
+            await manifest.record(fresh)
+            report.unchanged += 1
+        else:
+            changed[source] = (fresh, entry)
+    removed = sorted(set(known) - set(files))
+    if pipeline.dedup is not None:
+        await _release(pipeline.dedup, known, files, changed, removed)
+    if changed:
+        outcome = await pipeline.run(
+            [files[source] for source in changed],
+            directory,
+            on_progress=on_progress,
+            interval=interval,
+        )
+        report.pipeline = outcome
+        for source, (fresh, entry) in changed.items():
+            await _settle(fresh, entry, outcome, report, pipeline, manifest)
+    for source in removed:
+        await _delete(known[source].vector_ids, pipeline.index, pipeline.documents)
+        await manifest.remove(source)
+        report.removed.append(source)
+        report.deleted += len(known[source].vector_ids)
+    return report
+
+
+async def _release(
+    dedup: NearDuplicateFilter,
+    known: Dict[str, SourceEntry],
+    files: Dict[str, Path],
+    changed: Dict[str, Tuple[SourceEntry, Optional[SourceEntry]]],
+    removed: List[str],
+) -> None:
+    """Forget the dedup state of ``changed`` and ``removed`` sources.
+
+    Sources owning an alias of a forgotten chunk are added to ``changed``,
+    and their own chunks are forgotten in turn.
+    """
+    owners = {_id: src for src, entry in known.items() for _id in entry.vector_ids}
+    pending = [src for src in [*changed, *removed] if src in known]
+    while pending:
+        orphans = await dedup.forget(
+            [_id for src in pending for _id in known[src].vector_ids]
+        )
+        pending = sorted(
+            {owners[alias] for alias in orphans if alias in owners}
+            - set(changed)
+            - set(removed)
+        )
+        for source in pending:
+            fresh = await asyncio.to_thread(_fingerprint, source, files[source], None)
+            changed[source] = (fresh, known[source])
+
+
+async def _settle(
+    fresh: SourceEntry,
+    previous: Optional[SourceEntry],
+    outcome: PipelineReport,
+    report: SyncReport,
+    pipeline: IngestionPipeline,
+    manifest: Manifest,
+) -> None:
+    """Record the pipeline's outcome for ``fresh.source`` in the manifest.
+
+    A source whose last attempt failed counts as added, not modified.
+    """
+    source = fresh.source
+    ids = outcome.sources.get(source, [])
+    old = previous.vector_ids if previous else []
+    error = outcome.failed.get(source)
+    if error is not None:
+        report.failed[source] = error
+        written = sorted(set(old) | set(ids))
+        await manifest.record(SourceEntry(source, -1, -1, "", written))
+        return
+    stale = sorted(set(old) - set(ids))
+    await _delete(stale, pipeline.index, pipeline.documents)
+    fresh.vector_ids = ids
+    await manifest.record(fresh)
+    (report.modified if previous and previous.digest else report.added).append(source)
+    report.upserted += len(ids)
+    report.deleted += len(stale)
+
+
+async def _delete(
+    ids: List[str], index: VectorStore, documents: Optional[DocumentStore]
+) -> None:
+    if not ids:
+        return
+    await index.delete(ids)
+    if documents is not None:
+        await documents.delete_many(ids)
@@ -0,0 +1,809 @@
+"""In-process vector indexes implementing the :class:`VectorStore` interface.
+
+``ExactIndex`` scores every stored vector with one matrix product and suits
+personal-scale corpora. ``HnswIndex`` adds a hierarchical navigable small
+world graph for approximate search over larger corpora. ``PqIndex`` searches
+compact product-quantized codes and exactly re-ranks a shortlist, so the
+full vectors can stay on disk. All use cosine similarity and return matches
+shaped like Pinecone's. Any index can be persisted with :meth:`ExactIndex.save`
+and memory-mapped back with :meth:`ExactIndex.load` (see :mod:`.index_snapshot`).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import math
+import random
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple, Type, TypeVar
+
+import numpy as np
+
+from .exceptions import IndexingError
+from .index_snapshot import Snapshot, read_snapshot, write_snapshot
+from .vectors import (
+    QueryResult,
+    Vector,
+    VectorBatch,
+    VectorLike,
+    as_batch,
+    as_vector,
+    storage_dtype,
+)
+
+# Rows scored per matrix product; bounds temporaries for float16 storage.
+_SCORE_BLOCK = 65536
+# Queries scored together by ``query_many``; bounds the score matrix.
+_QUERY_BLOCK = 64
+
+IndexT = TypeVar("IndexT", bound="ExactIndex")
+
+
+def _normalize(batch: VectorBatch) -> VectorBatch:
+    """Scale rows to unit length so dot products are cosine similarities."""
+    norms = np.linalg.norm(batch, axis=1, keepdims=True)
+    return batch / np.maximum(norms, 1e-12)
+
+
+class ExactIndex:
+    """Exact cosine search over a contiguous, growable vector matrix.
+
+    An index loaded from a snapshot serves queries straight from the
+    read-only memory map and copies into RAM on its first write.
+    """
+
+    _KIND = "exact"
+
+    def __init__(self, *, dimension: int = 384, dtype: str | None = None) -> None:
+        if dimension < 1:
+            raise IndexingError("dimension must be positive")
+        try:
+            self._dtype = np.dtype(storage_dtype(dtype))
+        except ValueError as exc:
+            raise IndexingError("invalid storage dtype") from exc
+        self.dimension = dimension
+        self._matrix = np.empty((0, dimension), dtype=self._dtype)
+        self._size = 0
+        self._ids: List[str] = []
+        self._metadata: List[Dict[str, Any]] = []
+        self._positions: Dict[str, int] = {}
+        self._write_lock = asyncio.Lock()
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    async def upsert(
+        self, items: List[Tuple[str, VectorLike, Dict[str, Any]]], *, retries: int = 3
+    ) -> None:
+        """Insert or replace vectors. ``retries`` exists for interface parity."""
+        ids, batch, metadata = self._validated(items)
+        async with self._write_lock:
+            self._writable()
+            self._upsert_rows(ids, batch, metadata)
+
+    async def query(
+        self, vector: VectorLike, *, top_k: int = 1, retries: int = 3
+    ) -> List[Dict[str, Any]]:
+        """Return the ``top_k`` most similar stored vectors."""
+        query = self._query_vector(vector, top_k)
+        if not self._size:
+            return []
+        return self._top(self._scores(query[:, None])[:, 0], top_k)
+
+    async def query_many(
+        self, vectors: Any, *, top_k: int = 1, retries: int = 3
+    ) -> List[QueryResult]:
+        """Query every row of ``vectors`` with one matrix product per block."""
+        queries = self._query_matrix(vectors, top_k)
+        if not self._size:
+            return [QueryResult() for _ in range(len(queries))]
+        results = []
+        for start in range(0, len(queries), _QUERY_BLOCK):
+            block = queries[start : start + _QUERY_BLOCK]
+            scores = self._scores(block.T)
+            results.extend(
+                QueryResult(self._top(scores[:, i], top_k)) for i in range(len(block))
+            )
+        return results
+
+    async def delete(self, ids: List[str], *, retries: int = 3) -> None:
+        """Remove vectors by id."""
+        if not ids:
+            raise IndexingError("no ids provided")
+        async with self._write_lock:
+            self._writable()
+            self._delete_rows(ids)
+
+    async def save(self, root: Path) -> Path:
+        """Atomically write a snapshot of the index under ``root``."""
+        async with self._write_lock:
+            return await asyncio.to_thread(self.write_snapshot, Path(root))
+
+    def write_snapshot(self, root: Path) -> Path:
+        """Blocking variant of :meth:`save`."""
+        arrays, info = self._snapshot_state()
+        return write_snapshot(
+            root,
+            vectors=self._matrix[: self._size],
+            ids=self._ids,
+            metadata=self._metadata,
+            arrays=arrays,
+            info=info,
+        )
+
+    @classmethod
+    async def load(cls: Type[IndexT], root: Path, **kwargs: Any) -> IndexT:
+        """Memory-map the snapshot published under ``root``."""
+        return await asyncio.to_thread(cls.from_snapshot, Path(root), **kwargs)
+
+    @classmethod
+    def from_snapshot(cls: Type[IndexT], root: Path, **kwargs: Any) -> IndexT:
+        """Blocking variant of :meth:`load`."""
+        snapshot = read_snapshot(root)
+        if snapshot.info.get("kind") != cls._KIND:
+            raise IndexingError("snapshot was written by a different index type")
+        vectors = snapshot.vectors
+        settings = {**cls._settings(snapshot.info), **kwargs}
+        index = cls(dimension=vectors.shape[1], dtype=vectors.dtype.name, **settings)
+        index._restore(snapshot)
+        return index
+
+    @classmethod
+    def _settings(cls, info: Dict[str, Any]) -> Dict[str, Any]:
+        """Constructor arguments recovered from a snapshot's settings."""
+        return {}
+
+    def _snapshot_state(self) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+        """Return extra arrays and settings to persist with the vectors."""
+        return {}, {"kind": self._KIND}
+
+    def _restore(self, snapshot: Snapshot) -> None:
+        """Adopt a mapped snapshot without copying its arrays."""
+        self._matrix = snapshot.vectors
+        self._size = len(snapshot.ids)
+        self._ids = list(snapshot.ids)
+        self._metadata = snapshot.metadata  # type: ignore[assignment]
+        self._positions = {_id: i for i, _id in enumerate(self._ids)}
+
+    def _writable(self) -> None:
+        """Copy mapped snapshot data into RAM before the first mutation."""
+        if not self._matrix.flags.writeable:
+            self._matrix = np.array(self._matrix[: self._size])
+        if not isinstance(self._metadata, list):
+            self._metadata = list(self._metadata)
+
+    def _upsert_rows(
+        self, ids: List[str], batch: VectorBatch, metadata: List[Dict[str, Any]]
+    ) -> None:
+        """Overwrite rows for known ids and append the rest."""
+        fresh: List[int] = []
+        for row, _id in enumerate(ids):
+            position = self._positions.get(_id)
+            if position is None:
+                fresh.append(row)
+                continue
+            self._matrix[position] = batch[row]
+            self._metadata[position] = metadata[row]
+        if fresh:
+            positions = self._append(batch[fresh])
+            for row, position in zip(fresh, positions):
+                self._register(ids[row], metadata[row], position)
+
+    def _delete_rows(self, ids: List[str]) -> None:
+        """Remove rows, moving the last row into each freed slot."""
+        for _id in ids:
+            position = self._positions.pop(_id, None)
+            if position is None:
+                continue
+            last = self._size - 1
+            if position != last:
+                self._move_row(last, position)
+                self._ids[position] = self._ids[last]
+                self._metadata[position] = self._metadata[last]
+                self._positions[self._ids[position]] = position
+            self._ids.pop()
+            self._metadata.pop()
+            self._size -= 1
+
+    def _validated(
+        self, items: List[Tuple[str, VectorLike, Dict[str, Any]]]
+    ) -> Tuple[List[str], VectorBatch, List[Dict[str, Any]]]:
+        """Deduplicate ``items`` (last wins) and return normalized vectors."""
+        if not items:
+            raise IndexingError("no items provided")
+        latest = {_id: (vector, meta) for _id, vector, meta in items}
+        ids = list(latest)
+        try:
+            batch = as_batch([latest[_id][0] for _id in ids])
+        except ValueError as exc:
+            raise IndexingError("invalid vectors") from exc
+        if batch.shape[1] != self.dimension:
+            raise IndexingError("vector dimension mismatch")
+        return ids, _normalize(batch), [dict(latest[_id][1] or {}) for _id in ids]
+
+    def _query_matrix(self, vectors: Any, top_k: int) -> VectorBatch:
+        if top_k < 1:
+            raise IndexingError("top_k must be positive")
+        try:
+            queries = as_batch(vectors)
+        except ValueError as exc:
+            raise IndexingError("vectors must be a non-empty matrix") from exc
+        if queries.shape[1] != self.dimension:
+            raise IndexingError("vector dimension mismatch")
+        return _normalize(queries)
+
+    def _query_vector(self, vector: VectorLike, top_k: int) -> Vector:
+        if top_k < 1:
+            raise IndexingError("top_k must be positive")
+        try:
+            query = as_vector(vector)
+        except ValueError as exc:
+            raise IndexingError("vector required") from exc
+        if query.shape[0] != self.dimension:
+            raise IndexingError("vector dimension mismatch")
+        return _normalize(query[None, :])[0]
+
+    def _move_row(self, source: int, target: int) -> None:
+        """Copy the stored data of row ``source`` into row ``target``."""
+        self._matrix[target] = self._matrix[source]
+
+    def _append(self, batch: VectorBatch) -> range:
+        """Copy ``batch`` after the last row, growing capacity geometrically."""
+        start, end = self._size, self._size + len(batch)
+        if end > len(self._matrix):
+            capacity = max(end, 2 * len(self._matrix), 1024)
+            grown = np.empty((capacity, self.dimension), dtype=self._dtype)
+            grown[:start] = self._matrix[:start]
+            self._matrix = grown
+        self._matrix[start:end] = batch
+        self._size = end
+        return range(start, end)
+
+    def _register(self, _id: str, metadata: Dict[str, Any], position: int) -> None:
+        self._ids.append(_id)
+        self._metadata.append(metadata)
+        self._positions[_id] = position
+
+    def _scores(self, queries: np.ndarray) -> np.ndarray:
+        """Cosine similarity of each column of ``queries`` against every row."""
+        scores = np.empty((self._size, queries.shape[1]), dtype=np.float32)
+        for start in range(0, self._size, _SCORE_BLOCK):
+            block = self._matrix[start : min(start + _SCORE_BLOCK, self._size)]
+            scores[start : start + len(block)] = (
+                block.astype(np.float32, copy=False) @ queries
+            )
+        return scores
+
+    def _top(self, scores: np.ndarray, top_k: int) -> List[Dict[str, Any]]:
+        """Matches for the ``top_k`` highest of ``scores``, best first."""
+        k = min(top_k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [self._match(int(p), float(scores[p])) for p in top]
+
+    def _similarity(self, query: Vector, positions: Sequence[int]) -> np.ndarray:
+        """Cosine similarity of ``query`` against selected rows."""
+        return self._matrix[list(positions)].astype(np.float32, copy=False) @ query
+
+    def _match(self, position: int, score: float) -> Dict[str, Any]:
+        return {
+            "id": self._ids[position],
+            "score": score,
+            "metadata": self._metadata[position],
+        }
+
+
+class HnswIndex(ExactIndex):
+    """Approximate cosine search over a hierarchical navigable small world graph.
+
+    Rows are append-only: replacing or deleting an id tombstones its node,
+    which stays in the graph for navigation but is never returned;
+    :meth:`compact` rebuilds the graph from live rows. An index loaded from
+    a snapshot searches the mapped adjacency arrays in place and keeps
+    in-memory lists only for nodes changed since.
+    """
+
+    _KIND = "hnsw"
+
+    def __init__(
+        self,
+        *,
+        dimension: int = 384,
+        dtype: str | None = None,
+        m: int = 16,
+        ef_construction: int = 100,
+        ef_search: int = 50,
+        seed: int | None = None,
+    ) -> None:
+        super().__init__(dimension=dimension, dtype=dtype)
+        if m < 2 or ef_construction < 1 or ef_search < 1:
+            raise IndexingError("invalid HNSW parameters")
+        self.m = m
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self._rng = random.Random(seed)
+        self._level_mult = 1 / math.log(m)
+        self._reset_graph()
+
+    @property
+    def tombstones(self) -> int:
+        """Number of replaced or deleted nodes still in the graph."""
+        return len(self._deleted)
+
+    async def upsert(
+        self, items: List[Tuple[str, VectorLike, Dict[str, Any]]], *, retries: int = 3
+    ) -> None:
+        """Insert vectors; graph construction runs in a worker thread."""
+        ids, batch, metadata = self._validated(items)
+        async with self._write_lock:
+            await asyncio.to_thread(self._insert, ids, batch, metadata)
+
+    async def compact(self) -> None:
+        """Rebuild the graph from live rows, dropping every tombstone."""
+        async with self._write_lock:
+            await asyncio.to_thread(self._compact)
+
+    def _insert(
+        self, ids: List[str], batch: VectorBatch, metadata: List[Dict[str, Any]]
+    ) -> None:
+        self._writable()
+        self._upsert_rows(ids, batch, metadata)
+
+    def _compact(self) -> None:
+        self._writable()
+        live = sorted(self._positions.values())
+        ids = [self._ids[p] for p in live]
+        metadata = [self._metadata[p] for p in live]
+        vectors = np.array(self._matrix[live], dtype=self._dtype)
+        self._matrix = np.empty((0, self.dimension), dtype=self._dtype)
+        self._size = 0
+        self._ids, self._metadata, self._positions = [], [], {}
+        self._reset_graph()
+        if ids:
+            self._upsert_rows(ids, vectors, metadata)
+
+    def _reset_graph(self) -> None:
+        # Adjacency of nodes changed in memory; other nodes live in ``_csr``.
+        self._links: Dict[int, List[List[int]]] = {}
+        self._csr: Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray] | None = None
+        self._entry: int | None = None
+        self._max_level = -1
+        self._deleted: set[int] = set()
+
+    def _upsert_rows(
+        self, ids: List[str], batch: VectorBatch, metadata: List[Dict[str, Any]]
+    ) -> None:
+        """Insert vectors, tombstoning any previous node for the same id."""
+        self._deleted.update(
+            self._positions[_id] for _id in ids if _id in self._positions
+        )
+        for _id, meta, position in zip(ids, metadata, self._append(batch)):
+            self._register(_id, meta, position)
+            self._link(position)
+
+    async def query(
+        self, vector: VectorLike, *, top_k: int = 1, retries: int = 3
+    ) -> List[Dict[str, Any]]:
+        """Return approximately the ``top_k`` most similar live vectors."""
+        return self._search(self._query_vector(vector, top_k), top_k)
+
+    async def query_many(
+        self, vectors: Any, *, top_k: int = 1, retries: int = 3
+    ) -> List[QueryResult]:
+        """Search the graph once per row of ``vectors``."""
+        queries = self._query_matrix(vectors, top_k)
+        return [QueryResult(self._search(query, top_k)) for query in queries]
+
+    def _search(self, query: Vector, top_k: int) -> List[Dict[str, Any]]:
+        """Search layer 0, doubling ``ef`` while tombstones crowd out live hits."""
+        if self._entry is None or not self._positions:
+            return []
+        entry = self._greedy(query, self._entry, self._max_level, 0)
+        ef = max(self.ef_search, top_k)
+        while True:
+            found = self._search_layer(query, [entry], ef, 0)
+            live = [(s, n) for s, n in found if n not in self._deleted]
+            if len(live) >= top_k or len(found) < ef or ef >= self._size:
+                break
+            ef *= 2
+        return [self._match(node, score) for score, node in live[:top_k]]
+
+    def _delete_rows(self, ids: List[str]) -> None:
+        """Tombstone vectors by id."""
+        for _id in ids:
+            position = self._positions.pop(_id, None)
+            if position is not None:
+                self._deleted.add(position)
+
+    def _snapshot_state(self) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+        """Flatten the graph into CSR arrays: levels, node starts, offsets, ids."""
+        levels: List[int] = []
+        counts: List[int] = []
+        neighbors: List[int] = []
+        for node in range(self._size):
+            level = self._level(node)
+            levels.append(level)
+            for layer in range(level + 1):
+                links = self._neighbors(node, layer)
+                counts.append(len(links))
+                neighbors.extend(links)
+        level_array = np.asarray(levels, dtype=np.int32)
+        arrays = {
+            "graph_levels": level_array,
+            "graph_nodes": _starts(level_array),
+            "graph_neighbors": np.asarray(neighbors, dtype=np.int32),
+            "graph_offsets": np.concatenate([[0], np.cumsum(counts)]).astype(np.int64),
+            "graph_deleted": np.asarray(sorted(self._deleted), dtype=np.int64),
+        }
+        info = {
+            "kind": self._KIND,
+            "entry": self._entry,
+            "max_level": self._max_level,
+            "m": self.m,
+            "ef_construction": self.ef_construction,
+        }
+        return arrays, info
+
+    def _restore(self, snapshot: Snapshot) -> None:
+        """Adopt the mapped vectors and adjacency arrays without rebuilding."""
+        super()._restore(snapshot)
+        arrays, info = snapshot.arrays, snapshot.info
+        levels = arrays["graph_levels"]
+        starts = arrays["graph_nodes"] if "graph_nodes" in arrays else _starts(levels)
+        self._links = {}
+        self._csr = (levels, starts, arrays["graph_offsets"], arrays["graph_neighbors"])
+        self._deleted = set(arrays["graph_deleted"].tolist())
+        self._entry, self._max_level = info["entry"], info["max_level"]
+        self.m, self.ef_construction = info["m"], info["ef_construction"]
+        self._level_mult = 1 / math.log(self.m)
+        self._positions = {
+            _id: i for i, _id in enumerate(self._ids) if i not in self._deleted
+        }
+
+    def _level(self, node: int) -> int:
+        links = self._links.get(node)
+        if links is not None or self._csr is None:
+            return len(links or []) - 1
+        return int(self._csr[0][node])
+
+    def _neighbors(self, node: int, layer: int) -> List[int]:
+        """Neighbors of ``node`` on ``layer``, from memory or the mapped arrays."""
+        links = self._links.get(node)
+        if links is not None:
+            return links[layer]
+        _, starts, offsets, neighbors = self._csr  # type: ignore[misc]
+        slot = int(starts[node]) + layer
+        return neighbors[offsets[slot] : offsets[slot + 1]].tolist()
+
+    def _own(self, node: int) -> List[List[int]]:
+        """In-memory adjacency of ``node``, copied from the arrays on first write."""
+        links = self._links.get(node)
+        if links is None:
+            level = self._level(node)
+            links = [self._neighbors(node, layer) for layer in range(level + 1)]
+            self._links[node] = links
+        return links
+
+    def _link(self, node: int) -> None:
+        """Insert ``node`` into the graph at a randomly drawn level."""
+        level = int(-math.log(1.0 - self._rng.random()) * self._level_mult)
+        self._links[node] = [[] for _ in range(level + 1)]
+        if self._entry is None:
+            self._entry, self._max_level = node, level
+            return
+        query = self._matrix[node].astype(np.float32)
+        entry = self._greedy(query, self._entry, self._max_level, level)
+        for layer in range(min(level, self._max_level), -1, -1):
+            found = self._search_layer(query, [entry], self.ef_construction, layer)
+            neighbors = [n for _, n in found[: self.m]]
+            self._links[node][layer] = neighbors
+            for neighbor in neighbors:
+                self._connect(neighbor, node, layer)
+            entry = found[0][1]
+        if level > self._max_level:
+            self._entry, self._max_level = node, level
+
+    def _connect(self, node: int, neighbor: int, layer: int) -> None:
+        """Add an edge, pruning ``node``'s list to its closest neighbors."""
+        layers = self._own(node)
+        links = layers[layer]
+        links.append(neighbor)
+        limit = self.m * 2 if layer == 0 else self.m
+        if len(links) > limit:
+            query = self._matrix[node].astype(np.float32)
+            keep = np.argsort(-self._similarity(query, links))[:limit]
+            layers[layer] = [links[i] for i in keep]
+
+    def _greedy(self, query: Vector, entry: int, top: int, bottom: int) -> int:
+        """Descend from layer ``top`` to ``bottom + 1`` following the best edge."""
+        best = float(self._similarity(query, [entry])[0])
+        for layer in range(top, bottom, -1):
+            improved = True
+            while improved:
+                improved = False
+                links = self._neighbors(entry, layer)
+                if not links:
+                    break
+                scores = self._similarity(query, links)
+                i = int(np.argmax(scores))
+                if scores[i] > best:
+                    best, entry, improved = float(scores[i]), links[i], True
+        return entry
+
+    def _search_layer(
+        self, query: Vector, entries: List[int], ef: int, layer: int
+    ) -> List[Tuple[float, int]]:
+        """Best-first search returning up to ``ef`` ``(score, node)`` pairs."""
+        visited = set(entries)
+        scored = [
+            (float(s), n) for s, n in zip(self._similarity(query, entries), entries)
+        ]
+        candidates = [(-s, n) for s, n in scored]
+        heapq.heapify(candidates)
+        results = list(scored)
+        heapq.heapify(results)
+        while candidates:
+            neg_score, node = heapq.heappop(candidates)
+            if len(results) >= ef and -neg_score < results[0][0]:
+                break
+            fresh = [n for n in self._neighbors(node, layer) if n not in visited]
+            visited.update(fresh)
+            for score, neighbor in zip(self._similarity(query, fresh), fresh):
+                if len(results) < ef or score > results[0][0]:
+                    heapq.heappush(candidates, (-float(score), neighbor))
+                    heapq.heappush(results, (float(score), neighbor))
+                    if len(results) > ef:
+                        heapq.heappop(results)
+        return sorted(results, reverse=True)
+
+
+def _starts(levels: np.ndarray) -> np.ndarray:
+    """First CSR slot of each node, given each node's top level."""
+    return np.concatenate([[0], np.cumsum(levels.astype(np.int64) + 1)[:-1]])
+
+
+def _nearest(data: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+    """Index of the closest centroid (squared L2) for every row of ``data``."""
+    distances = (centroids**2).sum(axis=1)[None, :] - 2 * (data @ centroids.T)
+    return distances.argmin(axis=1)
+
+
+def _kmeans(
+    data: np.ndarray, k: int, iterations: int, rng: np.random.Generator
+) -> np.ndarray:
+    """Lloyd's k-means; empty clusters are reseeded from random rows."""
+    centroids = data[rng.choice(len(data), k, replace=False)].copy()
+    for _ in range(iterations):
+        assign = _nearest(data, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, data)
+        counts = np.bincount(assign, minlength=k)
+        filled = counts > 0
+        centroids[filled] = sums[filled] / counts[filled, None]
+        if not filled.all():
+            centroids[~filled] = data[rng.choice(len(data), int((~filled).sum()))]
+    return centroids
+
+
+class PqIndex(ExactIndex):
+    """Product-quantized search with exact re-ranking of a shortlist.
+
+    Each vector is split into ``subspaces`` slices and every slice is stored
+    as the one-byte id of its nearest of ``centroids`` trained centroids, so
+    the in-memory footprint is ``subspaces`` bytes per vector. Queries score
+    all codes through per-subspace lookup tables, then re-rank the best
+    ``rerank`` rows against the full vectors.
+
+    Full vectors never live in RAM. Rows written in-process go to an
+    anonymous memory-mapped spill file in ``spill_dir`` (default: the system
+    temp directory). Loaded from a snapshot, they stay in the snapshot's
+    mapped file until the first write, which copies them block by block
+    into the spill file. Only shortlisted rows, and the training sample, are
+    read back.
+
+    The quantizer trains itself on a sample of at most ``train_size`` rows
+    once that many are stored, or explicitly through :meth:`train`; until
+    then search is exact.
+    """
+
+    _KIND = "pq"
+
+    def __init__(
+        self,
+        *,
+        dimension: int = 384,
+        dtype: str | None = None,
+        subspaces: int = 48,
+        centroids: int = 256,
+        rerank: int = 100,
+        train_size: int = 10000,
+        iterations: int = 20,
+        seed: int | None = None,
+        spill_dir: str | None = None,
+    ) -> None:
+        super().__init__(dimension=dimension, dtype=dtype)
+        if subspaces < 1 or dimension % subspaces:
+            raise IndexingError("subspaces must divide the vector dimension")
+        if not 1 < centroids <= 256 or rerank < 1 or train_size < 1:
+            raise IndexingError("invalid product quantization parameters")
+        self.subspaces = subspaces
+        self.centroids = centroids
+        self.rerank = rerank
+        self.train_size = train_size
+        self.iterations = iterations
+        self._rng = np.random.default_rng(seed)
+        self.spill_dir = spill_dir
+        self._codebooks: np.ndarray | None = None
+        self._codes = np.empty((0, subspaces), dtype=np.uint8)
+        self._spill: Any = None
+        self._spilled = False
+
+    @property
+    def trained(self) -> bool:
+        return self._codebooks is not None
+
+    def train(self, sample: Any | None = None) -> None:
+        """Fit codebooks on ``sample`` (default: stored rows) and encode all rows."""
+        if sample is None:
+            if not self._size:
+                raise IndexingError("no vectors to train on")
+            picks = self._rng.choice(
+                self._size, min(self._size, self.train_size), replace=False
+            )
+            data = self._matrix[np.sort(picks)].astype(np.float32)
+        else:
+            data = self._validated([(str(i), v, {}) for i, v in enumerate(sample)])[1]
+        k = min(self.centroids, len(data))
+        self._codebooks = np.stack(
+            [
+                _kmeans(part, k, self.iterations, self._rng)
+                for part in np.split(data, self.subspaces, axis=1)
+            ]
+        ).astype(np.float32)
+        self._writable()
+        self._codes = np.empty((len(self._matrix), self.subspaces), dtype=np.uint8)
+        for start in range(0, self._size, _SCORE_BLOCK):
+            end = min(start + _SCORE_BLOCK, self._size)
+            self._codes[start:end] = self._encode(self._matrix[start:end])
+
+    async def query(
+        self, vector: VectorLike, *, top_k: int = 1, retries: int = 3
+    ) -> List[Dict[str, Any]]:
+        """Return the ``top_k`` best matches after exact re-ranking."""
+        query = self._query_vector(vector, top_k)
+        if not self.trained:
+            return await super().query(query, top_k=top_k)
+        return self._search(query, top_k)
+
+    async def query_many(
+        self, vectors: Any, *, top_k: int = 1, retries: int = 3
+    ) -> List[QueryResult]:
+        """Search the codes once per row of ``vectors``."""
+        if not self.trained:
+            return await super().query_many(vectors, top_k=top_k)
+        queries = self._query_matrix(vectors, top_k)
+        return [QueryResult(self._search(query, top_k)) for query in queries]
+
+    def _search(self, query: Vector, top_k: int) -> List[Dict[str, Any]]:
+        if not self._size:
+            return []
+        approx = self._approximate_scores(query)
+        shortlist = min(max(self.rerank, top_k), self._size)
+        candidates = np.sort(np.argpartition(-approx, shortlist - 1)[:shortlist])
+        exact = self._similarity(query, candidates)
+        order = np.argsort(-exact)[:top_k]
+        return [self._match(int(candidates[i]), float(exact[i])) for i in order]
+
+    def _approximate_scores(self, query: Vector) -> np.ndarray:
+        """Asymmetric distance computation: sum per-subspace table lookups."""
+        parts = np.split(query, self.subspaces)
+        table = np.einsum("skd,sd->sk", self._trained_codebooks(), np.stack(parts))
+        columns = np.arange(self.subspaces)[None, :]
+        scores = np.empty(self._size, dtype=np.float32)
+        for start in range(0, self._size, _SCORE_BLOCK):
+            end = min(start + _SCORE_BLOCK, self._size)
+            scores[start:end] = table[columns, self._codes[start:end]].sum(axis=1)
+        return scores
+
+    def _encode(self, batch: np.ndarray) -> np.ndarray:
+        """Quantize each subspace slice of ``batch`` to its nearest centroid."""
+        books = self._trained_codebooks()
+        parts = np.split(batch.astype(np.float32, copy=False), self.subspaces, axis=1)
+        return np.stack(
+            [_nearest(part, book) for part, book in zip(parts, books)],
+            axis=1,
+        ).astype(np.uint8)
+
+    def _trained_codebooks(self) -> np.ndarray:
+        if self._codebooks is None:
+            raise IndexingError("product quantizer is not trained")
+        return self._codebooks
+
+    def _upsert_rows(
+        self, ids: List[str], batch: VectorBatch, metadata: List[Dict[str, Any]]
+    ) -> None:
+        """Store rows, then encode them or train once enough rows exist."""
+        super()._upsert_rows(ids, batch, metadata)
+        if not self.trained:
+            if self._size >= self.train_size:
+                self.train()
+            return
+        if len(self._codes) < len(self._matrix):
+            grown = np.empty((len(self._matrix), self.subspaces), dtype=np.uint8)
+            grown[: len(self._codes)] = self._codes
+            self._codes = grown
+        self._codes[[self._positions[_id] for _id in ids]] = self._encode(batch)
+
+    def _move_row(self, source: int, target: int) -> None:
+        super()._move_row(source, target)
+        if self.trained:
+            self._codes[target] = self._codes[source]
+
+    def _append(self, batch: VectorBatch) -> range:
+        """Write ``batch`` after the last row of the spill file."""
+        start, end = self._size, self._size + len(batch)
+        self._reserve(end)
+        self._matrix[start:end] = batch
+        self._size = end
+        return range(start, end)
+
+    def _reserve(self, rows: int) -> None:
+        """Map a spill file with room for ``rows`` rows, growing geometrically.
+
+        Rows held elsewhere (a snapshot map) are copied over in blocks.
+        """
+        if self._spilled and rows <= len(self._matrix):
+            return
+        previous, spilled = self._matrix, self._spilled
+        capacity = max(rows, 2 * len(previous), 1024)
+        if self._spill is None:
+            self._spill = tempfile.TemporaryFile(dir=self.spill_dir)
+        self._spill.truncate(capacity * self.dimension * self._dtype.itemsize)
+        self._matrix = np.memmap(
+            self._spill,
+            dtype=self._dtype,
+            mode="r+",
+            shape=(capacity, self.dimension),
+        )
+        self._spilled = True
+        if not spilled:
+            for start in range(0, self._size, _SCORE_BLOCK):
+                end = min(start + _SCORE_BLOCK, self._size)
+                self._matrix[start:end] = previous[start:end]
+
+    def _writable(self) -> None:
+        """Move mapped snapshot rows to the spill file instead of into RAM."""
+        self._reserve(self._size)
+        if not isinstance(self._metadata, list):
+            self._metadata = list(self._metadata)
+        if not self._codes.flags.writeable:
+            self._codes = np.array(self._codes)
+
+    def _snapshot_state(self) -> Tuple[Dict[str, np.ndarray], Dict[str, Any]]:
+        """Persist codebooks and codes alongside the full vectors."""
+        info = {
+            "kind": self._KIND,
+            "subspaces": self.subspaces,
+            "centroids": self.centroids,
+        }
+        if self._codebooks is None:
+            return {}, info
+        arrays = {
+            "pq_codebooks": self._codebooks,
+            "pq_codes": self._codes[: self._size],
+        }
+        return arrays, info
+
+    @classmethod
+    def _settings(cls, info: Dict[str, Any]) -> Dict[str, Any]:
+        return {"subspaces": info["subspaces"], "centroids": info["centroids"]}
+
+    def _restore(self, snapshot: Snapshot) -> None:
+        """Map codes and full vectors; only the codebooks are copied into RAM."""
+        super()._restore(snapshot)
+        self._spilled = False
+        if "pq_codebooks" in snapshot.arrays:
+            self._codebooks = np.array(snapshot.arrays["pq_codebooks"])
+            self._codes = snapshot.arrays["pq_codes"]
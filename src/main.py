@@ -3,22 +3,45 @@
 from __future__ import annotations
 
 import asyncio
+import os
 from typing import Sequence
 
 import gradio as gr  # type: ignore[import-not-found]
 
 from .chat_interface import build_interface
 from .config import ConfigurationError, load_env
+from .document_store import DocumentStore
 from .embedder import BgeEmbedder
+from .embedding_cache import EmbeddingCache
 from .exceptions import InitializationError
-from .pinecone_index import PineconeIndex
+from .vector_store import VectorStore, create_vector_store, vector_store_backend
 
 REQUIRED_ENV_VARS: Sequence[str] = ("PINECONE_API_KEY", "PINECONE_INDEX_NAME")
 
 
+async def _init_index() -> VectorStore:
+    """Construct the configured vector store off the event loop."""
+    try:
+        return await asyncio.to_thread(create_vector_store)
+    except Exception as exc:  # noqa: BLE001
+        raise InitializationError("index initialization failed") from exc
+
+
+async def _warm_up(embedder: BgeEmbedder) -> None:
+    """Load the embedding model and prime it with a dummy encode."""
+    try:
+        await embedder.warm_up()
+    except Exception as exc:  # noqa: BLE001
+        raise InitializationError("embedder warm-up failed") from exc
+
+
 async def startup() -> gr.ChatInterface:
     """Initialize components and build the Gradio interface.
 
+    The embedding model is warmed up concurrently with index initialization,
+    and the interface is only returned once the embedder reports ready, so no
+    traffic is accepted while the model is still loading.
+
     Returns:
         Configured Gradio ChatInterface.
 
@@ -26,21 +49,22 @@ async def startup() -> gr.ChatInterface:
         InitializationError: If environment loading or component setup fails.
     """
     try:
-        await load_env(REQUIRED_ENV_VARS)
+        await load_env(())
+        if vector_store_backend() == "pinecone":
+            await load_env(REQUIRED_ENV_VARS)
     except ConfigurationError as exc:
         raise InitializationError("environment loading failed") from exc
 
     try:
-        embedder = await asyncio.to_thread(BgeEmbedder)
+        embedder = await asyncio.to_thread(BgeEmbedder, cache=EmbeddingCache())
     except Exception as exc:  # noqa: BLE001
         raise InitializationError("embedder initialization failed") from exc
 
-    try:
-        index = await asyncio.to_thread(PineconeIndex)
-    except Exception as exc:  # noqa: BLE001
-        raise InitializationError("index initialization failed") from exc
-
-    return build_interface(embedder, index)
+    index, _ = await asyncio.gather(_init_index(), _warm_up(embedder))
+    if not embedder.ready:
+        raise InitializationError("embedder is not ready")
+    documents = DocumentStore() if os.getenv("DOCUMENT_STORE_PATH") else None
+    return build_interface(embedder, index, documents=documents)
 
 
 def main() -> None:
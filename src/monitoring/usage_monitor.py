@@ -35,6 +35,9 @@ class UsageMonitor:
         default_factory=lambda: float(os.getenv("MONITOR_DASHBOARD_TIMEOUT", "5"))
     )
     totals: Dict[str, float] = field(default_factory=dict)
+    savings: Dict[str, float] = field(default_factory=dict)
+    cache_hits: Dict[str, int] = field(default_factory=dict)
+    cache_misses: Dict[str, int] = field(default_factory=dict)
     _lock: asyncio.Lock = field(default_factory=asyncio.Lock, init=False)
 
     async def record(self, service: str, cost: float) -> None:
@@ -56,6 +59,27 @@ class UsageMonitor:
                 )
                 raise MonitoringError(msg)
 
+    def record_cache(self, service: str, *, hit: bool, saved: float = 0.0) -> None:
+        """Count a cache lookup for a service and the spend a hit avoided.
+
+        Args:
+            service: Name of the service whose call was cached.
+            hit: Whether the lookup was served from cache.
+            saved: Cost in USD the hit avoided.
+        """
+        if not isinstance(service, str) or not service.strip() or saved < 0:
+            raise MonitoringError("invalid monitoring data")
+        counters = self.cache_hits if hit else self.cache_misses
+        counters[service] = counters.get(service, 0) + 1
+        if hit:
+            self.savings[service] = self.savings.get(service, 0.0) + saved
+
+    def cache_hit_rate(self, service: str) -> float:
+        """Return the fraction of cache lookups for a service that hit."""
+        hits = self.cache_hits.get(service, 0)
+        total = hits + self.cache_misses.get(service, 0)
+        return hits / total if total else 0.0
+
     async def _log(self, service: str, cost: float) -> None:
         """Persist cost data to CSV and optional dashboard."""
         row = (
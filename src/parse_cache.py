@@ -0,0 +1,137 @@
+"""Persistent, compressed cache of extracted document text."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import os
+import sqlite3
+import time
+import zlib
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional
+
+from .exceptions import DocumentParsingError
+from .utils.sqlite_store import SqliteStore, hash_file
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS parses ("
+    "key TEXT PRIMARY KEY, text BLOB NOT NULL, accessed REAL NOT NULL)",
+)
+
+
+def fingerprint(path: Path, version: str) -> str:
+    """Key ``path`` by resolved location, size, mtime, content and parser version.
+
+    Bumping ``version`` invalidates every entry written by an older parser.
+    """
+    resolved = Path(path).resolve()
+    stat = resolved.stat()
+    digest = hash_file(resolved)
+    parts = (str(resolved), str(stat.st_size), str(stat.st_mtime_ns), version)
+    return hashlib.sha256(
+        "\0".join((*parts, digest.hexdigest())).encode("utf-8")
+    ).hexdigest()
+
+
+@dataclass
+class ParseCache(SqliteStore):
+    """Cache extracted text in SQLite at ``path``, zlib-compressed.
+
+    Entries are bounded by total compressed bytes and evicted least recently
+    used first.
+    """
+
+    path: str = field(
+        default_factory=lambda: os.getenv("PARSE_CACHE_PATH", "parse_cache.sqlite3")
+    )
+    max_bytes: int = field(
+        default_factory=lambda: int(os.getenv("PARSE_CACHE_MAX_BYTES", "1073741824"))
+    )
+    hits: int = 0
+    misses: int = 0
+
+    _schema = _SCHEMA
+    _db_error = DocumentParsingError
+    _db_unavailable = "parse cache unavailable"
+    _db_errors = (sqlite3.Error, zlib.error)
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit and miss counters."""
+        return {"hits": self.hits, "misses": self.misses}
+
+    async def key(self, path: Path, version: str) -> str:
+        """Compute the fingerprint of ``path`` off the event loop."""
+        try:
+            return await asyncio.to_thread(fingerprint, path, version)
+        except OSError as exc:
+            raise DocumentParsingError("failed to fingerprint document") from exc
+
+    async def get(self, key: str) -> Optional[str]:
+        """Return cached text for ``key`` or ``None``."""
+        text = await self._run_db(self._get, key)
+        if text is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return text
+
+    async def put(self, key: str, text: str) -> None:
+        """Store ``text`` under ``key``, evicting old entries past ``max_bytes``."""
+        await self._run_db(self._put, (key, zlib.compress(text.encode("utf-8"))))
+
+    async def get_page(self, key: str, number: int) -> Optional[str]:
+        """Return cached text of page ``number`` of the document ``key``."""
+        return await self.get(f"{key}:{number}")
+
+    async def put_page(self, key: str, number: int, text: str) -> None:
+        """Store page ``number`` of the document ``key`` as its own entry."""
+        await self.put(f"{key}:{number}", text)
+
+    async def page_count(self, key: str) -> Optional[int]:
+        """Return the recorded page count of the document ``key``."""
+        count = await self.get(f"{key}:pages")
+        return None if count is None else int(count)
+
+    async def set_page_count(self, key: str, count: int) -> None:
+        """Record that the document ``key`` has ``count`` pages."""
+        await self.put(f"{key}:pages", str(count))
+
+    def _get(self, key: str) -> Optional[str]:
+        with self._db_lock:
+            db = self._connect()
+            row = db.execute("SELECT text FROM parses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            db.execute(
+                "UPDATE parses SET accessed = ? WHERE key = ?", (time.time(), key)
+            )
+            db.commit()
+        return zlib.decompress(row[0]).decode("utf-8")
+
+    def _put(self, entry: tuple[str, bytes]) -> None:
+        with self._db_lock:
+            db = self._connect()
+            db.execute(
+                "INSERT OR REPLACE INTO parses VALUES (?, ?, ?)", (*entry, time.time())
+            )
+            self._evict(db)
+            db.commit()
+
+    def _evict(self, db: sqlite3.Connection) -> None:
+        """Delete least recently used rows until under ``max_bytes``."""
+        total = db.execute("SELECT COALESCE(SUM(LENGTH(text)), 0) FROM parses")
+        excess = total.fetchone()[0] - self.max_bytes
+        if excess <= 0:
+            return
+        rows = db.execute(
+            "SELECT key, LENGTH(text) FROM parses ORDER BY accessed, rowid"
+        )
+        doomed = []
+        for key, size in rows:
+            if excess <= 0:
+                break
+            doomed.append((key,))
+            excess -= size
+        db.executemany("DELETE FROM parses WHERE key = ?", doomed)
@@ -3,88 +3,421 @@
 from __future__ import annotations
 
 import asyncio
+import copy
+import functools
+import hashlib
+import json
 import os
-from typing import Any, Dict, List, Tuple
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from pinecone import Pinecone, ServerlessSpec  # type: ignore[import-not-found]
 
 from .exceptions import IndexingError
 from .monitoring import UsageMonitor
+from .query_cache import QueryCache
 from .utils.retry import async_retry
+from .vectors import QueryResult, VectorLike, as_batch, to_list
+
+Record = Tuple[str, List[float], Dict[str, Any]]
+
+# Pinecone rejects delete requests naming more ids than this.
+_MAX_DELETE_IDS = 1000
+
+
+@dataclass
+class ChunkResult:
+    """Outcome of upserting one chunk of vectors."""
+
+    chunk: int
+    count: int
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class UpsertReport:
+    """Per-chunk results of a chunked upsert."""
+
+    chunks: List[ChunkResult] = field(default_factory=list)
+
+    @property
+    def upserted(self) -> int:
+        """Number of vectors in successfully written chunks."""
+        return sum(c.count for c in self.chunks if c.ok)
+
+    @property
+    def failed(self) -> List[ChunkResult]:
+        return [c for c in self.chunks if not c.ok]
+
+
+def _record_bytes(record: Record) -> int:
+    """Approximate serialized request size of one record."""
+    _id, values, meta = record
+    return len(json.dumps({"id": _id, "values": values, "metadata": meta}))
+
+
+def chunk_records(
+    records: Iterable[Record], *, max_count: int, max_bytes: int
+) -> Iterator[List[Record]]:
+    """Lazily split ``records`` into chunks bounded by count and payload bytes.
+
+    Records are pulled from ``records`` only as each chunk is filled. A
+    record larger than ``max_bytes`` on its own still forms a chunk.
+    """
+    current: List[Record] = []
+    size = 0
+    for record in records:
+        record_size = _record_bytes(record)
+        if current and (len(current) >= max_count or size + record_size > max_bytes):
+            yield current
+            current, size = [], 0
+        current.append(record)
+        size += record_size
+    if current:
+        yield current
+
+
+# Index hosts resolved in this process, keyed by (api key digest, index name).
+_HOSTS: Dict[Tuple[str, str], str] = {}
+_HOSTS_LOCK = threading.Lock()
+
+
+def _index_host(pc: Any, api_key: str, name: str, dimension: int) -> str:
+    """Return the data-plane host of ``name``, creating the index if needed.
+
+    ``PINECONE_INDEX_HOST`` skips the control-plane lookup entirely;
+    otherwise the describe-or-create step runs once per process.
+    """
+    configured = os.getenv("PINECONE_INDEX_HOST")
+    if configured:
+        return configured
+    key = (hashlib.sha256(api_key.encode("utf-8")).hexdigest(), name)
+    with _HOSTS_LOCK:
+        if key not in _HOSTS:
+            _HOSTS[key] = _describe_or_create(pc, name, dimension)
+        return _HOSTS[key]
+
+
+def _describe_or_create(pc: Any, name: str, dimension: int) -> str:
+    """Create ``name`` unless it exists and return its host.
+
+    A failed create is ignored when the index exists afterwards, since
+    another worker may have created it concurrently.
+    """
+    if name not in [i.name for i in pc.list_indexes()]:
+        spec = ServerlessSpec(cloud="aws", region="us-west-2")
+        try:
+            pc.create_index(name, dimension=dimension, metric="cosine", spec=spec)
+        except Exception:  # noqa: BLE001
+            if name not in [i.name for i in pc.list_indexes()]:
+                raise
+    return pc.describe_index(name).host
 
 
 class PineconeIndex:
-    """Async wrapper for a Pinecone index."""
+    """Async wrapper for a Pinecone index.
+
+    The data-plane client keeps a pool of ``PINECONE_POOL_THREADS`` keep-alive
+    connections, which namespace views share. Use :meth:`create` to build an
+    index without blocking the event loop.
+    """
 
     def __init__(
-        self, *, dimension: int = 384, monitor: UsageMonitor | None = None
+        self,
+        *,
+        dimension: int = 384,
+        monitor: UsageMonitor | None = None,
+        namespace: str | None = None,
+        cache: QueryCache | None = None,
     ) -> None:
         api_key = os.getenv("PINECONE_API_KEY")
         name = os.getenv("PINECONE_INDEX_NAME")
         if not api_key or not name:
             raise IndexingError("Missing Pinecone configuration")
         try:
-            pc = Pinecone(api_key=api_key)
-            if name not in [i.name for i in pc.list_indexes()]:
-                spec = ServerlessSpec(cloud="aws", region="us-west-2")
-                pc.create_index(name, dimension=dimension, metric="cosine", spec=spec)
-            self.index = pc.Index(name)
+            pool = int(os.getenv("PINECONE_POOL_THREADS", "8"))
+            pc = Pinecone(api_key=api_key, pool_threads=pool)
+            self.index = pc.Index(
+                name=name,
+                host=_index_host(pc, api_key, name, dimension),
+                pool_threads=pool,
+                connection_pool_maxsize=pool,
+            )
             self.monitor = monitor
+            self.namespace = namespace or os.getenv("PINECONE_NAMESPACE") or None
+            self.cache = cache if cache is not None else QueryCache()
             self.upsert_cost = float(os.getenv("PINECONE_UPSERT_COST", "0"))
             self.query_cost = float(os.getenv("PINECONE_QUERY_COST", "0"))
+            self.upsert_batch_size = int(os.getenv("PINECONE_UPSERT_BATCH_SIZE", "100"))
+            self.upsert_max_bytes = int(
+                os.getenv("PINECONE_UPSERT_MAX_BYTES", str(2 * 1024 * 1024))
+            )
+            self.upsert_concurrency = int(os.getenv("PINECONE_UPSERT_CONCURRENCY", "4"))
+            self.query_concurrency = int(os.getenv("PINECONE_QUERY_CONCURRENCY", "8"))
+            self.delete_batch_size = min(
+                int(os.getenv("PINECONE_DELETE_BATCH_SIZE", str(_MAX_DELETE_IDS))),
+                _MAX_DELETE_IDS,
+            )
         except Exception as exc:  # noqa: BLE001
             raise IndexingError("failed to initialize Pinecone") from exc
 
+    @classmethod
+    async def create(cls, **kwargs: Any) -> "PineconeIndex":
+        """Build an index in a worker thread; accepts ``__init__`` arguments."""
+        return await asyncio.to_thread(functools.partial(cls, **kwargs))
+
+    def with_namespace(self, namespace: str) -> "PineconeIndex":
+        """Return a view of this index bound to ``namespace``.
+
+        The view shares the client connection, so one index can serve many
+        namespace shards (see :class:`~src.sharded_index.ShardedIndex`).
+        """
+        view = copy.copy(self)
+        view.namespace = namespace
+        return view
+
+    def _scope(self) -> Dict[str, Any]:
+        """Namespace keyword for SDK calls; omitted for the default namespace."""
+        return {"namespace": self.namespace} if self.namespace else {}
+
     async def upsert(
-        self,
-        items: List[Tuple[str, List[float], Dict[str, Any]]],
-        *,
-        retries: int = 3,
+        self, items: List[Tuple[str, VectorLike, Dict[str, Any]]], *, retries: int = 3
     ) -> None:
-        """Upsert vectors into Pinecone with retry logic."""
+        """Upsert vectors into Pinecone in concurrent, individually retried chunks.
+
+        See :meth:`upsert_chunks`.
+
+        Raises:
+            IndexingError: If input is invalid or any chunk fails.
+        """
+        report = await self.upsert_chunks(items, retries=retries)
+        if report.failed:
+            raise IndexingError(
+                f"upsert failed for {len(report.failed)} of {len(report.chunks)} chunks"
+            )
+
+    async def upsert_chunks(
+        self, items: List[Tuple[str, VectorLike, Dict[str, Any]]], *, retries: int = 3
+    ) -> UpsertReport:
+        """Upsert vectors and report the outcome of every chunk.
+
+        Items are split by ``PINECONE_UPSERT_BATCH_SIZE`` vectors and
+        ``PINECONE_UPSERT_MAX_BYTES`` of payload and sent by
+        ``PINECONE_UPSERT_CONCURRENCY`` workers. Each worker converts the
+        NumPy rows of the next chunk only when it is ready to send it, so at
+        most one chunk per worker exists as float lists. Cost is recorded
+        once for all written vectors.
+
+        Raises:
+            IndexingError: If input is invalid. Chunks sent before an invalid
+                vector is reached stay written. Failed chunks are reported,
+                not raised.
+        """
         if not items:
             raise IndexingError("no items provided")
+        chunks = enumerate(
+            chunk_records(
+                ((_id, to_list(vector), meta) for _id, vector, meta in items),
+                max_count=max(1, self.upsert_batch_size),
+                max_bytes=self.upsert_max_bytes,
+            )
+        )
+        pulling = asyncio.Lock()
+        results: List[ChunkResult] = []
+
+        async def _worker() -> None:
+            while True:
+                async with pulling:
+                    try:
+                        item = await asyncio.to_thread(next, chunks, None)
+                    except (TypeError, ValueError) as exc:
+                        raise IndexingError("invalid vector in upsert") from exc
+                if item is None:
+                    return
+                results.append(await self._upsert_chunk(*item, retries))
+
+        workers = [
+            asyncio.create_task(_worker())
+            for _ in range(max(1, self.upsert_concurrency))
+        ]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+            self.cache.invalidate(self.namespace)
+        report = UpsertReport(sorted(results, key=lambda r: r.chunk))
+        if self.monitor and report.upserted:
+            await self.monitor.record("pinecone", self.upsert_cost * report.upserted)
+        return report
+
+    async def _upsert_chunk(
+        self, number: int, chunk: List[Record], retries: int
+    ) -> ChunkResult:
+        """Send one chunk with its own retry budget."""
 
         async def _upsert() -> None:
-            await asyncio.to_thread(self.index.upsert, vectors=items)
+            await asyncio.to_thread(self.index.upsert, vectors=chunk, **self._scope())
 
         try:
             await async_retry(
                 _upsert, max_attempts=retries, timeout=10, error_cls=IndexingError
             )
         except IndexingError as exc:
-            raise IndexingError("upsert failed") from exc
-
-        if self.monitor:
-            cost = self.upsert_cost * len(items)
-            await self.monitor.record("pinecone", cost)
+            return ChunkResult(number, len(chunk), repr(exc.__cause__ or exc))
+        return ChunkResult(number, len(chunk))
 
     async def query(
         self,
-        vector: List[float],
+        vector: VectorLike,
         *,
         top_k: int = 1,
         retries: int = 3,
+        filter: Optional[Dict[str, Any]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Query Pinecone index for Dense X Retrieval.
+
+        Results are served from the query cache when the same vector,
+        ``top_k`` and ``filter`` were queried in this namespace since its last
+        write; hits and the query cost they avoid are reported to the monitor.
+        """
+        try:
+            values = to_list(vector)
+        except ValueError as exc:
+            raise IndexingError("vector required") from exc
+        key = self.cache.key(
+            values, top_k=top_k, namespace=self.namespace, filter=filter
+        )
+        cached = self.cache.get(key)
+        if self.monitor:
+            self.monitor.record_cache(
+                "pinecone", hit=cached is not None, saved=self.query_cost
+            )
+        if cached is not None:
+            return cached
+        generation = self.cache.generation(self.namespace)
+        try:
+            matches = await self._query_values(values, top_k, retries, filter)
+        except IndexingError as exc:
+            raise IndexingError("query failed") from exc
+
+        self.cache.put(key, matches, namespace=self.namespace, generation=generation)
+        if self.monitor:
+            await self.monitor.record("pinecone", self.query_cost)
+        return matches
+
+    async def query_many(
+        self, vectors: Any, *, top_k: int = 1, retries: int = 3
+    ) -> List[QueryResult]:
+        """Query each row of ``vectors`` with bounded concurrency.
+
+        Pinecone has no multi-vector query endpoint, so rows are sent as
+        individual requests with at most ``PINECONE_QUERY_CONCURRENCY`` in
+        flight. A failed row is reported in its :class:`QueryResult` rather
+        than failing the batch, and cost is recorded once for the rows that
+        succeeded.
+
+        Raises:
+            IndexingError: If ``vectors`` is not a non-empty 2-D matrix.
+        """
+        try:
+            rows = as_batch(vectors).tolist()
+        except ValueError as exc:
+            raise IndexingError("vectors must be a non-empty matrix") from exc
+        semaphore = asyncio.Semaphore(max(1, self.query_concurrency))
+
+        async def _one(values: List[float]) -> QueryResult:
+            async with semaphore:
+                try:
+                    matches = await self._query_values(values, top_k, retries)
+                except IndexingError as exc:
+                    return QueryResult(error=repr(exc.__cause__ or exc))
+            return QueryResult(matches)
+
+        results = list(await asyncio.gather(*(_one(values) for values in rows)))
+        succeeded = sum(result.ok for result in results)
+        if self.monitor and succeeded:
+            await self.monitor.record("pinecone", self.query_cost * succeeded)
+        return results
+
+    async def _query_values(
+        self,
+        values: List[float],
+        top_k: int,
+        retries: int,
+        filter: Optional[Dict[str, Any]] = None,
     ) -> List[Dict[str, Any]]:
-        """Query Pinecone index for Dense X Retrieval."""
-        if not vector:
-            raise IndexingError("vector required")
+        """Send one query request with retries and return its matches."""
+        options = self._scope()
+        if filter:
+            options["filter"] = filter
 
         async def _query() -> Dict[str, Any]:
             return await asyncio.to_thread(
                 self.index.query,
-                vector=vector,
+                vector=values,
                 top_k=top_k,
                 include_metadata=True,
+                **options,
             )
 
+        result = await async_retry(
+            _query, max_attempts=retries, timeout=10, error_cls=IndexingError
+        )
+        return result.get("matches", [])
+
+    async def delete(self, ids: List[str], *, retries: int = 3) -> None:
+        """Delete vectors from Pinecone by id.
+
+        Ids are sent in batches of ``PINECONE_DELETE_BATCH_SIZE`` (at most
+        1,000, Pinecone's limit) by ``PINECONE_UPSERT_CONCURRENCY`` workers,
+        each batch with its own retry budget.
+
+        Raises:
+            IndexingError: If no ids are given or any batch fails; the other
+                batches stay deleted.
+        """
+        if not ids:
+            raise IndexingError("no ids provided")
+        size = max(1, self.delete_batch_size)
+        batches = iter([ids[i : i + size] for i in range(0, len(ids), size)])
+        failed: List[str] = []
+
+        async def _worker() -> None:
+            for batch in batches:
+                error = await self._delete_batch(batch, retries)
+                if error is not None:
+                    failed.append(error)
+
+        workers = [
+            asyncio.create_task(_worker())
+            for _ in range(max(1, self.upsert_concurrency))
+        ]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+            self.cache.invalidate(self.namespace)
+        if failed:
+            total = -(-len(ids) // size)
+            raise IndexingError(f"delete failed for {len(failed)} of {total} batches")
+
+    async def _delete_batch(self, batch: List[str], retries: int) -> Optional[str]:
+        """Delete one batch of ids; return the error, if any."""
+
+        async def _delete() -> None:
+            await asyncio.to_thread(self.index.delete, ids=batch, **self._scope())
+
         try:
-            result = await async_retry(
-                _query, max_attempts=retries, timeout=10, error_cls=IndexingError
+            await async_retry(
+                _delete, max_attempts=retries, timeout=10, error_cls=IndexingError
             )
         except IndexingError as exc:
-            raise IndexingError("query failed") from exc
-
-        if self.monitor:
-            await self.monitor.record("pinecone", self.query_cost)
-        return result.get("matches", [])
+            return repr(exc.__cause__ or exc)
+        return None
@@ -0,0 +1,340 @@
+"""Dense X propositionization of parsed text through OpenRouter.
+
+Text is split into passages at paragraph boundaries. Several passages are
+sent per prompt, with a bounded number of prompts in flight, and the model
+answers with JSON listing the atomic propositions of each passage together
+with a verbatim supporting quote. Quotes are located in the passage to give
+every proposition character offsets into the source text.
+
+Results are cached by passage hash, model and prompt version, so rerunning
+over unchanged text makes no requests.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from .citation import generate_citation
+from .exceptions import CitationError, OpenRouterError
+from .utils.sqlite_store import SqliteStore
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .dedup import Proposition as PropositionRecord
+    from .openrouter_client import OpenRouterClient
+
+# Bump when the prompt or output format changes so cached results are not reused.
+PROMPT_VERSION = "1"
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS propositions ("
+    "key TEXT PRIMARY KEY, propositions TEXT NOT NULL)",
+)
+
+_PROMPT = """Decompose each passage below into propositions: atomic, \
+self-contained factual statements, with pronouns replaced by the entities \
+they refer to. For every proposition give a short quote copied verbatim from \
+the passage that supports it.
+
+Answer with JSON only, in this form:
+{{"passages": [{{"id": 0, "propositions": [{{"text": "...", "quote": "..."}}]}}]}}
+
+{passages}"""
+
+
+@dataclass
+class Passage:
+    """A span of source text sent to the model as one unit."""
+
+    start: int
+    text: str
+
+    @property
+    def end(self) -> int:
+        return self.start + len(self.text)
+
+
+@dataclass
+class Proposition:
+    """An extracted proposition and the ``[start, end)`` span supporting it.
+
+    Offsets index the text given to :meth:`Propositionizer.propositionize`.
+    When the model's quote cannot be found, the span covers the whole
+    passage.
+    """
+
+    text: str
+    start: int
+    end: int
+
+
+def split_passages(text: str, max_chars: int) -> List[Passage]:
+    """Group paragraphs of ``text`` into passages of at most ``max_chars``.
+
+    Paragraphs longer than ``max_chars`` are cut at whitespace.
+    """
+    passages: List[Passage] = []
+    current: Optional[Passage] = None
+    for start, paragraph in _paragraphs(text, max_chars):
+        if current is not None and start + len(paragraph) - current.start <= max_chars:
+            current.text = text[current.start : start + len(paragraph)]
+            continue
+        current = Passage(start, paragraph)
+        passages.append(current)
+    return passages
+
+
+def _paragraphs(text: str, max_chars: int) -> Iterator[Tuple[int, str]]:
+    """Yield ``(offset, paragraph)`` pieces of at most ``max_chars``."""
+    offset = 0
+    for block in text.split("\n\n"):
+        stripped = block.strip()
+        position = offset + block.find(stripped) if stripped else offset
+        offset += len(block) + 2
+        while stripped:
+            cut = len(stripped)
+            if cut > max_chars:
+                cut = stripped.rfind(" ", 1, max_chars + 1)
+                cut = cut if cut > 0 else max_chars
+            piece = stripped[:cut].rstrip()
+            yield position, piece
+            rest = stripped[cut:]
+            position += cut + len(rest) - len(rest.lstrip())
+            stripped = rest.lstrip()
+
+
+def passage_key(passage: str, model: str) -> str:
+    """Cache key of ``passage`` for ``model`` under the current prompt."""
+    payload = "\0".join((PROMPT_VERSION, model, passage))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class PropositionCache(SqliteStore):
+    """SQLite cache of propositions keyed by :func:`passage_key`.
+
+    Offsets are stored relative to the passage, so a passage reused in
+    another document hits the same entry. ``path`` defaults to
+    ``PROPOSITION_CACHE_PATH``.
+    """
+
+    path: str = field(
+        default_factory=lambda: os.getenv(
+            "PROPOSITION_CACHE_PATH", "proposition_cache.sqlite3"
+        )
+    )
+    hits: int = 0
+    misses: int = 0
+
+    _schema = _SCHEMA
+    _db_error = OpenRouterError
+    _db_unavailable = "proposition cache unavailable"
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit and miss counters."""
+        return {"hits": self.hits, "misses": self.misses}
+
+    async def get_many(self, keys: Sequence[str]) -> Dict[str, List[Proposition]]:
+        """Return cached propositions for the ``keys`` that are present."""
+        found = await self._run_db(self._get_many, list(dict.fromkeys(keys)))
+        self.hits += sum(key in found for key in keys)
+        self.misses += sum(key not in found for key in keys)
+        return found
+
+    async def put_many(self, entries: Dict[str, List[Proposition]]) -> None:
+        """Store passage-relative propositions under their keys."""
+        rows = [
+            (key, json.dumps([[p.text, p.start, p.end] for p in props]))
+            for key, props in entries.items()
+        ]
+        await self._run_db(self._put_many, rows)
+
+    def _get_many(self, keys: List[str]) -> Dict[str, List[Proposition]]:
+        with self._db_lock:
+            rows = self._select(
+                self._connect(),
+                "SELECT key, propositions FROM propositions WHERE key IN ({marks})",
+                keys,
+            )
+        return {
+            key: [Proposition(*item) for item in json.loads(payload)]
+            for key, payload in rows
+        }
+
+    def _put_many(self, rows: List[Tuple[str, str]]) -> None:
+        with self._db_lock:
+            db = self._connect()
+            db.executemany("INSERT OR REPLACE INTO propositions VALUES (?, ?)", rows)
+            db.commit()
+
+
+def _env_int(name: str, default: int) -> int:
+    return int(os.getenv(name, str(default)))
+
+
+@dataclass
+class Propositionizer:
+    """Extract propositions from text with batched, concurrent LLM calls.
+
+    Up to ``batch_size`` passages of at most ``passage_chars`` go into one
+    prompt and at most ``concurrency`` prompts run at once. Settings default
+    to ``PROPOSITION_*`` environment variables.
+    """
+
+    client: OpenRouterClient
+    cache: Optional[PropositionCache] = None
+    passage_chars: int = field(
+        default_factory=lambda: _env_int("PROPOSITION_PASSAGE_CHARS", 1500)
+    )
+    batch_size: int = field(
+        default_factory=lambda: _env_int("PROPOSITION_BATCH_SIZE", 4)
+    )
+    concurrency: int = field(
+        default_factory=lambda: _env_int("PROPOSITION_CONCURRENCY", 4)
+    )
+    requests: int = 0
+    _semaphore: Optional[asyncio.Semaphore] = field(
+        default=None, init=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        if min(self.passage_chars, self.batch_size, self.concurrency) < 1:
+            raise OpenRouterError("propositionizer settings must be positive")
+
+    async def propositionize(self, text: str) -> List[Proposition]:
+        """Return the propositions of ``text`` in passage order.
+
+        Each batch is cached as soon as it completes, so a failure keeps
+        the work of batches that already finished; batches still in flight
+        are cancelled.
+
+        Raises:
+            OpenRouterError: If a request fails or a passage's output cannot
+                be parsed even when retried on its own.
+        """
+        passages = split_passages(text, self.passage_chars)
+        model = self.client.model
+        keys = [passage_key(p.text, model) for p in passages]
+        cached = await self.cache.get_many(keys) if self.cache else {}
+        pending = list(
+            {key: p.text for key, p in zip(keys, passages) if key not in cached}.items()
+        )
+        batches = [
+            pending[i : i + self.batch_size]
+            for i in range(0, len(pending), self.batch_size)
+        ]
+        tasks = [asyncio.create_task(self._extract(batch)) for batch in batches]
+        try:
+            for done in asyncio.as_completed(tasks):
+                cached.update(await done)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        return [
+            Proposition(p.text, passage.start + p.start, passage.start + p.end)
+            for key, passage in zip(keys, passages)
+            for p in cached[key]
+        ]
+
+    async def _extract(
+        self, batch: List[Tuple[str, str]]
+    ) -> Dict[str, List[Proposition]]:
+        """Propositionize and cache one batch.
+
+        Passages missing from the reply are retried alone.
+        """
+        parsed = await self._request([text for _, text in batch])
+        found = {
+            key: props for (key, _), props in zip(batch, parsed) if props is not None
+        }
+        for key, text in batch:
+            if key in found:
+                continue
+            single = (await self._request([text]))[0] if len(batch) > 1 else None
+            if single is None:
+                raise OpenRouterError("unparseable proposition output")
+            found[key] = single
+        if self.cache is not None:
+            await self.cache.put_many(found)
+        return found
+
+    async def _request(self, texts: List[str]) -> List[Optional[List[Proposition]]]:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        body = "\n\n".join(
+            f"<passage id={n}>\n{text}\n</passage>" for n, text in enumerate(texts)
+        )
+        async with self._semaphore:
+            self.requests += 1
+            reply = await self.client.complete(_PROMPT.format(passages=body))
+        return parse_output(reply, texts)
+
+
+def parse_output(reply: str, texts: Sequence[str]) -> List[Optional[List[Proposition]]]:
+    """Read the model's JSON reply into passage-relative propositions.
+
+    Entries align with ``texts``; a passage the reply omits or garbles is
+    ``None``. Markdown code fences and surrounding prose are ignored.
+    """
+    results: List[Optional[List[Proposition]]] = [None] * len(texts)
+    start, end = reply.find("{"), reply.rfind("}")
+    try:
+        data = json.loads(reply[start : end + 1]) if start != -1 else {}
+        entries = data.get("passages", []) if isinstance(data, dict) else []
+    except json.JSONDecodeError:
+        return results
+    for entry in entries:
+        try:
+            index = int(entry["id"])
+            items = entry["propositions"]
+            if not 0 <= index < len(texts) or not isinstance(items, list):
+                continue
+            located = [_locate(item, texts[index]) for item in items]
+        except (AttributeError, KeyError, TypeError, ValueError):
+            continue
+        results[index] = [prop for prop in located if prop is not None]
+    return results
+
+
+def _locate(item: Dict[str, Any], passage: str) -> Optional[Proposition]:
+    """Anchor ``item`` to its quote in ``passage``, or to the whole passage."""
+    text = str(item["text"]).strip()
+    if not text:
+        return None
+    try:
+        span = generate_citation(passage, str(item.get("quote") or ""))
+    except CitationError:
+        return Proposition(text, 0, len(passage))
+    return Proposition(text, span["start"], span["end"])
+
+
+def proposition_records(
+    source: str, propositions: Sequence[Proposition], *, first: int = 0
+) -> List[PropositionRecord]:
+    """Turn propositions of ``source`` into ``(id, text, metadata)`` records.
+
+    Ids are stable for a given source and proposition order, so the records
+    can go straight to :class:`~src.dedup.NearDuplicateFilter` and the index.
+    Numbering starts at ``first``, so a document propositionized piece by
+    piece gets the same ids as one done in a single call.
+    """
+    prefix = hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+    return [
+        (f"{prefix}-p{n}", p.text, {"source": source, "start": p.start, "end": p.end})
+        for n, p in enumerate(propositions, first)
+    ]
@@ -0,0 +1,119 @@
+"""TTL-bounded LRU cache for vector query results."""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .vectors import VectorLike, as_vector
+
+
+def _optional_int(name: str) -> Optional[int]:
+    value = os.getenv(name)
+    return int(value) if value else None
+
+
+@dataclass
+class QueryCache:
+    """Cache query matches by (namespace, vector, ``top_k``, filter).
+
+    Vectors are hashed from their float32 bytes, optionally rounded to
+    ``decimals`` first so near-identical embeddings share an entry. Entries
+    expire after ``ttl`` seconds and the least recently used are evicted past
+    ``max_entries``; ``max_entries=0`` disables caching.
+
+    Each namespace has a generation counter that :meth:`invalidate` bumps.
+    A query reads it before going to the network and passes it to
+    :meth:`put`, so results fetched across a write are discarded instead of
+    cached. Callers get copies and can never mutate a cached entry.
+    """
+
+    max_entries: int = field(
+        default_factory=lambda: int(os.getenv("QUERY_CACHE_MAX_ENTRIES", "1024"))
+    )
+    ttl: float = field(
+        default_factory=lambda: float(os.getenv("QUERY_CACHE_TTL", "300"))
+    )
+    decimals: Optional[int] = field(
+        default_factory=lambda: _optional_int("QUERY_CACHE_DECIMALS")
+    )
+    hits: int = 0
+    misses: int = 0
+    _entries: "OrderedDict[str, Tuple[float, str, List[Dict[str, Any]]]]" = field(
+        default_factory=OrderedDict, init=False
+    )
+    _generations: Dict[str, int] = field(default_factory=dict, init=False)
+
+    def key(
+        self,
+        vector: VectorLike,
+        *,
+        top_k: int,
+        namespace: Optional[str] = None,
+        filter: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Return a stable key for one query."""
+        values = as_vector(vector)
+        if self.decimals is not None:
+            values = np.round(values, self.decimals) + np.float32(0.0)
+        digest = hashlib.sha256(values.tobytes())
+        scope = json.dumps([namespace or "", top_k, filter], sort_keys=True)
+        digest.update(scope.encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """Return cached matches for ``key`` or ``None`` on a miss."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            self._entries.pop(key, None)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return copy.deepcopy(entry[2])
+
+    def generation(self, namespace: Optional[str] = None) -> int:
+        """Return the current write generation of ``namespace``."""
+        return self._generations.get(namespace or "", 0)
+
+    def put(
+        self,
+        key: str,
+        matches: List[Dict[str, Any]],
+        *,
+        namespace: Optional[str],
+        generation: Optional[int] = None,
+    ) -> None:
+        """Store a copy of ``matches`` for ``key`` under ``namespace``.
+
+        Nothing is stored when ``generation`` is given and ``namespace`` has
+        been invalidated since it was read.
+        """
+        if self.max_entries < 1:
+            return
+        if generation is not None and generation != self.generation(namespace):
+            return
+        expires = time.monotonic() + self.ttl
+        self._entries[key] = (expires, namespace or "", copy.deepcopy(matches))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, namespace: Optional[str] = None) -> None:
+        """Drop every entry cached for ``namespace`` and bump its generation."""
+        scope = namespace or ""
+        self._generations[scope] = self._generations.get(scope, 0) + 1
+        for key in [k for k, entry in self._entries.items() if entry[1] == scope]:
+            del self._entries[key]
+
+    def stats(self) -> Dict[str, int]:
+        """Return hit/miss counters and the current entry count."""
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
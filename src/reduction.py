@@ -0,0 +1,239 @@
+"""Dimensionality reduction between the embedder and the vector index.
+
+A :class:`VectorReducer` maps full embeddings to fewer dimensions, either by
+a PCA projection learned on a corpus sample or by Matryoshka-style
+truncation, and renormalizes the result so cosine scores stay meaningful.
+The reducer is persisted next to the index and applied by
+:class:`ReducedStore` to every upserted and query vector alike.
+:func:`recall_report` measures what the reduction costs in recall@k on a
+labelled set, and :func:`neighbor_recall` on unlabelled held-out vectors.
+"""
+
+from __future__ import annotations
+
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+from .exceptions import IndexingError
+from .vectors import QueryResult, VectorBatch, VectorLike, as_batch, as_vector
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .vector_store import VectorStore
+
+KINDS = ("pca", "truncate")
+
+
+def _normalize(batch: VectorBatch) -> VectorBatch:
+    norms = np.linalg.norm(batch, axis=1, keepdims=True)
+    return np.ascontiguousarray(batch / np.maximum(norms, 1e-12), dtype=np.float32)
+
+
+@dataclass
+class VectorReducer:
+    """Project vectors from ``input_dimension`` to ``dimension``.
+
+    PCA reducers hold the sample ``mean`` and the top principal
+    ``components`` (one per row); truncation keeps the leading dimensions.
+    """
+
+    kind: str
+    input_dimension: int
+    dimension: int
+    mean: Optional[np.ndarray] = None
+    components: Optional[np.ndarray] = None
+
+    def __post_init__(self) -> None:
+        if self.kind not in KINDS:
+            raise IndexingError(f"unsupported reducer: {self.kind}")
+        if not 0 < self.dimension <= self.input_dimension:
+            raise IndexingError("reduced dimension must be in (0, input dimension]")
+        if self.kind == "pca" and (self.mean is None or self.components is None):
+            raise IndexingError("pca reducer requires mean and components")
+
+    @classmethod
+    def fit_pca(cls, sample: Any, dimension: int) -> "VectorReducer":
+        """Learn the top ``dimension`` principal components of ``sample``.
+
+        Raises:
+            IndexingError: If the sample has fewer rows than ``dimension``.
+        """
+        batch = _checked(sample)
+        if len(batch) < dimension:
+            raise IndexingError("pca sample needs at least `dimension` rows")
+        mean = batch.mean(axis=0)
+        _, _, vt = np.linalg.svd(batch - mean, full_matrices=False)
+        return cls(
+            "pca",
+            batch.shape[1],
+            dimension,
+            mean=mean.astype(np.float32),
+            components=np.ascontiguousarray(vt[:dimension], dtype=np.float32),
+        )
+
+    @classmethod
+    def truncate(cls, input_dimension: int, dimension: int) -> "VectorReducer":
+        """Keep the first ``dimension`` coordinates (Matryoshka models)."""
+        return cls("truncate", input_dimension, dimension)
+
+    def transform(self, vectors: Any) -> VectorBatch:
+        """Reduce and renormalize every row of ``vectors``."""
+        batch = _checked(vectors)
+        if batch.shape[1] != self.input_dimension:
+            raise IndexingError("vector dimension mismatch")
+        if self.mean is None or self.components is None:
+            return _normalize(batch[:, : self.dimension])
+        return _normalize((batch - self.mean) @ self.components.T)
+
+    def transform_one(self, vector: VectorLike) -> np.ndarray:
+        """Reduce a single vector."""
+        try:
+            return self.transform(as_vector(vector)[None, :])[0]
+        except ValueError as exc:
+            raise IndexingError("vector required") from exc
+
+    def save(self, path: Path) -> None:
+        """Atomically write the reducer to ``path`` as an ``.npz`` archive."""
+        path = Path(path)
+        arrays = {
+            "kind": np.asarray(self.kind),
+            "shape": np.asarray([self.input_dimension, self.dimension]),
+        }
+        if self.kind == "pca":
+            arrays.update(mean=self.mean, components=self.components)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".npz")
+            with os.fdopen(fd, "wb") as handle:
+                np.savez(handle, **arrays)
+            os.replace(tmp, path)
+        except OSError as exc:
+            raise IndexingError("failed to save reducer") from exc
+
+    @classmethod
+    def load(cls, path: Path) -> "VectorReducer":
+        """Read a reducer written by :meth:`save`."""
+        try:
+            with np.load(Path(path)) as data:
+                input_dimension, dimension = (int(v) for v in data["shape"])
+                return cls(
+                    str(data["kind"]),
+                    input_dimension,
+                    dimension,
+                    mean=data["mean"] if "mean" in data else None,
+                    components=data["components"] if "components" in data else None,
+                )
+        except (OSError, KeyError, ValueError) as exc:
+            raise IndexingError("failed to load reducer") from exc
+
+
+def _checked(vectors: Any) -> VectorBatch:
+    try:
+        return as_batch(vectors)
+    except ValueError as exc:
+        raise IndexingError("vectors must be a non-empty matrix") from exc
+
+
+class ReducedStore:
+    """Vector store wrapper that reduces vectors before the inner store."""
+
+    def __init__(self, store: VectorStore, reducer: VectorReducer) -> None:
+        self.store = store
+        self.reducer = reducer
+
+    async def upsert(
+        self, items: List[Tuple[str, VectorLike, Dict[str, Any]]], *, retries: int = 3
+    ) -> None:
+        """Reduce all vectors with one projection, then upsert them."""
+        if not items:
+            raise IndexingError("no items provided")
+        reduced = self.reducer.transform([vector for _, vector, _ in items])
+        rows = [(_id, row, meta) for (_id, _, meta), row in zip(items, reduced)]
+        await self.store.upsert(rows, retries=retries)
+
+    async def query(
+        self, vector: VectorLike, *, top_k: int = 1, retries: int = 3
+    ) -> List[Dict[str, Any]]:
+        return await self.store.query(
+            self.reducer.transform_one(vector), top_k=top_k, retries=retries
+        )
+
+    async def query_many(
+        self, vectors: Any, *, top_k: int = 1, retries: int = 3
+    ) -> List[QueryResult]:
+        return await self.store.query_many(
+            self.reducer.transform(vectors), top_k=top_k, retries=retries
+        )
+
+    async def delete(self, ids: List[str], *, retries: int = 3) -> None:
+        await self.store.delete(ids, retries=retries)
+
+
+def recall_at_k(
+    corpus: Any,
+    ids: Sequence[str],
+    queries: Any,
+    relevant: Sequence[Set[str]],
+    k: int,
+) -> float:
+    """Fraction of queries whose top ``k`` corpus rows include a relevant id."""
+    scores = _normalize(_checked(queries)) @ _normalize(_checked(corpus)).T
+    k = min(k, scores.shape[1])
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    hits = sum(
+        bool(relevant[row] & {ids[i] for i in top[row]}) for row in range(len(top))
+    )
+    return hits / len(top)
+
+
+def recall_report(
+    reducer: VectorReducer,
+    corpus: Any,
+    ids: Sequence[str],
+    queries: Any,
+    relevant: Sequence[Set[str]],
+    ks: Sequence[int] = (1, 5, 10),
+) -> Dict[str, Dict[int, float]]:
+    """Compare recall@k of full and reduced vectors on a labelled set.
+
+    Returns:
+        ``{"full": {k: recall}, "reduced": {k: recall}}``.
+    """
+    if len(queries) != len(relevant):
+        raise IndexingError("queries and relevant ids must have equal length")
+    reduced_corpus = reducer.transform(corpus)
+    reduced_queries = reducer.transform(queries)
+    return {
+        "full": {k: recall_at_k(corpus, ids, queries, relevant, k) for k in ks},
+        "reduced": {
+            k: recall_at_k(reduced_corpus, ids, reduced_queries, relevant, k)
+            for k in ks
+        },
+    }
+
+
+def neighbor_recall(
+    reducer: VectorReducer,
+    corpus: Any,
+    queries: Any,
+    ks: Sequence[int] = (1, 5, 10),
+) -> Dict[int, float]:
+    """Fraction of each query's full-space top ``k`` kept in the reduced space.
+
+    Ground truth is exact cosine search over the full ``corpus`` vectors.
+    Pass rows the reducer was not fitted on, or the estimate is optimistic.
+    """
+    full = _normalize(_checked(queries)) @ _normalize(_checked(corpus)).T
+    reduced = reducer.transform(queries) @ reducer.transform(corpus).T
+    recall = {}
+    for k in ks:
+        top = min(k, full.shape[1])
+        truth = np.argpartition(-full, top - 1, axis=1)[:, :top]
+        found = np.argpartition(-reduced, top - 1, axis=1)[:, :top]
+        hits = sum(len(set(t) & set(f)) for t, f in zip(truth, found))
+        recall[k] = hits / truth.size
+    return recall
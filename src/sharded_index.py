@@ -0,0 +1,275 @@
+"""Sharded vector store: routed upserts and parallel fan-out queries.
+
+A :class:`ShardedIndex` wraps several :class:`VectorStore` shards, such as
+Pinecone namespaces (see :meth:`PineconeIndex.with_namespace`) or local
+indexes. A router chosen at construction assigns every upserted item to one
+shard; queries fan out to all shards or a selected subset and merge the
+per-shard matches into a global top-k with a heap.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import heapq
+import os
+import time
+import zlib
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .exceptions import IndexingError
+from .vector_store import VectorStore
+from .vectors import QueryResult, VectorLike
+
+Router = Callable[[str, Dict[str, Any]], str]
+"""Map an item's ``(id, metadata)`` to the name of its shard."""
+
+
+def route_by_field(name: str, *, default: str) -> Router:
+    """Route items by the metadata field ``name``, falling back to ``default``."""
+
+    def _route(_id: str, metadata: Dict[str, Any]) -> str:
+        return str(metadata.get(name, default))
+
+    return _route
+
+
+def route_by_hash(shards: Sequence[str]) -> Router:
+    """Spread items evenly over ``shards`` by a stable hash of their id."""
+    names = list(shards)
+    if not names:
+        raise IndexingError("at least one shard is required")
+
+    def _route(_id: str, metadata: Dict[str, Any]) -> str:
+        return names[zlib.crc32(_id.encode("utf-8")) % len(names)]
+
+    return _route
+
+
+@dataclass
+class ShardedQuery:
+    """Merged matches of a fan-out query with per-shard diagnostics.
+
+    ``latencies`` holds seconds per queried shard; ``errors`` names shards
+    that timed out or failed and were left out of ``matches``.
+    """
+
+    matches: List[Dict[str, Any]] = field(default_factory=list)
+    latencies: Dict[str, float] = field(default_factory=dict)
+    errors: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def partial(self) -> bool:
+        return bool(self.errors)
+
+
+class ShardedIndex:
+    """Route writes to one shard each and fan queries out across shards.
+
+    An id lives on exactly one shard. The shard each id was last written to
+    is tracked, and when the router sends an id elsewhere it is deleted from
+    its old shard after the new write succeeds. Placement is not persisted:
+    copies written by an earlier process under a different routing are only
+    removed by an explicit :meth:`prune_other_shards`.
+    """
+
+    def __init__(
+        self,
+        shards: Dict[str, VectorStore],
+        router: Router,
+        *,
+        timeout: Optional[float] = None,
+    ) -> None:
+        if not shards:
+            raise IndexingError("at least one shard is required")
+        self.shards = dict(shards)
+        self.router = router
+        self.timeout = (
+            timeout
+            if timeout is not None
+            else float(os.getenv("SHARD_QUERY_TIMEOUT", "5"))
+        )
+        self._placement: Dict[str, str] = {}
+
+    async def upsert(
+        self, items: List[Tuple[str, VectorLike, Dict[str, Any]]], *, retries: int = 3
+    ) -> None:
+        """Upsert items into the shards chosen by the router.
+
+        Ids this instance previously wrote to another shard are deleted
+        from that shard afterwards.
+
+        Raises:
+            IndexingError: If input is empty or routes to an unknown shard.
+        """
+        if not items:
+            raise IndexingError("no items provided")
+        groups: Dict[str, List[Tuple[str, VectorLike, Dict[str, Any]]]] = {}
+        routes: Dict[str, str] = {}
+        for _id, vector, metadata in items:
+            name = self.router(_id, metadata or {})
+            if name not in self.shards:
+                raise IndexingError(f"item {_id} routed to unknown shard: {name}")
+            groups.setdefault(name, []).append((_id, vector, metadata))
+            routes[_id] = name
+        await asyncio.gather(
+            *(
+                self.shards[name].upsert(group, retries=retries)
+                for name, group in groups.items()
+            )
+        )
+        stale: Dict[str, List[str]] = {}
+        for _id, name in routes.items():
+            previous = self._placement.get(_id)
+            if previous is not None and previous != name:
+                stale.setdefault(previous, []).append(_id)
+        await asyncio.gather(
+            *(
+                self.shards[name].delete(ids, retries=retries)
+                for name, ids in stale.items()
+            )
+        )
+        self._placement.update(routes)
+
+    async def prune_other_shards(
+        self, placement: Dict[str, str], *, retries: int = 3
+    ) -> None:
+        """Delete each id from every shard except the one ``placement`` names.
+
+        Use this once after routing changes to clean up copies written by
+        earlier processes; it sends every id to every other shard.
+
+        Raises:
+            IndexingError: If ``placement`` names an unknown shard.
+        """
+        unknown = set(placement.values()) - set(self.shards)
+        if unknown:
+            raise IndexingError(f"unknown shards: {sorted(unknown)}")
+        stale = {
+            name: [_id for _id, home in placement.items() if home != name]
+            for name in self.shards
+        }
+        await asyncio.gather(
+            *(
+                self.shards[name].delete(ids, retries=retries)
+                for name, ids in stale.items()
+                if ids
+            )
+        )
+        self._placement.update(placement)
+
+    async def query(
+        self,
+        vector: VectorLike,
+        *,
+        top_k: int = 1,
+        retries: int = 3,
+        shards: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Return the global ``top_k`` matches across the selected shards."""
+        result = await self.query_shards(
+            vector, top_k=top_k, retries=retries, shards=shards
+        )
+        return result.matches
+
+    async def query_shards(
+        self,
+        vector: VectorLike,
+        *,
+        top_k: int = 1,
+        retries: int = 3,
+        shards: Optional[Sequence[str]] = None,
+    ) -> ShardedQuery:
+        """Query shards in parallel and merge whatever answered in time.
+
+        Raises:
+            IndexingError: If a shard name is unknown or every shard failed.
+        """
+        outcomes = await self._fan_out(
+            lambda store: store.query(vector, top_k=top_k, retries=retries), shards
+        )
+        result = ShardedQuery()
+        per_shard = []
+        for name, (matches, seconds, error) in outcomes.items():
+            result.latencies[name] = seconds
+            if error is None:
+                per_shard.append(matches)
+            else:
+                result.errors[name] = error
+        if not per_shard:
+            raise IndexingError(f"all shards failed: {result.errors}")
+        result.matches = _merge(per_shard, top_k)
+        return result
+
+    async def query_many(
+        self,
+        vectors: Any,
+        *,
+        top_k: int = 1,
+        retries: int = 3,
+        shards: Optional[Sequence[str]] = None,
+    ) -> List[QueryResult]:
+        """Batch query every shard and merge each row's matches.
+
+        A row fails only when it failed on every shard that answered.
+        """
+        outcomes = await self._fan_out(
+            lambda store: store.query_many(vectors, top_k=top_k, retries=retries),
+            shards,
+        )
+        answered = [rows for rows, _, error in outcomes.values() if error is None]
+        if not answered:
+            errors = {name: error for name, (_, _, error) in outcomes.items()}
+            raise IndexingError(f"all shards failed: {errors}")
+        results = []
+        for row in zip(*answered):
+            ok = [r.matches for r in row if r.ok]
+            if ok:
+                results.append(QueryResult(_merge(ok, top_k)))
+            else:
+                results.append(QueryResult(error="; ".join(str(r.error) for r in row)))
+        return results
+
+    async def delete(self, ids: List[str], *, retries: int = 3) -> None:
+        """Delete ids from every shard, since routing may depend on metadata."""
+        if not ids:
+            raise IndexingError("no ids provided")
+        await asyncio.gather(
+            *(store.delete(ids, retries=retries) for store in self.shards.values())
+        )
+        for _id in ids:
+            self._placement.pop(_id, None)
+
+    async def _fan_out(
+        self, call: Callable[[VectorStore], Any], shards: Optional[Sequence[str]]
+    ) -> Dict[str, Tuple[Any, float, Optional[str]]]:
+        """Run ``call`` on each selected shard under the shard timeout.
+
+        Returns ``(result, seconds, error)`` per shard name.
+        """
+        names = list(self.shards) if shards is None else list(shards)
+        unknown = [name for name in names if name not in self.shards]
+        if unknown or not names:
+            raise IndexingError(f"unknown or empty shard selection: {unknown}")
+
+        async def _timed(name: str) -> Tuple[Any, float, Optional[str]]:
+            start = time.perf_counter()
+            try:
+                value = await asyncio.wait_for(
+                    call(self.shards[name]), timeout=self.timeout
+                )
+            except asyncio.TimeoutError:
+                return None, time.perf_counter() - start, "timeout"
+            except Exception as exc:  # noqa: BLE001
+                return None, time.perf_counter() - start, repr(exc)
+            return value, time.perf_counter() - start, None
+
+        outcomes = await asyncio.gather(*(_timed(name) for name in names))
+        return dict(zip(names, outcomes))
+
+
+def _merge(per_shard: List[List[Dict[str, Any]]], top_k: int) -> List[Dict[str, Any]]:
+    """Keep the ``top_k`` highest scoring matches across shards."""
+    return heapq.nlargest(
+        top_k, (m for matches in per_shard for m in matches), key=lambda m: m["score"]
+    )
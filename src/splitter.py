@@ -0,0 +1,203 @@
+"""Rule-based sentence and clause splitting as a free propositionizer.
+
+Sentence boundaries are found with one compiled regular expression and
+filtered by an abbreviation list, so the splitter runs at regex speed on a
+single core. Sentences longer than ``max_chars`` are split at clause
+boundaries and then cut at whitespace. Fragments shorter than ``min_chars``
+are merged with their neighbour. Every piece keeps its character offsets, so
+citations work as they do for LLM propositions.
+
+:func:`select_propositionizer` picks this splitter or the LLM
+:class:`~src.propositionizer.Propositionizer` per file type.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Protocol, Tuple
+
+from .exceptions import OpenRouterError
+from .propositionizer import Proposition
+
+Span = Tuple[int, int]
+
+# Candidate ends: terminal punctuation, or a newline, followed by whitespace.
+# A single alternation-free pattern keeps the scan several times faster.
+_BOUNDARY = re.compile(r"[.!?\n][.!?'\")\]]*(?=\s)")
+_BLANK = re.compile(r"[ \t]*\n")
+_CLAUSE = re.compile(
+    r"[;:]\s+|,\s+(?=(?:and|but|or|so|yet|which|while|because|although|"
+    r"whereas|though)\b)"
+)
+_NEXT = re.compile(r"\s*(\S)")
+_WORD = re.compile(r"\S*$")
+# Longest word before a period checked against the abbreviation list.
+_LOOKBEHIND = 16
+_ABBREVIATIONS = frozenset(
+    "mr mrs ms dr prof sr jr st vs etc e.g i.e cf al fig no vol pp ca approx "
+    "inc ltd co corp dept est jan feb mar apr jun jul aug sep sept oct nov dec "
+    "u.s u.k".split()
+)
+
+
+def sentence_spans(text: str) -> List[Span]:
+    """Return ``(start, end)`` spans of the sentences in ``text``.
+
+    A period does not end a sentence after a known abbreviation or a single
+    initial, or when the next word starts in lower case. Blank lines always
+    end one; single line breaks never do.
+    """
+    spans: List[Span] = []
+    start = 0
+    for match in _BOUNDARY.finditer(text):
+        end = match.end()
+        mark = text[match.start()]
+        if mark == "\n":
+            if not _BLANK.match(text, end):
+                continue
+        elif mark == "." and _continues(text, match.start(), end):
+            continue
+        _append(spans, text, start, end)
+        start = end
+    _append(spans, text, start, len(text))
+    return spans
+
+
+def _continues(text: str, dot: int, end: int) -> bool:
+    """True if the period at ``dot`` does not end a sentence."""
+    window = text[max(0, dot - _LOOKBEHIND) : dot]
+    word = window[_WORD.search(window).start() :].lstrip("(\"'").lower()
+    if word in _ABBREVIATIONS or (len(word) == 1 and word.isalpha()):
+        return True
+    following = _NEXT.match(text, end)
+    return following is not None and following.group(1).islower()
+
+
+def _append(spans: List[Span], text: str, start: int, end: int) -> None:
+    """Append ``[start, end)`` trimmed of surrounding whitespace, if non-empty."""
+    while start < end and text[start].isspace():
+        start += 1
+    while end > start and text[end - 1].isspace():
+        end -= 1
+    if start < end:
+        spans.append((start, end))
+
+
+def _clauses(text: str, start: int, end: int) -> Iterator[Span]:
+    """Split ``[start, end)`` after semicolons, colons and conjunction commas."""
+    position = start
+    for match in _CLAUSE.finditer(text, start, end):
+        yield position, match.end()
+        position = match.end()
+    yield position, end
+
+
+def _windows(text: str, start: int, end: int, max_chars: int) -> Iterator[Span]:
+    """Cut ``[start, end)`` into pieces of at most ``max_chars`` at whitespace."""
+    while end - start > max_chars:
+        cut = text.rfind(" ", start + 1, start + max_chars + 1)
+        cut = cut if cut > start else start + max_chars
+        yield start, cut
+        start = cut
+    yield start, end
+
+
+@dataclass
+class RuleSplitter:
+    """Split text into sentence-level pieces without any model calls.
+
+    Pieces are at most ``max_chars`` (``SPLITTER_MAX_CHARS``) long and, where
+    a neighbour leaves room, at least ``min_chars`` (``SPLITTER_MIN_CHARS``).
+    """
+
+    max_chars: int = field(
+        default_factory=lambda: int(os.getenv("SPLITTER_MAX_CHARS", "400"))
+    )
+    min_chars: int = field(
+        default_factory=lambda: int(os.getenv("SPLITTER_MIN_CHARS", "40"))
+    )
+
+    def __post_init__(self) -> None:
+        if self.max_chars < 1 or not 0 <= self.min_chars <= self.max_chars:
+            raise ValueError("invalid splitter bounds")
+
+    def spans(self, text: str) -> List[Span]:
+        """Return offsets of the pieces of ``text`` in order."""
+        pieces: List[Span] = []
+        for start, end in sentence_spans(text):
+            if end - start <= self.max_chars:
+                pieces.append((start, end))
+                continue
+            for c_start, c_end in _clauses(text, start, end):
+                for w_start, w_end in _windows(text, c_start, c_end, self.max_chars):
+                    _append(pieces, text, w_start, w_end)
+        return self._merge(pieces)
+
+    def split(self, text: str) -> List[Proposition]:
+        """Return the pieces of ``text`` with their offsets."""
+        return [Proposition(text[s:e], s, e) for s, e in self.spans(text)]
+
+    async def propositionize(self, text: str) -> List[Proposition]:
+        """Split ``text`` off the event loop; mirrors the LLM propositionizer."""
+        return await asyncio.to_thread(self.split, text)
+
+    def _merge(self, pieces: List[Span]) -> List[Span]:
+        """Join pieces shorter than ``min_chars`` onto the following piece."""
+        merged: List[Span] = []
+        for start, end in pieces:
+            if merged:
+                prev_start, prev_end = merged[-1]
+                short = prev_end - prev_start < self.min_chars
+                if short and end - prev_start <= self.max_chars:
+                    merged[-1] = (prev_start, end)
+                    continue
+            merged.append((start, end))
+        return merged
+
+
+class PropositionSource(Protocol):
+    """Anything that turns text into offset-carrying propositions."""
+
+    async def propositionize(self, text: str) -> List[Proposition]:
+        """Return the propositions of ``text``."""
+
+
+def splitter_modes() -> Dict[str, str]:
+    """Map file suffixes to ``"rules"`` or ``"llm"`` from ``SPLITTER_MODES``.
+
+    The variable holds comma-separated ``suffix=mode`` pairs, for example
+    ``".txt=rules,.pdf=llm"``.
+    """
+    modes: Dict[str, str] = {}
+    for pair in os.getenv("SPLITTER_MODES", "").split(","):
+        suffix, _, mode = pair.partition("=")
+        if suffix.strip() and mode.strip():
+            modes[suffix.strip().lower()] = mode.strip().lower()
+    return modes
+
+
+def select_propositionizer(
+    path: Path, llm: Optional[PropositionSource], rules: RuleSplitter
+) -> PropositionSource:
+    """Return the propositionizer configured for ``path``'s file type.
+
+    Types not listed in ``SPLITTER_MODES`` use ``SPLITTER_DEFAULT_MODE``
+    (default ``"rules"``).
+
+    Raises:
+        OpenRouterError: If the LLM mode is selected but ``llm`` is ``None``.
+        ValueError: If the configured mode is unknown.
+    """
+    default = os.getenv("SPLITTER_DEFAULT_MODE", "rules").lower()
+    mode = splitter_modes().get(Path(path).suffix.lower(), default)
+    if mode == "rules":
+        return rules
+    if mode != "llm":
+        raise ValueError(f"unknown splitter mode: {mode}")
+    if llm is None:
+        raise OpenRouterError("LLM propositionizer not configured")
+    return llm
@@ -0,0 +1,86 @@
+"""Async micro-batching that coalesces concurrent calls into one batch call."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Generic, List, Sequence, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+@dataclass
+class _Pending(Generic[T]):
+    """Items submitted by one caller and the future awaiting their results."""
+
+    items: Sequence[T]
+    future: asyncio.Future = field(repr=False)
+
+
+class MicroBatcher(Generic[T, R]):
+    """Collect concurrent submissions and run them through one batch call.
+
+    A batch is flushed when it reaches ``max_batch_size`` items or when
+    ``max_wait_ms`` has elapsed since its first submission, whichever comes
+    first. Each caller receives only the rows for the items it submitted.
+    """
+
+    def __init__(
+        self,
+        func: Callable[[List[T]], Awaitable[Sequence[R]]],
+        *,
+        max_batch_size: int,
+        max_wait_ms: float,
+    ) -> None:
+        if max_batch_size < 1 or max_wait_ms < 0:
+            raise ValueError("invalid batching parameters")
+        self._func = func
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._pending: List[_Pending[T]] = []
+        self._size = 0
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def submit(self, items: Sequence[T]) -> Sequence[R]:
+        """Queue ``items`` for the next batch and return their results."""
+        loop = asyncio.get_running_loop()
+        pending = _Pending(items, loop.create_future())
+        self._pending.append(pending)
+        self._size += len(items)
+        if self._size >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait_ms / 1000, self._flush)
+        return await pending.future
+
+    def _flush(self) -> None:
+        """Detach the current batch and schedule its execution."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending, self._size = self._pending, [], 0
+        if batch:
+            task = asyncio.get_running_loop().create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[_Pending[T]]) -> None:
+        """Execute one batch call and distribute results to each caller."""
+        items = [item for pending in batch for item in pending.items]
+        try:
+            results = await self._func(items)
+            if len(results) != len(items):
+                raise ValueError("batch function returned wrong number of rows")
+        except Exception as exc:  # noqa: BLE001
+            for pending in batch:
+                if not pending.future.done():
+                    pending.future.set_exception(exc)
+            return
+        offset = 0
+        for pending in batch:
+            count = len(pending.items)
+            if not pending.future.done():
+                pending.future.set_result(results[offset : offset + count])
+            offset += count
@@ -0,0 +1,84 @@
+"""Shared scaffolding for the SQLite-backed stores and caches."""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import sqlite3
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, ClassVar, List, Optional, Tuple, Type, TypeVar
+
+T = TypeVar("T")
+
+_HASH_BLOCK = 1 << 20
+
+# Stay well below SQLite's bound-parameter limit for ``IN`` lookups.
+_LOOKUP_CHUNK = 500
+
+
+def hash_file(path: Path, digest: Optional[Any] = None) -> Any:
+    """Feed the bytes of ``path`` into ``digest`` block by block.
+
+    ``digest`` defaults to a fresh SHA-256 and is returned for chaining.
+    """
+    digest = hashlib.sha256() if digest is None else digest
+    with open(path, "rb") as handle:
+        while block := handle.read(_HASH_BLOCK):
+            digest.update(block)
+    return digest
+
+
+@dataclass
+class SqliteStore:
+    """One lazily opened, lock-guarded SQLite connection at ``self.path``.
+
+    Subclasses declare a ``path`` field and set ``_schema`` to the statements
+    run on connect. Database errors, and any other ``_db_errors``, raised by
+    :meth:`_run_db` are re-raised as ``_db_error(_db_unavailable)``.
+    """
+
+    _schema: ClassVar[Tuple[str, ...]] = ()
+    _db_error: ClassVar[Type[Exception]] = RuntimeError
+    _db_unavailable: ClassVar[str] = "database unavailable"
+    _db_errors: ClassVar[Tuple[Type[BaseException], ...]] = (sqlite3.Error,)
+
+    _db: Optional[sqlite3.Connection] = field(default=None, init=False, repr=False)
+    _db_lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False
+    )
+
+    def close(self) -> None:
+        """Close the database connection if open."""
+        with self._db_lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    async def _run_db(self, func: Callable[[Any], T], arg: Any) -> T:
+        """Run a database operation in a worker thread."""
+        try:
+            return await asyncio.to_thread(func, arg)
+        except self._db_errors as exc:
+            raise self._db_error(self._db_unavailable) from exc
+
+    def _connect(self) -> sqlite3.Connection:
+        """Return the connection, opening it and creating the schema if needed.
+
+        Callers must hold ``_db_lock``.
+        """
+        if self._db is None:
+            self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+            for statement in self._schema:
+                self._db.execute(statement)
+        return self._db
+
+    @staticmethod
+    def _select(db: sqlite3.Connection, sql: str, values: List[Any]) -> List[Any]:
+        """Run ``sql`` with an ``IN ({marks})`` clause over ``values`` in chunks."""
+        rows: List[Any] = []
+        for start in range(0, len(values), _LOOKUP_CHUNK):
+            chunk = values[start : start + _LOOKUP_CHUNK]
+            rows += db.execute(sql.format(marks=",".join("?" * len(chunk))), chunk)
+        return rows
@@ -0,0 +1,123 @@
+"""Pluggable vector-store interface and backend selection."""
+
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Protocol, Tuple
+
+from .exceptions import IndexingError
+from .index_snapshot import has_snapshot
+from .local_index import ExactIndex, HnswIndex, PqIndex
+from .reduction import ReducedStore, VectorReducer
+from .vectors import QueryResult, VectorLike
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .monitoring import UsageMonitor
+
+
+class VectorStore(Protocol):
+    """Operations shared by every vector index backend.
+
+    Matches are dictionaries with ``id``, ``score`` and ``metadata`` keys.
+    """
+
+    async def upsert(
+        self, items: List[Tuple[str, VectorLike, Dict[str, Any]]], *, retries: int = 3
+    ) -> None:
+        """Insert or replace ``(id, vector, metadata)`` items."""
+
+    async def query(
+        self, vector: VectorLike, *, top_k: int = 1, retries: int = 3
+    ) -> List[Dict[str, Any]]:
+        """Return the ``top_k`` nearest matches for ``vector``."""
+
+    async def query_many(
+        self, vectors: Any, *, top_k: int = 1, retries: int = 3
+    ) -> List[QueryResult]:
+        """Query every row of ``vectors``; results align with the input rows."""
+
+    async def delete(self, ids: List[str], *, retries: int = 3) -> None:
+        """Remove vectors by id."""
+
+
+def _pinecone(dimension: int, monitor: UsageMonitor | None) -> VectorStore:
+    from .pinecone_index import PineconeIndex
+
+    return PineconeIndex(dimension=dimension, monitor=monitor)
+
+
+def _exact(dimension: int, monitor: UsageMonitor | None) -> VectorStore:
+    path = os.getenv("VECTOR_STORE_PATH")
+    if path and has_snapshot(path):
+        return ExactIndex.from_snapshot(path)
+    return ExactIndex(dimension=dimension)
+
+
+def _hnsw(dimension: int, monitor: UsageMonitor | None) -> VectorStore:
+    path = os.getenv("VECTOR_STORE_PATH")
+    ef_search = int(os.getenv("HNSW_EF_SEARCH", "50"))
+    if path and has_snapshot(path):
+        return HnswIndex.from_snapshot(path, ef_search=ef_search)
+    return HnswIndex(
+        dimension=dimension,
+        m=int(os.getenv("HNSW_M", "16")),
+        ef_construction=int(os.getenv("HNSW_EF_CONSTRUCTION", "100")),
+        ef_search=ef_search,
+    )
+
+
+def _pq(dimension: int, monitor: UsageMonitor | None) -> VectorStore:
+    path = os.getenv("VECTOR_STORE_PATH")
+    rerank = int(os.getenv("PQ_RERANK", "100"))
+    spill_dir = os.getenv("PQ_SPILL_DIR") or None
+    if path and has_snapshot(path):
+        return PqIndex.from_snapshot(path, rerank=rerank, spill_dir=spill_dir)
+    return PqIndex(
+        dimension=dimension,
+        subspaces=int(os.getenv("PQ_SUBSPACES", "48")),
+        rerank=rerank,
+        train_size=int(os.getenv("PQ_TRAIN_SIZE", "10000")),
+        spill_dir=spill_dir,
+    )
+
+
+_BACKENDS: Dict[str, Callable[[int, UsageMonitor | None], VectorStore]] = {
+    "pinecone": _pinecone,
+    "exact": _exact,
+    "hnsw": _hnsw,
+    "pq": _pq,
+}
+
+
+def vector_store_backend() -> str:
+    """Return the configured backend name from ``VECTOR_STORE_BACKEND``."""
+    return os.getenv("VECTOR_STORE_BACKEND", "pinecone")
+
+
+def create_vector_store(
+    backend: str | None = None,
+    *,
+    dimension: int = 384,
+    monitor: UsageMonitor | None = None,
+) -> VectorStore:
+    """Build the vector store selected by ``backend`` or configuration.
+
+    Local backends map the snapshot at ``VECTOR_STORE_PATH`` when one exists.
+    When ``VECTOR_REDUCER_PATH`` names a saved :class:`VectorReducer`, the
+    backend is built at the reduced dimension and wrapped so every vector is
+    reduced on the way in.
+
+    Raises:
+        IndexingError: If the backend is unknown or fails to initialize.
+    """
+    name = backend or vector_store_backend()
+    factory = _BACKENDS.get(name)
+    if factory is None:
+        raise IndexingError(f"unsupported vector store backend: {name}")
+    reducer_path = os.getenv("VECTOR_REDUCER_PATH")
+    if not reducer_path:
+        return factory(dimension, monitor)
+    reducer = VectorReducer.load(reducer_path)
+    if reducer.input_dimension != dimension:
+        raise IndexingError("reducer input dimension does not match embeddings")
+    return ReducedStore(factory(reducer.dimension, monitor), reducer)
@@ -0,0 +1,78 @@
+"""Array-native vector types shared by the embedder, caches and indexes.
+
+Vectors travel through the pipeline as C-contiguous float32 NumPy buffers.
+Conversion to Python lists happens only where a payload is serialized for an
+external service (see :func:`to_list`).
+"""
+
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+from numpy.typing import NDArray
+
+Vector = NDArray[np.float32]
+"""A single embedding of shape ``(dim,)``."""
+
+VectorBatch = NDArray[np.float32]
+"""A row-major matrix of embeddings of shape ``(n, dim)``."""
+
+VectorLike = Union[Sequence[float], NDArray[Any]]
+
+STORAGE_DTYPES: Dict[str, type] = {"float32": np.float32, "float16": np.float16}
+
+
+@dataclass
+class QueryResult:
+    """Matches for one row of a batched query, or the error that row hit."""
+
+    matches: List[Dict[str, Any]] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def as_batch(vectors: Any) -> VectorBatch:
+    """Return ``vectors`` as a contiguous 2-D float32 matrix.
+
+    Raises:
+        ValueError: If ``vectors`` is empty or not two-dimensional.
+    """
+    batch = np.ascontiguousarray(vectors, dtype=np.float32)
+    if batch.ndim != 2 or batch.size == 0:
+        raise ValueError("vectors must form a non-empty 2-D matrix")
+    return batch
+
+
+def as_vector(vector: VectorLike) -> Vector:
+    """Return ``vector`` as a contiguous 1-D float32 array.
+
+    Raises:
+        ValueError: If ``vector`` is empty or not one-dimensional.
+    """
+    array = np.ascontiguousarray(vector, dtype=np.float32)
+    if array.ndim != 1 or array.size == 0:
+        raise ValueError("vector must be a non-empty 1-D array")
+    return array
+
+
+def storage_dtype(name: str | None = None) -> type:
+    """Resolve a storage dtype name, defaulting to ``VECTOR_STORAGE_DTYPE``.
+
+    Raises:
+        ValueError: If the dtype is not ``float32`` or ``float16``.
+    """
+    name = name or os.getenv("VECTOR_STORAGE_DTYPE", "float32")
+    if name not in STORAGE_DTYPES:
+        raise ValueError(f"unsupported storage dtype: {name}")
+    return STORAGE_DTYPES[name]
+
+
+def to_list(vector: VectorLike) -> List[float]:
+    """Convert a vector to a list of Python floats for serialization."""
+    return as_vector(vector).tolist()
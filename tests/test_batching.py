@@ -0,0 +1,59 @@
+import asyncio
+from typing import List
+
+import pytest
+
+from src.utils.batching import MicroBatcher
+
+
+@pytest.mark.asyncio
+async def test_flushes_when_batch_full() -> None:
+    batches: List[List[int]] = []
+
+    async def double(items: List[int]) -> List[int]:
+        batches.append(items)
+        return [i * 2 for i in items]
+
+    batcher = MicroBatcher(double, max_batch_size=3, max_wait_ms=10_000)
+    results = await asyncio.gather(batcher.submit([1, 2]), batcher.submit([3]))
+    assert batches == [[1, 2, 3]]
+    assert results == [[2, 4], [6]]
+
+
+@pytest.mark.asyncio
+async def test_flushes_after_wait() -> None:
+    async def identity(items: List[int]) -> List[int]:
+        return items
+
+    batcher = MicroBatcher(identity, max_batch_size=100, max_wait_ms=1)
+    assert await batcher.submit([7]) == [7]
+
+
+@pytest.mark.asyncio
+async def test_errors_propagate_to_every_caller() -> None:
+    async def fail(items: List[int]) -> List[int]:
+        raise RuntimeError("boom")
+
+    batcher = MicroBatcher(fail, max_batch_size=2, max_wait_ms=1)
+    results = await asyncio.gather(
+        batcher.submit([1]), batcher.submit([2]), return_exceptions=True
+    )
+    assert all(isinstance(r, RuntimeError) for r in results)
+
+
+@pytest.mark.asyncio
+async def test_rejects_mismatched_rows() -> None:
+    async def short(items: List[int]) -> List[int]:
+        return items[:-1]
+
+    batcher = MicroBatcher(short, max_batch_size=2, max_wait_ms=1)
+    with pytest.raises(ValueError):
+        await batcher.submit([1, 2])
+
+
+def test_invalid_parameters() -> None:
+    async def noop(items: List[int]) -> List[int]:
+        return items
+
+    with pytest.raises(ValueError):
+        MicroBatcher(noop, max_batch_size=0, max_wait_ms=1)
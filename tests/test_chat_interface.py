@@ -135,3 +135,37 @@ async def test_handle_message_index_retry_success() -> None:
     result = await handle_message("hi", embedder=StubEmbedder(), index=index)
     assert result == "response"
     assert index.calls == 2
+
+
+class IdOnlyIndex:
+    async def query(self, vector, top_k=1):
+        return [{"id": "p1", "score": 1.0, "metadata": {}}]
+
+
+@pytest.mark.asyncio
+async def test_handle_message_hydrates_from_document_store() -> None:
+    from src.document_store import Document, DocumentStore
+
+    _, handle_message, _ = _import_modules()
+    documents = DocumentStore(path=":memory:")
+    await documents.put_many([Document("p1", "stored text")])
+    result = await handle_message(
+        "hi", embedder=StubEmbedder(), index=IdOnlyIndex(), documents=documents
+    )
+    assert result == "stored text"
+    fallback = await handle_message(
+        "hi", embedder=StubEmbedder(), index=StubIndex(), documents=documents
+    )
+    assert fallback == "response"
+
+
+@pytest.mark.asyncio
+async def test_handle_message_document_store_failure(tmp_path: Path) -> None:
+    from src.document_store import DocumentStore
+
+    _, handle_message, ChatError = _import_modules()
+    documents = DocumentStore(path=str(tmp_path / "missing" / "docs.sqlite3"))
+    with pytest.raises(ChatError, match="document lookup failed"):
+        await handle_message(
+            "hi", embedder=StubEmbedder(), index=IdOnlyIndex(), documents=documents
+        )
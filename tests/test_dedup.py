@@ -0,0 +1,78 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src.dedup import NearDuplicateFilter, shingles  # noqa: E402
+from src.exceptions import IndexingError  # noqa: E402
+
+BASE = (
+    "so today we are talking about how the garden needs water every morning "
+    "before the sun gets too hot and the soil dries out completely"
+)
+
+
+def test_shingles_normalize_case_and_whitespace() -> None:
+    assert shingles("A  b C d") == shingles("a b c D") == {"a b c", "b c d"}
+    assert shingles("short") == {"short"}
+
+
+def test_signature_similarity_tracks_jaccard() -> None:
+    dedup = NearDuplicateFilter(path=":memory:")
+    same = dedup.signature(BASE) == dedup.signature(BASE.upper())
+    near = dedup.signature(BASE) == dedup.signature(BASE + " again")
+    far = dedup.signature(BASE) == dedup.signature("an unrelated sentence entirely")
+    assert same.all() and near.mean() > 0.8 and far.mean() < 0.2
+
+
+@pytest.mark.asyncio
+async def test_filter_folds_duplicates_within_batch() -> None:
+    dedup = NearDuplicateFilter(path=":memory:")
+    result = await dedup.filter(
+        [
+            ("p1", BASE, {"source": "a"}),
+            ("p2", "the weather was fine", {}),
+            ("p3", BASE + " again", {"source": "b"}),
+            ("p4", BASE.replace("so today", "So, today"), {}),
+        ]
+    )
+    assert [p[0] for p in result.unique] == ["p1", "p2"]
+    assert result.unique[0][2] == {"source": "a", "aliases": ["p3", "p4"]}
+    assert result.aliases == {"p3": "p1", "p4": "p1"}
+
+
+@pytest.mark.asyncio
+async def test_signatures_persist_across_runs(tmp_path: Path) -> None:
+    path = str(tmp_path / "dedup.sqlite3")
+    first = NearDuplicateFilter(path=path)
+    await first.filter([("p1", BASE, {})])
+    first.close()
+
+    second = NearDuplicateFilter(path=path)
+    result = await second.filter(
+        [("p9", BASE + " again", {}), ("p1", BASE, {}), ("p2", "new text", {})]
+    )
+    assert [p[0] for p in result.unique] == ["p1", "p2"]
+    assert result.aliases == {"p9": "p1"}
+    assert await second.canonical_of(["p9", "p2"]) == {"p9": "p1"}
+    second.close()
+
+
+@pytest.mark.asyncio
+async def test_forget_drops_state_and_returns_orphaned_aliases() -> None:
+    dedup = NearDuplicateFilter(path=":memory:")
+    await dedup.filter([("p1", BASE, {}), ("p2", BASE + " again", {})])
+    await dedup.filter([("p3", BASE.upper(), {})])
+    assert await dedup.forget(["p1"]) == ["p2", "p3"]
+    assert await dedup.canonical_of(["p2", "p3"]) == {}
+    result = await dedup.filter([("p2", BASE + " again", {})])
+    assert [p[0] for p in result.unique] == ["p2"]
+
+
+def test_invalid_configuration() -> None:
+    with pytest.raises(IndexingError):
+        NearDuplicateFilter(bands=5)
+    with pytest.raises(IndexingError):
+        NearDuplicateFilter(threshold=0)
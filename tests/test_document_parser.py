@@ -17,8 +17,8 @@ class AsyncFile:
     async def __aexit__(self, exc_type, exc, tb):
         self._f.close()
 
-    async def read(self) -> str:
-        return self._f.read()
+    async def read(self, size: int = -1) -> str:
+        return self._f.read(size)
 
 
 aiofiles_stub = types.SimpleNamespace(
@@ -39,7 +39,7 @@ class DummyReader:
 
 sys.modules["PyPDF2"] = types.SimpleNamespace(PdfReader=DummyReader)
 
-from src.document_parser import parse_document  # noqa: E402
+from src.document_parser import iter_document, parse_document  # noqa: E402
 from src.exceptions import DocumentParsingError  # noqa: E402
 
 import pytest  # noqa: E402
@@ -80,3 +80,179 @@ async def test_rejects_path_traversal(tmp_path: Path) -> None:
     traversal = base / ".." / outside.name
     with pytest.raises(DocumentParsingError):
         await parse_document(traversal, base_dir=base)
+
+
+class PagedReader:
+    def __init__(self, path):
+        self.pages = [
+            types.SimpleNamespace(extract_text=lambda n=n: f"page {n}") for n in (1, 2)
+        ]
+        self.pages.append(types.SimpleNamespace(extract_text=lambda: None))
+
+
+@pytest.mark.asyncio
+async def test_iter_document_streams_pdf_pages(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import src.document_parser as parser
+
+    monkeypatch.setattr(parser, "PdfReader", PagedReader)
+    pdf_path = tmp_path / "sample.pdf"
+    pdf_path.write_bytes(b"")
+    chunks = [c async for c in iter_document(pdf_path, base_dir=tmp_path)]
+    assert [(c.page, c.index, c.text) for c in chunks] == [
+        (1, 0, "page 1"),
+        (2, 1, "page 2"),
+    ]
+    stream = iter_document(pdf_path, base_dir=tmp_path, max_chars=4)
+    assert [(c.page, c.start, c.text) for c in [c async for c in stream]][:2] == [
+        (1, 0, "page"),
+        (1, 4, " 1"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_iter_document_serves_cached_pdf_pages(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import src.document_parser as parser
+    from src.parse_cache import ParseCache
+
+    extracted = []
+
+    class FeedReader:
+        def __init__(self, path):
+            texts = ["page\fone", "page two", None]
+            self.pages = [
+                types.SimpleNamespace(
+                    extract_text=lambda n=n, t=t: extracted.append(n) or t
+                )
+                for n, t in enumerate(texts, 1)
+            ]
+
+    monkeypatch.setattr(parser, "PdfReader", FeedReader)
+    pdf_path = tmp_path / "sample.pdf"
+    pdf_path.write_bytes(b"")
+    cache = ParseCache(path=str(tmp_path / "parse.sqlite3"))
+
+    async def pieces():
+        stream = iter_document(pdf_path, tmp_path, max_chars=5, cache=cache)
+        return [(c.page, c.start, c.text) async for c in stream]
+
+    first = await pieces()
+    assert first == [(1, 0, "page"), (1, 4, "\fone"), (2, 0, "page"), (2, 4, " two")]
+    assert extracted == [1, 2, 3] and await pieces() == first
+    assert extracted == [1, 2, 3]
+    key = await cache.key(pdf_path, parser._PAGES_VERSION)
+    cache._connect().execute("DELETE FROM parses WHERE key = ?", (f"{key}:2",))
+    assert await pieces() == first and extracted == [1, 2, 3, 2]
+    cache.close()
+
+
+def test_split_text_keeps_every_character() -> None:
+    from src.document_parser import split_text
+
+    text = "alpha\tbeta\n\ngamma  delta " + "x" * 12
+    pieces = list(split_text(text, 8))
+    assert "".join(piece for _, piece in pieces) == text
+    assert all(len(piece) <= 8 for _, piece in pieces)
+    assert all(text[start:].startswith(piece) for start, piece in pieces)
+    assert pieces[:2] == [(0, "alpha"), (5, "\tbeta\n")]
+    assert list(split_text("", 8)) == [] and list(split_text("ab", None)) == [(0, "ab")]
+
+
+@pytest.mark.asyncio
+async def test_iter_document_bounds_text_chunks(tmp_path: Path) -> None:
+    txt = tmp_path / "long.txt"
+    words = " ".join(f"w{i}" for i in range(200))
+    txt.write_text(words)
+    chunks = [c async for c in iter_document(txt, base_dir=tmp_path, max_chars=50)]
+    assert all(len(c.text) <= 50 and c.page == 1 for c in chunks)
+    assert "".join(c.text for c in chunks) == words
+    assert all(words[c.start : c.start + len(c.text)] == c.text for c in chunks)
+    assert [c.index for c in chunks] == list(range(len(chunks)))
+    with pytest.raises(DocumentParsingError):
+        [c async for c in iter_document(txt, base_dir=tmp_path, max_chars=0)]
+    with pytest.raises(DocumentParsingError):
+        [c async for c in iter_document(tmp_path / "x.docx", base_dir=tmp_path)]
+
+
+class NamedReader:
+    def __init__(self, path):
+        if Path(path).stem == "broken":
+            raise ValueError("corrupt pdf")
+        self.pages = [types.SimpleNamespace(extract_text=lambda: Path(path).stem)]
+
+
+@pytest.mark.asyncio
+async def test_parse_directory_uses_pool_and_isolates_failures(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import src.document_parser as parser
+    from src.document_parser import parse_directory, parse_documents
+
+    monkeypatch.setattr(parser, "PdfReader", NamedReader)
+    docs = tmp_path / "docs"
+    (docs / "nested").mkdir(parents=True)
+    for name in ("a.pdf", "nested/b.pdf", "broken.pdf"):
+        (docs / name).write_bytes(b"")
+    (docs / "notes.txt").write_text("plain")
+    (docs / "skip.docx").write_text("ignored")
+
+    results = [
+        r
+        async for r in parse_directory(
+            docs, base_dir=tmp_path, workers=2, mp_context="fork"
+        )
+    ]
+    texts = {r.path.name: r.text for r in results if r.ok}
+    assert texts == {"a.pdf": "a", "b.pdf": "b", "notes.txt": "plain"}
+    assert [r.path.name for r in results if not r.ok] == ["broken.pdf"]
+
+    outside = tmp_path.parent / "outside.txt"
+    stream = parse_documents(
+        [outside, docs / "a.pdf"], base_dir=docs, workers=1, mp_context="fork"
+    )
+    outcome = {r.path.name: r for r in [r async for r in stream]}
+    assert "base directory" in outcome["outside.txt"].error
+    assert outcome["a.pdf"].text == "a"
+    with pytest.raises(DocumentParsingError):
+        [r async for r in parse_directory(tmp_path / "missing", base_dir=tmp_path)]
+
+
+@pytest.mark.asyncio
+async def test_parse_cache_skips_parsers_for_unchanged_files(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import src.document_parser as parser
+    from src.document_parser import parse_documents
+    from src.parse_cache import ParseCache
+
+    calls = []
+
+    async def counting_read(path: Path) -> str:
+        calls.append(path.name)
+        return path.read_text()
+
+    monkeypatch.setitem(parser._PARSERS, ".txt", counting_read)
+    monkeypatch.setattr(parser, "PdfReader", NamedReader)
+    doc = tmp_path / "doc.txt"
+    doc.write_text("first")
+    pdf = tmp_path / "scan.pdf"
+    pdf.write_bytes(b"")
+    cache = ParseCache(path=str(tmp_path / "parse.sqlite3"))
+    assert await parse_document(doc, base_dir=tmp_path, cache=cache) == "first"
+    assert await parse_document(doc, base_dir=tmp_path, cache=cache) == "first"
+    assert calls == ["doc.txt"]
+    doc.write_text("second version")
+    assert await parse_document(doc, base_dir=tmp_path, cache=cache) == "second version"
+
+    for _ in range(2):
+        results = [
+            r
+            async for r in parse_documents(
+                [pdf], base_dir=tmp_path, workers=1, mp_context="fork", cache=cache
+            )
+        ]
+        assert results[0].text == "scan"
+    assert cache.stats() == {"hits": 2, "misses": 3}
@@ -0,0 +1,55 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src.document_store import Document, DocumentStore, slim_metadata  # noqa: E402
+
+
+def test_slim_metadata_keeps_index_fields(monkeypatch: pytest.MonkeyPatch) -> None:
+    meta = {"source": "a.pdf", "page": 2, "text": "long"}
+    assert slim_metadata(meta) == {"source": "a.pdf"}
+    monkeypatch.setenv("DOCUMENT_INDEX_FIELDS", "source, page")
+    assert slim_metadata(meta) == {"source": "a.pdf", "page": 2}
+    assert slim_metadata(meta, ["missing"]) == {}
+
+
+@pytest.mark.asyncio
+async def test_put_get_delete_persist(tmp_path: Path) -> None:
+    path = str(tmp_path / "docs.sqlite3")
+    store = DocumentStore(path=path)
+    await store.put_many(
+        [Document("a", "alpha", {"source": "x"}), Document("b", "beta")]
+    )
+    await store.put_many([Document("a", "alpha 2", {"source": "y"})])
+    store.close()
+
+    reopened = DocumentStore(path=path)
+    found = await reopened.get_many(["a", "b", "a", "missing"])
+    assert found == {
+        "a": Document("a", "alpha 2", {"source": "y"}),
+        "b": Document("b", "beta", {}),
+    }
+    await reopened.delete_many(["b"])
+    assert list(await reopened.get_many(["a", "b"])) == ["a"]
+    assert await reopened.get_many([]) == {}
+    reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_hydrate_joins_text_and_falls_back() -> None:
+    store = DocumentStore(path=":memory:")
+    await store.put_many([Document("a", "alpha", {"source": "x", "page": 1})])
+    matches = [
+        {"id": "a", "score": 0.9, "metadata": {"page": 3}},
+        {"id": "b", "score": 0.5, "metadata": {"text": "inline"}},
+    ]
+    hydrated = await store.hydrate(matches)
+    assert hydrated[0] == {
+        "id": "a",
+        "score": 0.9,
+        "metadata": {"source": "x", "page": 3, "text": "alpha"},
+    }
+    assert hydrated[1] is matches[1]
@@ -1,3 +1,4 @@
+import asyncio
 import sys
 import types
 from pathlib import Path
@@ -8,7 +9,7 @@ sys.path.append(str(Path(__file__).resolve().parents[1]))
 
 class DummyModel:
     def encode(
-        self, texts: List[str], normalize_embeddings: bool = True
+        self, texts: List[str], normalize_embeddings: bool = True, batch_size: int = 32
     ) -> List[List[float]]:
         return [[0.0] * 384 for _ in texts]
 
@@ -20,6 +21,7 @@ sys.modules["sentence_transformers"] = types.SimpleNamespace(
 from src.embedder import BgeEmbedder  # noqa: E402
 from src.exceptions import EmbeddingError  # noqa: E402
 
+import numpy as np  # noqa: E402
 import pytest  # noqa: E402
 
 
@@ -27,7 +29,8 @@ import pytest  # noqa: E402
 async def test_embedder_success() -> None:
     embedder = BgeEmbedder()
     result = await embedder.embed(["hello"])
-    assert len(result[0]) == 384
+    assert result.shape == (1, 384)
+    assert result.dtype == np.float32
 
 
 @pytest.mark.asyncio
@@ -35,3 +38,142 @@ async def test_embedder_invalid_input() -> None:
     embedder = BgeEmbedder()
     with pytest.raises(EmbeddingError):
         await embedder.embed([""])
+
+
+@pytest.mark.asyncio
+async def test_embedder_coalesces_concurrent_calls() -> None:
+    embedder = BgeEmbedder(max_batch_size=8, max_wait_ms=50)
+    model = DummyModel()
+    calls: List[List[str]] = []
+
+    def encode(texts: List[str], normalize_embeddings: bool = True):
+        calls.append(list(texts))
+        return [[float(len(t))] for t in texts]
+
+    model.encode = encode  # type: ignore[method-assign]
+    embedder._model = model
+    first, second = await asyncio.gather(
+        embedder.embed(["a"]), embedder.embed(["bb", "ccc"])
+    )
+    assert calls == [["a", "bb", "ccc"]]
+    assert first.tolist() == [[1.0]]
+    assert second.tolist() == [[2.0], [3.0]]
+
+
+def test_embedder_invalid_batching() -> None:
+    with pytest.raises(EmbeddingError):
+        BgeEmbedder(max_batch_size=4, max_wait_ms=-1)
+
+
+@pytest.mark.asyncio
+async def test_embedder_only_encodes_cache_misses() -> None:
+    from src.embedding_cache import EmbeddingCache
+
+    embedder = BgeEmbedder(cache=EmbeddingCache(path=None))
+    model = DummyModel()
+    calls: List[List[str]] = []
+
+    def encode(texts: List[str], normalize_embeddings: bool = True):
+        calls.append(list(texts))
+        return [[float(len(t))] for t in texts]
+
+    model.encode = encode  # type: ignore[method-assign]
+    embedder._model = model
+    assert (await embedder.embed(["a", "bb"])).tolist() == [[1.0], [2.0]]
+    result = await embedder.embed(["bb", "ccc", "ccc"])
+    assert result.tolist() == [[2.0], [3.0], [3.0]]
+    assert (await embedder.embed(["a"])).tolist() == [[1.0]]
+    assert calls == [["a", "bb"], ["ccc"]]
+
+
+@pytest.mark.asyncio
+async def test_embedder_warm_up_sets_ready() -> None:
+    embedder = BgeEmbedder()
+    assert not embedder.ready
+    await embedder.warm_up()
+    assert embedder.ready
+
+
+def test_embedder_rejects_unknown_backend() -> None:
+    with pytest.raises(EmbeddingError):
+        BgeEmbedder(backend="tpu")
+
+
+@pytest.mark.asyncio
+async def test_embedder_uses_selected_backend(monkeypatch: pytest.MonkeyPatch) -> None:
+    import src.embedder as embedder_module
+
+    loaded: List[str] = []
+
+    def fake_onnx(name: str) -> DummyModel:
+        loaded.append(name)
+        return DummyModel()
+
+    monkeypatch.setitem(embedder_module._BACKENDS, "onnx", fake_onnx)
+    embedder = BgeEmbedder(backend="onnx")
+    await embedder.embed(["hello"])
+    assert loaded == ["BAAI/bge-small-en-v1.5"]
+
+
+@pytest.mark.asyncio
+async def test_check_parity_reports_cosine() -> None:
+    from src.embedder import check_parity
+
+    candidate, reference = BgeEmbedder(), BgeEmbedder()
+    candidate._model = types.SimpleNamespace(
+        encode=lambda texts, normalize_embeddings: [[1.0, 0.0] for _ in texts]
+    )
+    reference._model = types.SimpleNamespace(
+        encode=lambda texts, normalize_embeddings: [[1.0, 1.0] for _ in texts]
+    )
+    report = await check_parity(candidate, reference, ["a", "b"])
+    assert report["samples"] == 2.0
+    assert abs(report["min"] - 2**-0.5) < 1e-6
+    with pytest.raises(EmbeddingError):
+        await check_parity(candidate, reference, [])
+
+
+class CountingModel:
+    def __init__(self) -> None:
+        self.batches: List[List[str]] = []
+        self.tokenizer = lambda texts, add_special_tokens: {
+            "input_ids": [t.split() for t in texts]
+        }
+
+    def encode(
+        self, texts: List[str], normalize_embeddings: bool = True, batch_size: int = 32
+    ) -> List[List[float]]:
+        assert batch_size == len(texts)
+        self.batches.append(list(texts))
+        return [[float(len(t.split()))] for t in texts]
+
+
+@pytest.mark.asyncio
+async def test_embed_bulk_buckets_by_length_and_restores_order() -> None:
+    embedder = BgeEmbedder()
+    model = CountingModel()
+    embedder._model = model
+    texts = ["a b c d", "a", "a b c", "a b"]
+    result = await embedder.embed_bulk(texts, batch_size=2)
+    assert model.batches == [["a", "a b"], ["a b c", "a b c d"]]
+    assert result.tolist() == [[4.0], [1.0], [3.0], [2.0]]
+
+
+@pytest.mark.asyncio
+async def test_iter_embeddings_yields_cache_hits_first() -> None:
+    from src.embedding_cache import EmbeddingCache
+
+    embedder = BgeEmbedder(cache=EmbeddingCache(path=None))
+    model = CountingModel()
+    embedder._model = model
+    await embedder.embed_bulk(["x y"], batch_size=4)
+    chunks = [c async for c in embedder.iter_embeddings(["z", "x y"], batch_size=4)]
+    assert [(p, v.tolist()) for p, v in chunks] == [([1], [[2.0]]), ([0], [[1.0]])]
+    assert model.batches == [["x y"], ["z"]]
+
+
+@pytest.mark.asyncio
+async def test_iter_embeddings_rejects_bad_batch_size() -> None:
+    embedder = BgeEmbedder()
+    with pytest.raises(EmbeddingError):
+        await embedder.embed_bulk(["a"], batch_size=0)
@@ -0,0 +1,85 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src.embedding_cache import EmbeddingCache, cache_key  # noqa: E402
+from src.exceptions import EmbeddingError  # noqa: E402
+
+
+def _as_lists(vectors):
+    return [None if v is None else v.tolist() for v in vectors]
+
+
+def test_cache_key_normalizes_whitespace() -> None:
+    assert cache_key("m", "hello  world ") == cache_key("m", "hello world")
+    assert cache_key("m", "hello") != cache_key("other", "hello")
+
+
+@pytest.mark.asyncio
+async def test_memory_tier_hits_and_eviction() -> None:
+    cache = EmbeddingCache(max_entries=2, path=None)
+    await cache.put_many("m", ["a", "b", "c"], [[1.0], [2.0], [3.0]])
+    result = await cache.get_many("m", ["a", "b", "c"])
+    assert _as_lists(result) == [None, [2.0], [3.0]]
+    assert cache.stats() == {
+        "memory_hits": 2,
+        "disk_hits": 0,
+        "misses": 1,
+        "memory_entries": 2,
+    }
+
+
+@pytest.mark.asyncio
+async def test_disk_tier_persists(tmp_path: Path) -> None:
+    path = str(tmp_path / "cache.sqlite3")
+    first = EmbeddingCache(path=path)
+    await first.put_many("m", ["a"], [[0.5, 0.25]])
+    first.close()
+    second = EmbeddingCache(path=path)
+    result = await second.get_many("m", ["a", "a"])
+    assert _as_lists(result) == [[0.5, 0.25], [0.5, 0.25]]
+    assert second.disk_hits == 2
+    assert _as_lists(await second.get_many("m", ["a"])) == [[0.5, 0.25]]
+    assert second.memory_hits == 1
+    second.close()
+
+
+@pytest.mark.asyncio
+async def test_disk_tier_evicts_by_size(tmp_path: Path) -> None:
+    cache = EmbeddingCache(path=str(tmp_path / "c.sqlite3"), max_disk_bytes=8)
+    for text in ["a", "b", "c"]:
+        await cache.put_many("m", [text], [[1.0, 2.0]])
+    cache._memory.clear()
+    result = await cache.get_many("m", ["a", "b", "c"])
+    assert _as_lists(result) == [None, None, [1.0, 2.0]]
+    cache.close()
+
+
+@pytest.mark.asyncio
+async def test_put_many_rejects_mismatch() -> None:
+    cache = EmbeddingCache(path=None)
+    with pytest.raises(EmbeddingError):
+        await cache.put_many("m", ["a"], [])
+
+
+@pytest.mark.asyncio
+async def test_float16_storage_round_trips(tmp_path: Path) -> None:
+    cache = EmbeddingCache(path=str(tmp_path / "c.sqlite3"), dtype="float16")
+    await cache.put_many("m", ["a"], [np.array([0.5, 0.25], dtype=np.float32)])
+    cache._memory.clear()
+    (vector,) = await cache.get_many("m", ["a"])
+    assert vector.dtype == np.float32
+    assert vector.tolist() == [0.5, 0.25]
+    assert await EmbeddingCache(path=str(tmp_path / "c.sqlite3")).get_many(
+        "m", ["a"]
+    ) == [None]
+    cache.close()
+
+
+def test_invalid_dtype() -> None:
+    with pytest.raises(EmbeddingError):
+        EmbeddingCache(path=None, dtype="int8")
@@ -0,0 +1,97 @@
+import asyncio
+import sys
+import types
+from pathlib import Path
+from typing import List
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+
+class WordCountModel:
+    tokenizer = None
+
+    def encode(
+        self, texts: List[str], normalize_embeddings: bool = True, batch_size: int = 32
+    ) -> List[List[float]]:
+        return [[float(len(t.split()))] for t in texts]
+
+
+sys.modules.setdefault(
+    "sentence_transformers",
+    types.SimpleNamespace(SentenceTransformer=lambda name: WordCountModel()),
+)
+
+from src import embedding_pool  # noqa: E402
+from src.embedder import BgeEmbedder  # noqa: E402
+from src.embedding_pool import EmbeddingPool  # noqa: E402
+from src.exceptions import EmbeddingError  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def word_count_backend(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setitem(
+        embedding_pool._BACKENDS, "torch", lambda name: WordCountModel()
+    )
+
+
+def test_worker_encodes_with_loaded_model() -> None:
+    embedding_pool._init_worker("torch", "m", 1)
+    assert embedding_pool._encode_shard(["a b", "c"]) == [[2.0], [1.0]]
+
+
+@pytest.mark.asyncio
+async def test_pool_encode_preserves_order() -> None:
+    texts = ["a", "a b", "a b c", "a b c d", "a b c d e"]
+    async with EmbeddingPool(processes=2, shard_size=2, mp_context="fork") as pool:
+        result = await pool.encode(texts)
+    assert result.tolist() == [[1.0], [2.0], [3.0], [4.0], [5.0]]
+
+
+@pytest.mark.asyncio
+async def test_embed_bulk_through_pool() -> None:
+    texts = ["a b c", "a", "a b c d", "a b"]
+    embedder = BgeEmbedder()
+    async with EmbeddingPool(processes=2, mp_context="fork") as pool:
+        result = await embedder.embed_bulk(texts, batch_size=1, pool=pool)
+    assert result.tolist() == [[3.0], [1.0], [4.0], [2.0]]
+    assert embedder._model is None
+
+
+@pytest.mark.asyncio
+async def test_failed_shard_cancels_in_flight_shards() -> None:
+    pool = EmbeddingPool(processes=1, mp_context="fork")
+    cancelled = []
+
+    async def submit(texts: List[str]):
+        if texts == ["bad"]:
+            raise EmbeddingError("pooled embedding failed")
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(texts)
+            raise
+
+    pool._submit = submit  # type: ignore[method-assign]
+    shards = [([0], ["slow"]), ([1], ["bad"])]
+    with pytest.raises(EmbeddingError):
+        async for _ in pool.iter_encode(shards):
+            pass
+    assert cancelled == [["slow"]]
+    pool.close()
+
+
+@pytest.mark.asyncio
+async def test_pool_rejects_mismatched_model() -> None:
+    embedder = BgeEmbedder()
+    async with EmbeddingPool("other", processes=1, mp_context="fork") as pool:
+        with pytest.raises(EmbeddingError):
+            await embedder.embed_bulk(["a"], pool=pool)
+
+
+def test_pool_rejects_invalid_configuration() -> None:
+    with pytest.raises(EmbeddingError):
+        EmbeddingPool(shard_size=0)
+    with pytest.raises(EmbeddingError):
+        EmbeddingPool(backend="tpu")
@@ -0,0 +1,113 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src.exceptions import IndexingError  # noqa: E402
+from src.index_snapshot import (  # noqa: E402
+    has_snapshot,
+    read_snapshot,
+    write_snapshot,
+)
+from src.local_index import ExactIndex, HnswIndex  # noqa: E402
+from src.vector_store import create_vector_store  # noqa: E402
+
+
+def test_write_and_read_round_trip(tmp_path: Path) -> None:
+    vectors = np.eye(3, dtype=np.float32)
+    write_snapshot(
+        tmp_path,
+        vectors=vectors,
+        ids=["a", "b", "c"],
+        metadata=[{"t": 1}, {}, {"t": "ü"}],
+        arrays={"extra": np.arange(4)},
+        info={"kind": "x"},
+    )
+    snapshot = read_snapshot(tmp_path)
+    assert isinstance(snapshot.vectors, np.memmap)
+    assert not snapshot.vectors.flags.writeable
+    assert snapshot.ids == ["a", "b", "c"]
+    assert list(snapshot.metadata) == [{"t": 1}, {}, {"t": "ü"}]
+    assert snapshot.metadata[-1] == {"t": "ü"}
+    assert snapshot.arrays["extra"].tolist() == [0, 1, 2, 3]
+    assert snapshot.info == {"kind": "x"}
+
+
+def test_new_snapshot_keeps_previous_generation(tmp_path: Path) -> None:
+    paths = [
+        write_snapshot(
+            tmp_path, vectors=np.ones((n, 2)), ids=["x"] * n, metadata=[{}] * n
+        )
+        for n in (1, 2, 3)
+    ]
+    assert sorted(tmp_path.glob("snapshot-*")) == sorted(paths[1:])
+    assert not list(tmp_path.glob(".tmp-*"))
+    assert read_snapshot(tmp_path).ids == ["x", "x", "x"]
+
+
+def test_read_missing_snapshot(tmp_path: Path) -> None:
+    assert not has_snapshot(tmp_path)
+    with pytest.raises(IndexingError):
+        read_snapshot(tmp_path)
+
+
+@pytest.mark.asyncio
+async def test_exact_index_save_load_and_copy_on_write(tmp_path: Path) -> None:
+    index = ExactIndex(dimension=2)
+    await index.upsert([("a", [1.0, 0.0], {"text": "a"}), ("b", [0.0, 1.0], {})])
+    await index.save(tmp_path)
+    loaded = await ExactIndex.load(tmp_path)
+    assert (await loaded.query([1.0, 0.1]))[0]["metadata"] == {"text": "a"}
+    await loaded.delete(["a"])
+    await loaded.upsert([("c", [1.0, 1.0], {})])
+    assert len(loaded) == 2
+    reread = await ExactIndex.load(tmp_path)
+    assert len(reread) == 2 and reread._ids == ["a", "b"]
+    with pytest.raises(IndexingError):
+        await HnswIndex.load(tmp_path)
+
+
+@pytest.mark.asyncio
+async def test_hnsw_snapshot_preserves_graph(tmp_path: Path) -> None:
+    rng = np.random.default_rng(3)
+    data = rng.standard_normal((200, 8)).astype(np.float32)
+    index = HnswIndex(dimension=8, m=8, seed=2)
+    await index.upsert([(str(i), row, {"i": i}) for i, row in enumerate(data)])
+    await index.delete(["0"])
+    await index.save(tmp_path)
+    loaded = await HnswIndex.load(tmp_path, ef_search=64)
+    assert not loaded._links and isinstance(loaded._csr[3], np.memmap)
+    for node in range(200):
+        levels = range(index._level(node) + 1)
+        assert loaded._level(node) == index._level(node)
+        assert [loaded._neighbors(node, n) for n in levels] == [
+            index._neighbors(node, n) for n in levels
+        ]
+    assert loaded.m == 8 and len(loaded) == 199
+    for query in data[:5]:
+        expected = [r["id"] for r in await index.query(query, top_k=5)]
+        assert [r["id"] for r in await loaded.query(query, top_k=5)][:1] == expected[:1]
+    await loaded.upsert([("new", data[0], {})])
+    assert (await loaded.query(data[0]))[0]["id"] == "new"
+    await loaded.save(tmp_path / "again")
+    reloaded = await HnswIndex.load(tmp_path / "again")
+    assert (await reloaded.query(data[0]))[0]["id"] == "new"
+
+
+@pytest.mark.asyncio
+async def test_factory_maps_existing_snapshot(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    index = ExactIndex(dimension=2)
+    await index.upsert([("a", [1.0, 0.0], {})])
+    await index.save(tmp_path)
+    monkeypatch.setenv("VECTOR_STORE_PATH", str(tmp_path))
+    store = create_vector_store("exact")
+    assert isinstance(store, ExactIndex) and len(store) == 1
+    hnsw = HnswIndex(dimension=2, seed=0)
+    await hnsw.upsert([("a", [1.0, 0.0], {})])
+    await hnsw.save(tmp_path)
+    assert len(create_vector_store("hnsw")) == 1
@@ -0,0 +1,187 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src.exceptions import IndexingError  # noqa: E402
+from src.local_index import ExactIndex, HnswIndex, PqIndex  # noqa: E402
+
+
+def _unit(rng: np.random.Generator, n: int, dim: int) -> np.ndarray:
+    data = rng.standard_normal((n, dim)).astype(np.float32)
+    return data / np.linalg.norm(data, axis=1, keepdims=True)
+
+
+@pytest.mark.asyncio
+async def test_exact_index_ranks_by_cosine() -> None:
+    index = ExactIndex(dimension=2)
+    await index.upsert(
+        [("x", [1.0, 0.0], {"text": "x"}), ("y", [0.0, 2.0], {"text": "y"})]
+    )
+    results = await index.query([0.9, 0.1], top_k=5)
+    assert [r["id"] for r in results] == ["x", "y"]
+    assert results[0]["metadata"] == {"text": "x"}
+    assert abs(results[0]["score"] - 0.9938837) < 1e-5
+
+
+@pytest.mark.asyncio
+async def test_exact_index_update_and_delete() -> None:
+    index = ExactIndex(dimension=2)
+    await index.upsert(
+        [("a", [1.0, 0.0], {}), ("b", [0.0, 1.0], {}), ("c", [1, 1], {})]
+    )
+    await index.upsert([("a", [0.0, 1.0], {"v": 2})])
+    await index.delete(["b", "missing"])
+    assert len(index) == 2
+    results = await index.query([0.0, 1.0], top_k=1)
+    assert results[0]["id"] == "a" and results[0]["metadata"] == {"v": 2}
+    await index.delete(["a", "c"])
+    assert await index.query([0.0, 1.0]) == []
+
+
+@pytest.mark.asyncio
+async def test_exact_index_float16_storage() -> None:
+    index = ExactIndex(dimension=2, dtype="float16")
+    await index.upsert([("a", [1.0, 0.0], {})])
+    assert index._matrix.dtype == np.float16
+    assert (await index.query([1.0, 0.0]))[0]["id"] == "a"
+
+
+@pytest.mark.asyncio
+async def test_exact_index_validation() -> None:
+    index = ExactIndex(dimension=2)
+    with pytest.raises(IndexingError):
+        await index.upsert([])
+    with pytest.raises(IndexingError):
+        await index.upsert([("a", [1.0, 0.0, 0.0], {})])
+    with pytest.raises(IndexingError):
+        await index.query([])
+    with pytest.raises(IndexingError):
+        await index.query([1.0, 0.0], top_k=0)
+    with pytest.raises(IndexingError):
+        await index.delete([])
+    with pytest.raises(IndexingError):
+        ExactIndex(dimension=0)
+
+
+@pytest.mark.asyncio
+async def test_query_many_matches_single_queries() -> None:
+    rng = np.random.default_rng(1)
+    data = _unit(rng, 200, 8)
+    queries = _unit(rng, 70, 8)
+    items = [(str(i), row, {"i": i}) for i, row in enumerate(data)]
+    for index in (ExactIndex(dimension=8), HnswIndex(dimension=8, seed=1)):
+        assert [r.matches for r in await index.query_many(queries)] == [[]] * 70
+        await index.upsert(items)
+        results = await index.query_many(queries, top_k=3)
+        assert len(results) == 70 and all(r.ok for r in results)
+        for query, result in zip(queries, results):
+            single = await index.query(query, top_k=3)
+            assert [m["id"] for m in result.matches] == [m["id"] for m in single]
+        with pytest.raises(IndexingError):
+            await index.query_many(np.zeros((2, 3), dtype=np.float32))
+
+
+@pytest.mark.asyncio
+async def test_hnsw_recall_matches_exact() -> None:
+    rng = np.random.default_rng(0)
+    data = _unit(rng, 600, 16)
+    items = [(str(i), row, {"i": i}) for i, row in enumerate(data)]
+    exact, hnsw = ExactIndex(dimension=16), HnswIndex(dimension=16, seed=1)
+    await exact.upsert(items)
+    await hnsw.upsert(items)
+    hits = total = 0
+    for query in _unit(rng, 20, 16):
+        truth = {r["id"] for r in await exact.query(query, top_k=10)}
+        found = {r["id"] for r in await hnsw.query(query, top_k=10)}
+        hits += len(truth & found)
+        total += len(truth)
+    assert hits / total >= 0.9
+
+
+@pytest.mark.asyncio
+async def test_hnsw_tombstones_replaced_and_deleted_ids() -> None:
+    index = HnswIndex(dimension=2, seed=0)
+    await index.upsert([("a", [1.0, 0.0], {}), ("b", [0.0, 1.0], {})])
+    await index.upsert([("a", [0.0, 1.0], {"v": 2})])
+    await index.delete(["b"])
+    results = await index.query([1.0, 0.0], top_k=3)
+    assert [(r["id"], r["metadata"]) for r in results] == [("a", {"v": 2})]
+    await index.delete(["a"])
+    assert await index.query([1.0, 0.0]) == []
+    with pytest.raises(IndexingError):
+        HnswIndex(m=1)
+
+
+@pytest.mark.asyncio
+async def test_hnsw_widens_search_past_tombstones_and_compacts() -> None:
+    data = _unit(np.random.default_rng(4), 200, 8)
+    index = HnswIndex(dimension=8, ef_search=4, seed=1)
+    await index.upsert([(str(i), row, {}) for i, row in enumerate(data)])
+    query = data[0]
+    nearest = np.argsort(-(data @ query))
+    await index.delete([str(i) for i in nearest[:50]])
+    assert index.tombstones == 50
+    results = await index.query(query, top_k=10)
+    assert len(results) == 10
+    await index.compact()
+    assert index.tombstones == 0 and len(index) == 150
+    compacted = await index.query(query, top_k=10)
+    assert [r["id"] for r in compacted][:3] == [r["id"] for r in results][:3]
+
+
+@pytest.mark.asyncio
+async def test_pq_index_recall_after_rerank() -> None:
+    rng = np.random.default_rng(3)
+    data = _unit(rng, 800, 16)
+    items = [(str(i), row, {"i": i}) for i, row in enumerate(data)]
+    exact = ExactIndex(dimension=16)
+    pq = PqIndex(dimension=16, subspaces=8, centroids=32, rerank=80, seed=0)
+    pq.train_size = 500
+    await exact.upsert(items)
+    await pq.upsert(items)
+    assert pq.trained and pq._codes.dtype == np.uint8
+    assert pq._codes[: len(pq)].nbytes == 800 * 8
+    hits = total = 0
+    queries = _unit(rng, 20, 16)
+    for query, row in zip(queries, await pq.query_many(queries, top_k=10)):
+        truth = [r["id"] for r in await exact.query(query, top_k=10)]
+        found = [r["id"] for r in row.matches]
+        hits += len(set(truth) & set(found))
+        total += len(truth)
+        assert found[0] == truth[0]
+    assert hits / total >= 0.9
+
+
+@pytest.mark.asyncio
+async def test_pq_index_updates_keep_codes_aligned(tmp_path: Path) -> None:
+    rng = np.random.default_rng(4)
+    data = _unit(rng, 300, 8)
+    pq = PqIndex(dimension=8, subspaces=2, centroids=16, rerank=5, seed=1)
+    await pq.upsert([(str(i), row, {}) for i, row in enumerate(data)])
+    assert not pq.trained
+    assert isinstance(pq._matrix, np.memmap) and pq._matrix.flags.writeable
+    assert (await pq.query(data[7]))[0]["id"] == "7"
+    pq.train()
+    await pq.delete(["0", "1"])
+    await pq.upsert([("5", data[200], {"v": 2})])
+    assert np.array_equal(pq._codes[: len(pq)], pq._encode(pq._matrix[: len(pq)]))
+    top = await pq.query(data[200], top_k=2)
+    assert {m["id"] for m in top} == {"5", "200"}
+
+    await pq.save(tmp_path)
+    loaded = PqIndex.from_snapshot(tmp_path, rerank=5)
+    assert isinstance(loaded._matrix, np.memmap) and loaded.subspaces == 2
+    assert (await loaded.query(data[42]))[0]["id"] == "42"
+    await loaded.delete(["42"])
+    assert isinstance(loaded._matrix, np.memmap) and loaded._matrix.flags.writeable
+    assert (await loaded.query(data[42]))[0]["id"] != "42"
+    assert (await loaded.query(data[43]))[0]["id"] == "43"
+    assert len(await PqIndex.load(tmp_path)) == 298
+    with pytest.raises(IndexingError):
+        PqIndex(dimension=8, subspaces=3)
+    with pytest.raises(IndexingError):
+        PqIndex(dimension=8, subspaces=2).train()
@@ -9,6 +9,19 @@ from src.exceptions import InitializationError
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
 
+class StubEmbedder:
+    def __init__(self, **_: object) -> None:
+        self.ready = False
+
+    async def warm_up(self) -> None:
+        self.ready = True
+
+
+class FailingEmbedder(StubEmbedder):
+    async def warm_up(self) -> None:
+        raise RuntimeError("boom")
+
+
 @pytest.mark.asyncio
 async def test_startup_smoke(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setenv("PINECONE_API_KEY", "key")
@@ -26,9 +39,9 @@ async def test_startup_smoke(monkeypatch: pytest.MonkeyPatch) -> None:
     main = importlib.reload(importlib.import_module("src.main"))
 
     dummy_interface = object()
-    monkeypatch.setattr(main, "BgeEmbedder", lambda: object())
-    monkeypatch.setattr(main, "PineconeIndex", lambda: object())
-    monkeypatch.setattr(main, "build_interface", lambda e, i: dummy_interface)
+    monkeypatch.setattr(main, "BgeEmbedder", StubEmbedder)
+    monkeypatch.setattr(main, "create_vector_store", lambda: object())
+    monkeypatch.setattr(main, "build_interface", lambda e, i, **_: dummy_interface)
 
     interface = await main.startup()
     assert interface is dummy_interface
@@ -52,3 +65,25 @@ async def test_startup_missing_env(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.delenv("PINECONE_INDEX_NAME", raising=False)
     with pytest.raises(InitializationError):
         await main.startup()
+
+
+@pytest.mark.asyncio
+async def test_startup_warm_up_failure(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("PINECONE_API_KEY", "key")
+    monkeypatch.setenv("PINECONE_INDEX_NAME", "index")
+    monkeypatch.setitem(
+        sys.modules,
+        "dotenv",
+        types.SimpleNamespace(load_dotenv=lambda _: None),
+    )
+    monkeypatch.setitem(
+        sys.modules,
+        "pinecone",
+        types.SimpleNamespace(Pinecone=object, ServerlessSpec=object),
+    )
+    main = importlib.reload(importlib.import_module("src.main"))
+
+    monkeypatch.setattr(main, "BgeEmbedder", FailingEmbedder)
+    monkeypatch.setattr(main, "create_vector_store", lambda: object())
+    with pytest.raises(InitializationError, match="warm-up"):
+        await main.startup()
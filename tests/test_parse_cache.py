@@ -0,0 +1,35 @@
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src.parse_cache import ParseCache, fingerprint  # noqa: E402
+
+
+def test_fingerprint_tracks_content_mtime_and_version(tmp_path: Path) -> None:
+    doc = tmp_path / "a.txt"
+    doc.write_text("one")
+    first = fingerprint(doc, "1")
+    assert fingerprint(doc, "1") == first
+    assert fingerprint(doc, "2") != first
+    os.utime(doc, ns=(1, 1))
+    touched = fingerprint(doc, "1")
+    assert touched != first
+    doc.write_text("two")
+    os.utime(doc, ns=(1, 1))
+    assert fingerprint(doc, "1") != touched
+
+
+@pytest.mark.asyncio
+async def test_round_trip_and_size_eviction(tmp_path: Path) -> None:
+    cache = ParseCache(path=str(tmp_path / "parse.sqlite3"), max_bytes=64)
+    await cache.put("a", "alpha " * 10)
+    assert await cache.get("a") == "alpha " * 10
+    await cache.put("b", os.urandom(200).hex())
+    assert await cache.get("a") is None
+    assert await cache.get("missing") is None
+    assert cache.stats() == {"hits": 1, "misses": 2}
+    cache.close()
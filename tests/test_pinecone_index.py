@@ -46,16 +46,21 @@ class FlakyIndex(DummyIndex):
 
 
 class DummyPinecone:
-    def __init__(self, api_key: str) -> None:
+    def __init__(self, api_key: str, **kwargs: Any) -> None:
         self.storage: Dict[str, DummyIndex] = {}
+        self.created: List[str] = []
 
     def list_indexes(self) -> List[Any]:
         return []
 
     def create_index(self, name: str, dimension: int, metric: str, spec: Any) -> None:
+        self.created.append(name)
         self.storage[name] = DummyIndex()
 
-    def Index(self, name: str) -> DummyIndex:  # noqa: N802
+    def describe_index(self, name: str) -> Any:
+        return types.SimpleNamespace(host=f"{name}.svc")
+
+    def Index(self, name: str, **kwargs: Any) -> DummyIndex:  # noqa: N802
         return self.storage.setdefault(name, DummyIndex())
 
 
@@ -63,7 +68,7 @@ class FlakyPinecone(DummyPinecone):
     def create_index(self, name: str, dimension: int, metric: str, spec: Any) -> None:
         self.storage[name] = FlakyIndex()
 
-    def Index(self, name: str) -> FlakyIndex:  # noqa: N802
+    def Index(self, name: str, **kwargs: Any) -> FlakyIndex:  # noqa: N802
         return self.storage.setdefault(name, FlakyIndex())
 
 
@@ -82,6 +87,13 @@ from src.exceptions import IndexingError  # noqa: E402
 import pytest  # noqa: E402
 
 
+@pytest.fixture(autouse=True)
+def _clear_host_cache() -> None:
+    import src.pinecone_index as pi
+
+    pi._HOSTS.clear()
+
+
 @pytest.mark.asyncio
 async def test_upsert_and_query(monkeypatch: pytest.MonkeyPatch) -> None:
     monkeypatch.setenv("PINECONE_API_KEY", "k")
@@ -117,7 +129,7 @@ async def test_pinecone_index_retries(monkeypatch: pytest.MonkeyPatch) -> None:
     import src.pinecone_index as pi
 
     flaky_pc = FlakyPinecone(api_key="k")
-    monkeypatch.setattr(pi, "Pinecone", lambda api_key: flaky_pc)
+    monkeypatch.setattr(pi, "Pinecone", lambda **_: flaky_pc)
     from src.utils import retry as retry_module
 
     async def fake_sleep(_: float) -> None:
@@ -130,3 +142,366 @@ async def test_pinecone_index_retries(monkeypatch: pytest.MonkeyPatch) -> None:
     assert flaky_pc.storage["i"].upsert_calls == 3
     assert flaky_pc.storage["i"].query_calls == 2
     assert results[0]["metadata"]["text"] == "a"
+
+
+@pytest.mark.asyncio
+async def test_numpy_vectors_serialized_at_boundary(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    import numpy as np
+
+    monkeypatch.setenv("PINECONE_API_KEY", "k")
+    monkeypatch.setenv("PINECONE_INDEX_NAME", "i")
+    index = PineconeIndex()
+    vectors = np.zeros((2, 384), dtype=np.float32)
+    await index.upsert([("a", vectors[0], {"text": "x"}), ("b", vectors[1], {})])
+    stored = index.index.vectors["a"]["values"]
+    assert isinstance(stored, list) and isinstance(stored[0], float)
+    assert await index.query(vectors[0], top_k=2)
+    with pytest.raises(IndexingError):
+        await index.upsert([("c", np.zeros((2, 2)), {})])
+
+
+@pytest.mark.asyncio
+async def test_delete(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("PINECONE_API_KEY", "k")
+    monkeypatch.setenv("PINECONE_INDEX_NAME", "i")
+    index = PineconeIndex()
+    deleted = []
+    index.index.delete = lambda ids: deleted.extend(ids)
+    await index.delete(["1", "2"])
+    assert deleted == ["1", "2"]
+    with pytest.raises(IndexingError):
+        await index.delete([])
+
+
+@pytest.mark.asyncio
+async def test_delete_sends_bounded_batches(monkeypatch: pytest.MonkeyPatch) -> None:
+    from src.utils import retry as retry_module
+
+    async def fake_sleep(_: float) -> None:
+        pass
+
+    monkeypatch.setattr(retry_module.asyncio, "sleep", fake_sleep)
+    index = _make_index(monkeypatch, PINECONE_DELETE_BATCH_SIZE="5000")
+    batches: List[List[str]] = []
+
+    def delete(ids: List[str]) -> None:
+        if "bad" in ids:
+            raise RuntimeError("rejected")
+        batches.append(ids)
+
+    index.index.delete = delete
+    ids = [str(i) for i in range(2500)]
+    await index.delete(ids)
+    assert sorted(len(b) for b in batches) == [500, 1000, 1000]
+    assert sorted(i for b in batches for i in b) == sorted(ids)
+    batches.clear()
+    with pytest.raises(IndexingError, match="1 of 3 batches"):
+        await index.delete([*ids[:2000], "bad"], retries=2)
+    assert sum(len(b) for b in batches) == 2000
+
+
+def _make_index(monkeypatch: pytest.MonkeyPatch, **env: str) -> PineconeIndex:
+    monkeypatch.setenv("PINECONE_API_KEY", "k")
+    monkeypatch.setenv("PINECONE_INDEX_NAME", "i")
+    for key, value in env.items():
+        monkeypatch.setenv(key, value)
+    return PineconeIndex()
+
+
+def test_chunk_records_bounds_count_and_bytes() -> None:
+    from src.pinecone_index import chunk_records
+
+    records = [(str(i), [0.0] * 4, {}) for i in range(5)]
+    assert [len(c) for c in chunk_records(records, max_count=2, max_bytes=10**6)] == [
+        2,
+        2,
+        1,
+    ]
+    tiny = chunk_records(records, max_count=100, max_bytes=1)
+    assert [len(c) for c in tiny] == [1] * 5
+
+
+@pytest.mark.asyncio
+async def test_upsert_sends_chunks_concurrently(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    import threading
+    import time
+
+    index = _make_index(
+        monkeypatch,
+        PINECONE_UPSERT_BATCH_SIZE="2",
+        PINECONE_UPSERT_CONCURRENCY="2",
+    )
+    calls: List[int] = []
+    active = peak = 0
+    lock = threading.Lock()
+
+    def upsert(vectors: List[Tuple[str, List[float], Dict[str, Any]]]) -> None:
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+            calls.append(len(vectors))
+
+    index.index.upsert = upsert
+    items = [(str(i), [0.0] * 384, {}) for i in range(5)]
+    report = await index.upsert_chunks(items)
+    assert sorted(calls) == [1, 2, 2]
+    assert peak == 2
+    assert report.upserted == 5 and not report.failed
+
+
+@pytest.mark.asyncio
+async def test_upsert_converts_rows_one_chunk_at_a_time(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    import numpy as np
+
+    from src import pinecone_index
+
+    index = _make_index(
+        monkeypatch, PINECONE_UPSERT_BATCH_SIZE="2", PINECONE_UPSERT_CONCURRENCY="1"
+    )
+    converted = 0
+    real_to_list = pinecone_index.to_list
+
+    def to_list(vector: Any) -> List[float]:
+        nonlocal converted
+        converted += 1
+        return real_to_list(vector)
+
+    monkeypatch.setattr(pinecone_index, "to_list", to_list)
+    seen: List[int] = []
+
+    def upsert(vectors: List[Tuple[str, List[float], Dict[str, Any]]]) -> None:
+        seen.append(converted)
+
+    index.index.upsert = upsert
+    await index.upsert([(str(i), np.zeros(384), {}) for i in range(6)])
+    # The record that closes a chunk is read before the chunk is sent.
+    assert seen == [3, 5, 6]
+
+
+@pytest.mark.asyncio
+async def test_upsert_reports_failed_chunks(monkeypatch: pytest.MonkeyPatch) -> None:
+    from src.monitoring import UsageMonitor
+    from src.utils import retry as retry_module
+
+    async def fake_sleep(_: float) -> None:
+        pass
+
+    monkeypatch.setattr(retry_module.asyncio, "sleep", fake_sleep)
+    index = _make_index(
+        monkeypatch, PINECONE_UPSERT_BATCH_SIZE="1", PINECONE_UPSERT_COST="1"
+    )
+    recorded: List[float] = []
+
+    class Monitor(UsageMonitor):
+        async def record(self, service: str, cost: float) -> None:
+            recorded.append(cost)
+
+    index.monitor = Monitor()
+    real_upsert = index.index.upsert
+
+    def upsert(vectors: List[Tuple[str, List[float], Dict[str, Any]]]) -> None:
+        if vectors[0][0] == "bad":
+            raise RuntimeError("rejected")
+        real_upsert(vectors)
+
+    index.index.upsert = upsert
+    items = [("a", [0.0] * 384, {}), ("bad", [0.0] * 384, {}), ("c", [0.0] * 384, {})]
+    report = await index.upsert_chunks(items, retries=2)
+    assert [c.ok for c in report.chunks] == [True, False, True]
+    assert "rejected" in report.failed[0].error
+    assert recorded == [2.0]
+    with pytest.raises(IndexingError, match="1 of 3 chunks"):
+        await index.upsert(items, retries=1)
+
+
+@pytest.mark.asyncio
+async def test_query_many_reports_per_row_errors(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    import numpy as np
+
+    from src.monitoring import UsageMonitor
+
+    index = _make_index(monkeypatch, PINECONE_QUERY_COST="0.5")
+    recorded: List[float] = []
+
+    class Monitor(UsageMonitor):
+        async def record(self, service: str, cost: float) -> None:
+            recorded.append(cost)
+
+    await index.upsert([("a", [0.0] * 384, {"text": "a"})])
+    index.monitor = Monitor()
+    real_query = index.index.query
+
+    def query(vector: List[float], top_k: int, include_metadata: bool) -> Any:
+        if vector[0] < 0:
+            raise RuntimeError("bad row")
+        return real_query(vector, top_k, include_metadata)
+
+    index.index.query = query
+    vectors = np.zeros((3, 384), dtype=np.float32)
+    vectors[1, 0] = -1.0
+    results = await index.query_many(vectors, retries=1)
+    assert [r.ok for r in results] == [True, False, True]
+    assert results[0].matches[0]["id"] == "a"
+    assert "bad row" in results[1].error
+    assert recorded == [1.0]
+    with pytest.raises(IndexingError):
+        await index.query_many([])
+
+
+@pytest.mark.asyncio
+async def test_namespace_views_share_client(monkeypatch: pytest.MonkeyPatch) -> None:
+    class NamespacedIndex:
+        def __init__(self) -> None:
+            self.calls: List[Tuple[str, Any]] = []
+
+        def upsert(self, vectors: Any, **kwargs: Any) -> None:
+            self.calls.append(("upsert", kwargs))
+
+        def query(self, **kwargs: Any) -> Dict[str, Any]:
+            self.calls.append(("query", kwargs.get("namespace")))
+            return {"matches": []}
+
+    index = _make_index(monkeypatch)
+    index.index = NamespacedIndex()
+    shard = index.with_namespace("2024")
+    await index.upsert([("a", [0.0] * 384, {})])
+    await shard.upsert([("b", [0.0] * 384, {})])
+    await shard.query([0.0] * 384)
+    assert shard.index is index.index and index.namespace is None
+    assert index.index.calls == [
+        ("upsert", {}),
+        ("upsert", {"namespace": "2024"}),
+        ("query", "2024"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_query_cache_hits_and_upsert_invalidates(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    from src.monitoring import UsageMonitor
+
+    index = _make_index(monkeypatch, PINECONE_QUERY_COST="0.25")
+    calls = 0
+    real_query = index.index.query
+
+    def query(vector: List[float], top_k: int, include_metadata: bool) -> Any:
+        nonlocal calls
+        calls += 1
+        return real_query(vector, top_k, include_metadata)
+
+    index.index.query = query
+    await index.upsert([("a", [0.0] * 384, {"text": "a"})])
+    monitor = UsageMonitor()
+    monitor.log_path = "/dev/null"
+    index.monitor = monitor
+    first = await index.query([0.0] * 384)
+    assert await index.query([0.0] * 384) == first and calls == 1
+    await index.query([0.0] * 384, top_k=2)
+    assert calls == 2
+    await index.upsert([("b", [0.0] * 384, {"text": "b"})])
+    await index.query([0.0] * 384)
+    assert calls == 3
+    assert monitor.cache_hits == {"pinecone": 1}
+    assert monitor.savings == {"pinecone": 0.25}
+    assert monitor.cache_hit_rate("pinecone") == 0.25
+
+
+@pytest.mark.asyncio
+async def test_query_racing_a_write_is_not_cached(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    index = _make_index(monkeypatch)
+    real_query = index.index.query
+
+    def query(vector: List[float], top_k: int, include_metadata: bool) -> Any:
+        index.cache.invalidate(None)
+        return real_query(vector, top_k, include_metadata)
+
+    index.index.query = query
+    await index.query([0.0] * 384)
+    assert index.cache.stats()["entries"] == 0
+
+
+@pytest.mark.asyncio
+async def test_create_resolves_host_once(monkeypatch: pytest.MonkeyPatch) -> None:
+    import asyncio
+
+    import src.pinecone_index as pi
+
+    clients: List[Any] = []
+
+    class RecordingPinecone(DummyPinecone):
+        def __init__(self, api_key: str, **kwargs: Any) -> None:
+            super().__init__(api_key)
+            self.kwargs = kwargs
+            self.index_kwargs: Dict[str, Any] = {}
+            self.lists = 0
+            clients.append(self)
+
+        def list_indexes(self) -> List[Any]:
+            self.lists += 1
+            return []
+
+        def Index(self, name: str, **kwargs: Any) -> DummyIndex:  # noqa: N802
+            self.index_kwargs = kwargs
+            return super().Index(name)
+
+    monkeypatch.setattr(pi, "Pinecone", RecordingPinecone)
+    monkeypatch.setenv("PINECONE_API_KEY", "k")
+    monkeypatch.setenv("PINECONE_INDEX_NAME", "i")
+    monkeypatch.setenv("PINECONE_POOL_THREADS", "16")
+    await asyncio.gather(*(PineconeIndex.create() for _ in range(4)))
+    assert sum(len(c.created) for c in clients) == 1
+    assert sum(c.lists for c in clients) == 1
+    assert clients[0].kwargs == {"pool_threads": 16}
+    assert clients[0].index_kwargs == {
+        "host": "i.svc",
+        "pool_threads": 16,
+        "connection_pool_maxsize": 16,
+    }
+    pi._HOSTS.clear()
+    monkeypatch.setenv("PINECONE_INDEX_HOST", "configured.svc")
+    PineconeIndex()
+    assert clients[-1].lists == 0
+    assert clients[-1].index_kwargs["host"] == "configured.svc"
+
+
+def test_concurrent_create_race_is_tolerated() -> None:
+    import src.pinecone_index as pi
+
+    class RacingPinecone(DummyPinecone):
+        def __init__(self) -> None:
+            super().__init__("k")
+            self.names: List[str] = []
+
+        def list_indexes(self) -> List[Any]:
+            return [types.SimpleNamespace(name=n) for n in self.names]
+
+        def create_index(self, name: str, **kwargs: Any) -> None:
+            self.names.append(name)
+            raise RuntimeError("already exists")
+
+    assert pi._describe_or_create(RacingPinecone(), "i", 384) == "i.svc"
+    with pytest.raises(RuntimeError):
+        pi._describe_or_create(DummyFailing(), "i", 384)
+
+
+class DummyFailing(DummyPinecone):
+    def __init__(self) -> None:
+        super().__init__("k")
+
+    def create_index(self, name: str, **kwargs: Any) -> None:
+        raise RuntimeError("quota")
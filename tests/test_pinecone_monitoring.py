@@ -23,16 +23,21 @@ class DummyIndex:
 
 
 class DummyPinecone:
-    def __init__(self, api_key: str) -> None:
+    def __init__(self, api_key: str, **kwargs: Any) -> None:
         self.storage: Dict[str, DummyIndex] = {}
+        self.created: List[str] = []
 
     def list_indexes(self) -> List[Any]:
         return []
 
     def create_index(self, name: str, dimension: int, metric: str, spec: Any) -> None:
+        self.created.append(name)
         self.storage[name] = DummyIndex()
 
-    def Index(self, name: str) -> DummyIndex:  # noqa: N802
+    def describe_index(self, name: str) -> Any:
+        return types.SimpleNamespace(host=f"{name}.svc")
+
+    def Index(self, name: str, **kwargs: Any) -> DummyIndex:  # noqa: N802
         return self.storage.setdefault(name, DummyIndex())
 
 
@@ -0,0 +1,189 @@
+import asyncio
+import json
+import re
+import sys
+import types
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+sys.modules.setdefault("PyPDF2", types.SimpleNamespace(PdfReader=None))
+
+from src.document_store import DocumentStore  # noqa: E402
+from src.exceptions import EmbeddingError, IndexingError  # noqa: E402
+from src.ingestion import IngestionPipeline  # noqa: E402
+from src.local_index import ExactIndex  # noqa: E402
+from src.propositionizer import Propositionizer  # noqa: E402
+from src.splitter import RuleSplitter  # noqa: E402
+
+
+class SlowEmbedder:
+    def __init__(self, fail_on: str = "") -> None:
+        self.batches: List[List[str]] = []
+        self.fail_on = fail_on
+
+    async def embed_bulk(self, texts: List[str]) -> np.ndarray:
+        await asyncio.sleep(0.01)
+        if any(self.fail_on and self.fail_on in text for text in texts):
+            raise EmbeddingError("encoder failed")
+        self.batches.append(texts)
+        return np.ones((len(texts), 4), dtype=np.float32)
+
+
+def _write(root: Path, count: int, words: int = 40) -> List[Path]:
+    paths = []
+    for n in range(count):
+        path = root / f"doc{n}.txt"
+        path.write_text(" ".join(f"w{n}x{i}" for i in range(words)))
+        paths.append(path)
+    return paths
+
+
+@pytest.mark.asyncio
+async def test_pipeline_ingests_every_chunk_with_bounded_queues(
+    tmp_path: Path,
+) -> None:
+    paths = _write(tmp_path, 6)
+    index, embedder = ExactIndex(dimension=4), SlowEmbedder()
+    pipeline = IngestionPipeline(
+        embedder=embedder,
+        index=index,
+        parse_workers=3,
+        queue_size=2,
+        batch_size=4,
+        max_chars=60,
+    )
+    progress = []
+    report = await pipeline.run(
+        paths, tmp_path, on_progress=progress.append, interval=0.005
+    )
+    assert not report.failed
+    assert report.chunks == report.upserted == len(index)
+    assert all(len(batch) <= 4 for batch in embedder.batches)
+    assert report.stages["parse"].items == 6
+    assert report.stages["upsert"].items == len(embedder.batches)
+    assert all(s.max_depth <= 2 for s in report.stages.values())
+    assert report.stages["chunk"].blocked > 0
+    assert progress and len(report.summary()) == 4
+    matches = await index.query(np.ones(4, dtype=np.float32), top_k=len(index))
+    sources = {m["metadata"]["source"] for m in matches}
+    assert sources == {p.name for p in paths}
+    assert all(m["metadata"]["text"] for m in matches)
+    assert sorted(report.sources) == sorted(p.name for p in paths)
+    assert sum(len(ids) for ids in report.sources.values()) == len(index)
+
+
+@pytest.mark.asyncio
+async def test_pipeline_records_failures_and_continues(tmp_path: Path) -> None:
+    paths = _write(tmp_path, 3, words=3)
+    missing = tmp_path / "gone.txt"
+    documents = DocumentStore()
+    index = ExactIndex(dimension=4)
+    pipeline = IngestionPipeline(
+        embedder=SlowEmbedder(fail_on="w1x"),
+        index=index,
+        documents=documents,
+        batch_size=1,
+    )
+    outside = tmp_path.parent / "outside.txt"
+    report = await pipeline.run([*paths, missing, outside], tmp_path / ".")
+    assert set(report.failed) == {"doc1.txt", "gone.txt", str(outside)}
+    assert "outside.txt" not in report.sources
+    assert report.upserted == len(index) == 2
+    match = (await index.query(np.ones(4, dtype=np.float32)))[0]
+    assert set(match["metadata"]) == {"source"}
+    assert (await documents.get_many([match["id"]]))[match["id"]].text
+    documents.close()
+
+
+@pytest.mark.asyncio
+async def test_pipeline_splits_files_selected_for_rules(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("SPLITTER_MODES", ".md=llm")
+    plain = tmp_path / "plain.txt"
+    plain.write_text("First sentence here. Second sentence here.")
+    notes = tmp_path / "notes.md"
+    notes.write_text("Needs a model.")
+    index = ExactIndex(dimension=4)
+    pipeline = IngestionPipeline(
+        embedder=SlowEmbedder(), index=index, splitter=RuleSplitter(min_chars=0)
+    )
+    report = await pipeline.run([plain, notes], tmp_path)
+    assert report.failed == {str(notes): "LLM propositionizer not configured"}
+    matches = await index.query(np.ones(4, dtype=np.float32), top_k=5)
+    assert len(matches) == len(report.sources["plain.txt"]) == 2
+    for match in matches:
+        meta = match["metadata"]
+        assert plain.read_text()[meta["start"] : meta["end"]] == meta["text"]
+        assert match["id"] in report.sources["plain.txt"]
+
+
+class QuotingClient:
+    """Answers with one proposition per sentence, quoting the sentence."""
+
+    model = "test-model"
+
+    def __init__(self) -> None:
+        self.prompts: List[str] = []
+
+    async def complete(self, prompt: str) -> str:
+        self.prompts.append(prompt)
+        passages = re.findall(r"<passage id=(\d+)>\n(.*?)\n</passage>", prompt, re.S)
+        body = {
+            "passages": [
+                {
+                    "id": int(n),
+                    "propositions": [
+                        {"text": s.strip().upper(), "quote": s.strip()}
+                        for s in re.findall(r"[^.]+\.", text)
+                    ],
+                }
+                for n, text in passages
+            ]
+        }
+        return json.dumps(body)
+
+
+@pytest.mark.asyncio
+async def test_pipeline_propositionizes_per_file_type(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("SPLITTER_MODES", ".md=llm")
+    notes = tmp_path / "notes.md"
+    notes.write_text("\n\n".join(f"Fact {n} holds." for n in range(6)))
+    plain = tmp_path / "plain.txt"
+    plain.write_text("First sentence here. Second sentence here.")
+    client, index = QuotingClient(), ExactIndex(dimension=4)
+    pipeline = IngestionPipeline(
+        embedder=SlowEmbedder(),
+        index=index,
+        propositionizer=Propositionizer(
+            client=client, passage_chars=30, batch_size=2, concurrency=2
+        ),
+        splitter=RuleSplitter(min_chars=0),
+        parse_workers=1,
+        batch_size=4,
+    )
+    report = await pipeline.run([notes, plain], tmp_path)
+    assert not report.failed and report.upserted == len(index) == 8
+    assert len(client.prompts) == 2
+    matches = await index.query(np.ones(4, dtype=np.float32), top_k=8)
+    by_source = {}
+    for match in matches:
+        meta = match["metadata"]
+        source = (tmp_path / meta["source"]).read_text()
+        assert source[meta["start"] : meta["end"]].upper() == meta["text"].upper()
+        by_source.setdefault(meta["source"], []).append(match["id"])
+    assert sorted(by_source["notes.md"]) == sorted(report.sources["notes.md"])
+    assert len(by_source["plain.txt"]) == 2
+    assert all("-p" in _id for _id in report.sources["plain.txt"])
+
+
+def test_rejects_non_positive_settings() -> None:
+    with pytest.raises(IndexingError):
+        IngestionPipeline(embedder=SlowEmbedder(), index=None, queue_size=0)
@@ -0,0 +1,153 @@
+import asyncio
+import json
+import re
+import sys
+from pathlib import Path
+from typing import List
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src.exceptions import OpenRouterError  # noqa: E402
+from src.propositionizer import (  # noqa: E402
+    PropositionCache,
+    Propositionizer,
+    parse_output,
+    proposition_records,
+    split_passages,
+)
+
+_PASSAGE = re.compile(r"<passage id=(\d+)>\n(.*?)\n</passage>", re.S)
+
+
+class SentenceClient:
+    """Answers with one proposition per sentence, quoting the sentence."""
+
+    model = "test-model"
+
+    def __init__(self, garble: str = "") -> None:
+        self.prompts: List[str] = []
+        self.active = self.peak = 0
+        self.garble = garble
+
+    async def complete(self, prompt: str) -> str:
+        self.prompts.append(prompt)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        passages = _PASSAGE.findall(prompt)
+        if self.garble and len(passages) > 1:
+            passages = [p for p in passages if self.garble not in p[1]]
+        body = {
+            "passages": [
+                {
+                    "id": int(n),
+                    "propositions": [
+                        {"text": s.upper(), "quote": s}
+                        for s in re.findall(r"[^.]+\.", text)
+                    ],
+                }
+                for n, text in passages
+            ]
+        }
+        return f"```json\n{json.dumps(body)}\n```"
+
+
+def test_split_passages_keeps_offsets() -> None:
+    text = "Alpha one.\n\n  Beta two.\n\nGamma three is longer than the limit."
+    passages = split_passages(text, 24)
+    assert [p.text for p in passages] == [
+        "Alpha one.\n\n  Beta two.",
+        "Gamma three is longer",
+        "than the limit.",
+    ]
+    assert all(text[p.start : p.end] == p.text for p in passages)
+
+
+def test_parse_output_tolerates_bad_entries() -> None:
+    reply = json.dumps(
+        {
+            "passages": [
+                {"id": 1, "propositions": [{"text": "B", "quote": "missing"}]},
+                {"id": 7, "propositions": []},
+                {"id": 0, "propositions": "oops"},
+            ]
+        }
+    )
+    parsed = parse_output(f"Sure! {reply}", ["a", "bb"])
+    assert parsed[0] is None
+    assert [(p.text, p.start, p.end) for p in parsed[1]] == [("B", 0, 2)]
+    assert parse_output("no json here", ["a"]) == [None]
+
+
+@pytest.mark.asyncio
+async def test_batches_limit_concurrency_and_offsets(tmp_path: Path) -> None:
+    text = "\n\n".join(f"Fact {n} holds. It matters." for n in range(12))
+    client = SentenceClient()
+    cache = PropositionCache(path=str(tmp_path / "props.sqlite3"))
+    props = Propositionizer(
+        client, cache=cache, passage_chars=30, batch_size=3, concurrency=2
+    )
+    result = await props.propositionize(text)
+    assert props.requests == 4 and client.peak == 2
+    assert len(result) == 24
+    assert result[2].text == "FACT 1 HOLDS."
+    assert text[result[2].start : result[2].end] == "Fact 1 holds."
+
+    again = Propositionizer(client, cache=cache, passage_chars=30)
+    assert await again.propositionize(text) == result
+    assert again.requests == 0 and cache.stats()["hits"] == 12
+    cache.close()
+
+    records = proposition_records("a.txt", result)
+    assert records[0][2] == {"source": "a.txt", "start": 0, "end": 13}
+    assert len({_id for _id, _, _ in records}) == 24
+
+
+@pytest.mark.asyncio
+async def test_missing_passage_is_retried_alone() -> None:
+    client = SentenceClient(garble="Second")
+    props = Propositionizer(client, passage_chars=20, batch_size=4)
+    result = await props.propositionize("First one.\n\nSecond one.")
+    assert [p.text for p in result] == ["FIRST ONE.", "SECOND ONE."]
+    assert props.requests == 2
+
+    class Broken(SentenceClient):
+        async def complete(self, prompt: str) -> str:
+            return "not json"
+
+    with pytest.raises(OpenRouterError):
+        await Propositionizer(Broken(), passage_chars=20).propositionize("Hi.")
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_keeps_finished_batches_and_cancels_the_rest(
+    tmp_path: Path,
+) -> None:
+    class Failing(SentenceClient):
+        cancelled = 0
+
+        async def complete(self, prompt: str) -> str:
+            if "Slow" in prompt:
+                try:
+                    await asyncio.sleep(10)
+                except asyncio.CancelledError:
+                    self.cancelled += 1
+                    raise
+            if "Bad" in prompt:
+                await asyncio.sleep(0.05)
+                raise OpenRouterError("rejected")
+            return await super().complete(prompt)
+
+    client = Failing()
+    cache = PropositionCache(path=str(tmp_path / "props.sqlite3"))
+    props = Propositionizer(client, cache=cache, passage_chars=12, batch_size=1)
+    with pytest.raises(OpenRouterError, match="rejected"):
+        await props.propositionize("Good one.\n\nBad one.\n\nSlow one.")
+    assert client.cancelled == 1
+    again = Propositionizer(SentenceClient(), cache=cache, passage_chars=12)
+    assert [p.text for p in await again.propositionize("Good one.")] == ["GOOD ONE."]
+    assert again.requests == 0
+    cache.close()
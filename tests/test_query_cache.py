@@ -0,0 +1,54 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src import query_cache  # noqa: E402
+from src.query_cache import QueryCache  # noqa: E402
+
+
+def test_key_scopes_and_quantization() -> None:
+    cache = QueryCache(decimals=None)
+    base = cache.key([0.1, 0.2], top_k=1)
+    assert base == cache.key([0.1, 0.2], top_k=1, filter=None)
+    assert base != cache.key([0.1, 0.2], top_k=2)
+    assert base != cache.key([0.1, 0.2], top_k=1, namespace="ns")
+    assert base != cache.key([0.1, 0.2], top_k=1, filter={"source": "a"})
+    assert base != cache.key([0.1, 0.2000001], top_k=1)
+    rounded = QueryCache(decimals=3)
+    assert rounded.key([0.1, 0.2], top_k=1) == rounded.key([0.1, 0.2000001], top_k=1)
+
+
+def test_ttl_lru_and_invalidation(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = [100.0]
+    monkeypatch.setattr(query_cache.time, "monotonic", lambda: now[0])
+    cache = QueryCache(max_entries=2, ttl=10, decimals=None)
+    cache.put("a", [{"id": "a"}], namespace=None)
+    cache.put("b", [{"id": "b"}], namespace="ns")
+    assert cache.get("a") == [{"id": "a"}]
+    cache.put("c", [], namespace=None)
+    assert cache.get("b") is None
+    cache.invalidate(None)
+    assert cache.get("a") is None and cache.get("c") is None
+    cache.put("d", [], namespace="ns")
+    now[0] += 11
+    assert cache.get("d") is None
+    assert cache.stats() == {"hits": 1, "misses": 4, "entries": 0}
+    disabled = QueryCache(max_entries=0)
+    disabled.put("a", [], namespace=None)
+    assert disabled.get("a") is None
+
+
+def test_stale_generation_is_dropped_and_entries_are_copied() -> None:
+    cache = QueryCache(decimals=None)
+    generation = cache.generation("ns")
+    cache.invalidate("ns")
+    cache.put("a", [{"id": "a", "metadata": {}}], namespace="ns", generation=generation)
+    assert cache.get("a") is None
+    matches = [{"id": "a", "metadata": {"text": "x"}}]
+    cache.put("a", matches, namespace="ns", generation=cache.generation("ns"))
+    matches[0]["metadata"]["text"] = "changed"
+    cache.get("a")[0]["metadata"]["text"] = "mutated"
+    assert cache.get("a") == [{"id": "a", "metadata": {"text": "x"}}]
@@ -0,0 +1,83 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src.exceptions import IndexingError  # noqa: E402
+from src.local_index import ExactIndex  # noqa: E402
+from src.reduction import (  # noqa: E402
+    ReducedStore,
+    VectorReducer,
+    neighbor_recall,
+    recall_report,
+)
+
+
+def _low_rank(rng: np.random.Generator, n: int) -> np.ndarray:
+    """Vectors in 16 dims whose variance lives in 4 directions."""
+    basis = rng.standard_normal((4, 16))
+    data = rng.standard_normal((n, 4)) @ basis + 0.01 * rng.standard_normal((n, 16))
+    return data.astype(np.float32)
+
+
+def test_pca_keeps_recall_and_round_trips(tmp_path: Path) -> None:
+    rng = np.random.default_rng(0)
+    corpus = _low_rank(rng, 200)
+    queries = corpus[:50] + 0.01 * rng.standard_normal((50, 16)).astype(np.float32)
+    ids = [str(i) for i in range(200)]
+    relevant = [{str(i)} for i in range(50)]
+    reducer = VectorReducer.fit_pca(corpus, 4)
+    report = recall_report(reducer, corpus, ids, queries, relevant, ks=(1, 5))
+    assert report["full"][1] == 1.0
+    assert report["reduced"][5] >= 0.9
+    reduced = reducer.transform(corpus[:3])
+    assert reduced.shape == (3, 4)
+    assert np.allclose(np.linalg.norm(reduced, axis=1), 1.0, atol=1e-5)
+
+    path = tmp_path / "reducer.npz"
+    reducer.save(path)
+    loaded = VectorReducer.load(path)
+    assert np.allclose(loaded.transform(corpus[:3]), reduced)
+
+
+def test_neighbor_recall_on_held_out_rows() -> None:
+    rng = np.random.default_rng(1)
+    sample = _low_rank(rng, 300)
+    fitted, held = sample[:200], sample[200:]
+    recall = neighbor_recall(VectorReducer.fit_pca(fitted, 4), held[20:], held[:20])
+    assert recall[1] >= 0.8 and recall[10] >= 0.9
+    coarse = neighbor_recall(VectorReducer.truncate(16, 1), held[20:], held[:20])
+    assert coarse[10] < recall[10]
+
+
+def test_truncate_and_validation(tmp_path: Path) -> None:
+    reducer = VectorReducer.truncate(4, 2)
+    assert np.allclose(reducer.transform([[3.0, 4.0, 9.0, 9.0]]), [[0.6, 0.8]])
+    reducer.save(tmp_path / "t.npz")
+    assert VectorReducer.load(tmp_path / "t.npz").kind == "truncate"
+    with pytest.raises(IndexingError):
+        reducer.transform([[1.0, 2.0]])
+    with pytest.raises(IndexingError):
+        VectorReducer.truncate(4, 5)
+    with pytest.raises(IndexingError):
+        VectorReducer("pca", 4, 2)
+    with pytest.raises(IndexingError):
+        VectorReducer.fit_pca(np.ones((2, 4)), 3)
+    with pytest.raises(IndexingError):
+        VectorReducer.load(tmp_path / "missing.npz")
+
+
+@pytest.mark.asyncio
+async def test_reduced_store_transforms_writes_and_queries() -> None:
+    store = ReducedStore(ExactIndex(dimension=2), VectorReducer.truncate(3, 2))
+    await store.upsert([("a", [1.0, 0.0, 5.0], {}), ("b", [0.0, 1.0, 5.0], {})])
+    assert (await store.query([0.9, 0.1, -5.0]))[0]["id"] == "a"
+    rows = await store.query_many([[0.0, 1.0, 0.0]])
+    assert rows[0].matches[0]["id"] == "b"
+    await store.delete(["a"])
+    assert [m["id"] for m in await store.query([1.0, 0.0, 0.0], top_k=2)] == ["b"]
+    with pytest.raises(IndexingError):
+        await store.upsert([])
@@ -0,0 +1,87 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src.exceptions import IndexingError  # noqa: E402
+from src.local_index import ExactIndex  # noqa: E402
+from src.sharded_index import ShardedIndex, route_by_field, route_by_hash  # noqa: E402
+
+
+class SlowIndex(ExactIndex):
+    async def query(self, vector, *, top_k=1, retries=3):
+        await asyncio.sleep(1)
+        return await super().query(vector, top_k=top_k)
+
+
+def _sharded(**kwargs) -> ShardedIndex:
+    shards = {"2023": ExactIndex(dimension=2), "2024": ExactIndex(dimension=2)}
+    return ShardedIndex(shards, route_by_field("year", default="2024"), **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_routes_upserts_and_merges_top_k() -> None:
+    index = _sharded()
+    await index.upsert(
+        [
+            ("a", [1.0, 0.0], {"year": "2023"}),
+            ("b", [0.8, 0.2], {}),
+            ("c", [0.0, 1.0], {"year": "2023"}),
+        ]
+    )
+    assert len(index.shards["2023"]) == 2 and len(index.shards["2024"]) == 1
+    result = await index.query_shards([1.0, 0.0], top_k=2)
+    assert [m["id"] for m in result.matches] == ["a", "b"]
+    assert set(result.latencies) == {"2023", "2024"} and not result.partial
+    only_new = await index.query([1.0, 0.0], top_k=3, shards=["2024"])
+    assert [m["id"] for m in only_new] == ["b"]
+    rows = await index.query_many([[1.0, 0.0], [0.0, 1.0]], top_k=1)
+    assert [r.matches[0]["id"] for r in rows] == ["a", "c"]
+    await index.delete(["a", "b"])
+    assert [m["id"] for m in await index.query([1.0, 0.0], top_k=3)] == ["c"]
+
+
+@pytest.mark.asyncio
+async def test_timed_out_shard_yields_partial_results() -> None:
+    slow = SlowIndex(dimension=2)
+    await slow.upsert([("s", [1.0, 0.0], {})])
+    index = _sharded(timeout=0.05)
+    index.shards["old"] = slow
+    await index.upsert([("a", [0.5, 0.5], {})])
+    result = await index.query_shards([1.0, 0.0], top_k=2)
+    assert [m["id"] for m in result.matches] == ["a"]
+    assert result.errors == {"old": "timeout"} and result.partial
+    with pytest.raises(IndexingError, match="all shards failed"):
+        await index.query([1.0, 0.0], shards=["old"])
+
+
+@pytest.mark.asyncio
+async def test_routing_and_selection_errors() -> None:
+    index = _sharded()
+    with pytest.raises(IndexingError, match="unknown shard"):
+        await index.upsert([("a", [1.0, 0.0], {"year": "1999"})])
+    with pytest.raises(IndexingError):
+        await index.query([1.0, 0.0], shards=["1999"])
+    with pytest.raises(IndexingError):
+        ShardedIndex({}, route_by_hash(["x"]))
+    router = route_by_hash(["x", "y"])
+    assert router("id-1", {}) == router("id-1", {"other": 1})
+
+
+@pytest.mark.asyncio
+async def test_rerouted_id_leaves_its_old_shard() -> None:
+    index = _sharded()
+    stale = ExactIndex(dimension=2)
+    await stale.upsert([("b", [1.0, 0.0], {})])
+    index.shards["old"] = stale
+    await index.upsert([("a", [1.0, 0.0], {"year": "2023"}), ("b", [0.0, 1.0], {})])
+    assert len(stale) == 1
+    await index.prune_other_shards({"b": "2024"})
+    assert len(stale) == 0 and len(index.shards["2024"]) == 1
+    await index.upsert([("a", [1.0, 0.0], {"year": "2024"})])
+    assert len(index.shards["2023"]) == 0 and len(index.shards["2024"]) == 2
+    assert [m["id"] for m in await index.query([1.0, 0.0], top_k=3)] == ["a", "b"]
+    assert ShardedIndex(index.shards, index.router, timeout=0).timeout == 0
@@ -0,0 +1,69 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src.exceptions import OpenRouterError  # noqa: E402
+from src.splitter import (  # noqa: E402
+    RuleSplitter,
+    select_propositionizer,
+    sentence_spans,
+    splitter_modes,
+)
+
+
+def test_sentence_spans_respect_abbreviations_and_blank_lines() -> None:
+    text = (
+        "Dr. Smith met J. Doe in the U.S. on Jan. 5. They agreed, e.g. on "
+        'price. "Was it useful?" Yes!\nwrapped line\n  \nLast paragraph'
+    )
+    sentences = [text[s:e] for s, e in sentence_spans(text)]
+    assert sentences == [
+        "Dr. Smith met J. Doe in the U.S. on Jan. 5.",
+        "They agreed, e.g. on price.",
+        '"Was it useful?"',
+        "Yes!",
+        "wrapped line",
+        "Last paragraph",
+    ]
+
+
+def test_long_sentences_split_at_clauses_then_windows() -> None:
+    text = (
+        "The committee met on Monday; it reviewed the budget, and it approved "
+        "the plan. " + "Word " * 30
+    )
+    pieces = RuleSplitter(max_chars=40, min_chars=0).split(text)
+    assert [p.text for p in pieces[:3]] == [
+        "The committee met on Monday;",
+        "it reviewed the budget,",
+        "and it approved the plan.",
+    ]
+    assert all(len(p.text) <= 40 for p in pieces)
+    assert all(text[p.start : p.end] == p.text for p in pieces)
+
+
+@pytest.mark.asyncio
+async def test_short_pieces_merge_with_neighbours() -> None:
+    text = "Yes. No. This sentence is long enough to stand alone."
+    pieces = await RuleSplitter(max_chars=80, min_chars=10).propositionize(text)
+    assert [p.text for p in pieces] == [text]
+    with pytest.raises(ValueError):
+        RuleSplitter(max_chars=10, min_chars=20)
+
+
+def test_select_propositionizer_by_file_type(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    rules, llm = RuleSplitter(), object()
+    monkeypatch.setenv("SPLITTER_MODES", ".PDF=llm, .txt=rules,bad")
+    assert splitter_modes() == {".pdf": "llm", ".txt": "rules"}
+    assert select_propositionizer(Path("a.pdf"), llm, rules) is llm
+    assert select_propositionizer(Path("a.md"), llm, rules) is rules
+    with pytest.raises(OpenRouterError):
+        select_propositionizer(Path("a.pdf"), None, rules)
+    monkeypatch.setenv("SPLITTER_DEFAULT_MODE", "magic")
+    with pytest.raises(ValueError):
+        select_propositionizer(Path("a.md"), llm, rules)
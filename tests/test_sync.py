@@ -0,0 +1,134 @@
+import os
+import sys
+import types
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+sys.modules.setdefault("PyPDF2", types.SimpleNamespace(PdfReader=None))
+
+from src.dedup import NearDuplicateFilter  # noqa: E402
+from src.document_store import DocumentStore  # noqa: E402
+from src.exceptions import EmbeddingError  # noqa: E402
+from src.ingestion import IngestionPipeline, Manifest, sync_directory  # noqa: E402
+from src.ingestion.pipeline import vector_id  # noqa: E402
+from src.local_index import ExactIndex  # noqa: E402
+
+
+class CountingEmbedder:
+    def __init__(self) -> None:
+        self.texts: List[str] = []
+
+    async def embed_bulk(self, texts: List[str]) -> np.ndarray:
+        self.texts += texts
+        rng = np.random.default_rng(len(self.texts))
+        return rng.standard_normal((len(texts), 4)).astype(np.float32)
+
+
+async def _sync(root: Path, embedder, index, manifest, **kwargs):
+    pipeline = IngestionPipeline(embedder=embedder, index=index, **kwargs)
+    return await sync_directory(root, pipeline=pipeline, manifest=manifest)
+
+
+@pytest.mark.asyncio
+async def test_sync_reprocesses_only_changed_files(tmp_path: Path) -> None:
+    root = tmp_path / "docs"
+    root.mkdir()
+    (root / "a.txt").write_text("alpha " * 5)
+    (root / "b.txt").write_text("beta " * 5)
+    (root / "skip.bin").write_bytes(b"\0")
+    embedder, index = CountingEmbedder(), ExactIndex(dimension=4)
+    manifest = Manifest(path=str(tmp_path / "manifest.sqlite3"))
+
+    report = await _sync(root, embedder, index, manifest, max_chars=10)
+    assert report.added == ["a.txt", "b.txt"]
+    assert report.upserted == len(index) > 2
+    chunks = {src: len(e.vector_ids) for src, e in (await manifest.entries()).items()}
+
+    embedded = len(embedder.texts)
+    report = await _sync(root, embedder, index, manifest, max_chars=10)
+    assert report.unchanged == 2 and not report.added and not report.modified
+    assert len(embedder.texts) == embedded
+
+    os.utime(root / "b.txt", ns=(1, 1))
+    report = await _sync(root, embedder, index, manifest, max_chars=10)
+    assert report.unchanged == 2 and len(embedder.texts) == embedded
+    assert (await manifest.entries())["b.txt"].mtime_ns == 1
+
+    (root / "a.txt").write_text("gamma")
+    (root / "b.txt").unlink()
+    report = await _sync(root, embedder, index, manifest, max_chars=10)
+    assert report.modified == ["a.txt"] and report.removed == ["b.txt"]
+    assert report.deleted == chunks["a.txt"] - 1 + chunks["b.txt"]
+    assert len(index) == 1
+    matches = await index.query(np.ones(4, dtype=np.float32), top_k=5)
+    assert [m["id"] for m in matches] == [vector_id("a.txt", 0)]
+    assert matches[0]["metadata"]["text"] == "gamma"
+    assert set(await manifest.entries()) == {"a.txt"}
+    manifest.close()
+
+
+@pytest.mark.asyncio
+async def test_sync_moves_text_to_document_store(tmp_path: Path) -> None:
+    (tmp_path / "a.txt").write_text("alpha")
+    index, documents = ExactIndex(dimension=4), DocumentStore()
+    report = await _sync(
+        tmp_path,
+        CountingEmbedder(),
+        index,
+        Manifest(path=":memory:"),
+        documents=documents,
+    )
+    assert report.added == ["a.txt"]
+    match = (await index.query(np.ones(4, dtype=np.float32)))[0]
+    assert match["metadata"] == {"source": "a.txt"}
+    assert (await documents.get_many([match["id"]]))[match["id"]].text == "alpha"
+    documents.close()
+
+
+@pytest.mark.asyncio
+async def test_failed_file_is_retried_next_sync(tmp_path: Path) -> None:
+    class FlakyEmbedder(CountingEmbedder):
+        fail = True
+
+        async def embed_bulk(self, texts: List[str]) -> np.ndarray:
+            if self.fail:
+                raise EmbeddingError("down")
+            return await super().embed_bulk(texts)
+
+    (tmp_path / "a.txt").write_text("alpha")
+    embedder, manifest = FlakyEmbedder(), Manifest(path=":memory:")
+    index = ExactIndex(dimension=4)
+    report = await _sync(tmp_path, embedder, index, manifest)
+    assert report.failed == {"a.txt": "down"}
+    assert (await manifest.entries())["a.txt"].digest == ""
+    embedder.fail = False
+    report = await _sync(tmp_path, embedder, index, manifest)
+    assert report.added == ["a.txt"] and len(index) == 1
+    assert (await manifest.entries())["a.txt"].vector_ids == [vector_id("a.txt", 0)]
+
+
+@pytest.mark.asyncio
+async def test_sync_reingests_duplicates_of_removed_files(tmp_path: Path) -> None:
+    text = "the garden needs water every morning before the sun gets hot"
+    (tmp_path / "a.txt").write_text(text)
+    (tmp_path / "b.txt").write_text(text)
+    (tmp_path / "c.txt").write_text("an unrelated note")
+    embedder, index = CountingEmbedder(), ExactIndex(dimension=4)
+    manifest, dedup = Manifest(path=":memory:"), NearDuplicateFilter()
+    kwargs = dict(dedup=dedup, parse_workers=1)
+
+    report = await _sync(tmp_path, embedder, index, manifest, **kwargs)
+    assert report.pipeline.duplicates == 1 and len(index) == 2
+    assert await dedup.canonical_of([vector_id("b.txt", 0)])
+
+    (tmp_path / "a.txt").unlink()
+    report = await _sync(tmp_path, embedder, index, manifest, **kwargs)
+    assert report.removed == ["a.txt"] and report.modified == ["b.txt"]
+    matches = await index.query(np.ones(4, dtype=np.float32), top_k=5)
+    assert {m["id"] for m in matches} == {vector_id(s, 0) for s in ("b.txt", "c.txt")}
+    assert not await dedup.canonical_of([vector_id("b.txt", 0)])
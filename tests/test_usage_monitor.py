@@ -30,6 +30,17 @@ async def test_monitor_logs_and_alerts(tmp_path: Path) -> None:
         assert len(f.readlines()) == 3
 
 
+def test_record_cache_tracks_hit_rate_and_savings() -> None:
+    monitor = UsageMonitor()
+    assert monitor.cache_hit_rate("pinecone") == 0.0
+    monitor.record_cache("pinecone", hit=True, saved=0.5)
+    monitor.record_cache("pinecone", hit=False, saved=0.5)
+    assert monitor.cache_hit_rate("pinecone") == 0.5
+    assert monitor.savings == {"pinecone": 0.5}
+    with pytest.raises(MonitoringError):
+        monitor.record_cache("", hit=True)
+
+
 @pytest.mark.asyncio
 async def test_dashboard_retry_failure(
     monkeypatch: pytest.MonkeyPatch, tmp_path: Path
@@ -0,0 +1,48 @@
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src.exceptions import IndexingError  # noqa: E402
+from src.local_index import ExactIndex, HnswIndex  # noqa: E402
+from src.vector_store import create_vector_store  # noqa: E402
+
+
+def test_backend_selected_by_configuration(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("VECTOR_STORE_BACKEND", "exact")
+    assert isinstance(create_vector_store(dimension=8), ExactIndex)
+    monkeypatch.setenv("HNSW_M", "8")
+    store = create_vector_store("hnsw")
+    assert isinstance(store, HnswIndex) and store.m == 8
+
+
+def test_pinecone_backend(monkeypatch: pytest.MonkeyPatch) -> None:
+    import src.pinecone_index as pi
+
+    built = []
+    monkeypatch.setattr(
+        pi, "PineconeIndex", lambda **kw: built.append(kw) or types.SimpleNamespace()
+    )
+    monkeypatch.delenv("VECTOR_STORE_BACKEND", raising=False)
+    create_vector_store(dimension=16)
+    assert built == [{"dimension": 16, "monitor": None}]
+
+
+def test_unknown_backend() -> None:
+    with pytest.raises(IndexingError):
+        create_vector_store("faiss")
+
+
+def test_reducer_wraps_backend(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    from src.reduction import ReducedStore, VectorReducer
+
+    path = tmp_path / "reducer.npz"
+    VectorReducer.truncate(8, 4).save(path)
+    monkeypatch.setenv("VECTOR_REDUCER_PATH", str(path))
+    store = create_vector_store("exact", dimension=8)
+    assert isinstance(store, ReducedStore) and store.store.dimension == 4
+    with pytest.raises(IndexingError):
+        create_vector_store("exact", dimension=16)
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from src.vectors import as_batch, as_vector, storage_dtype, to_list
+
+
+def test_as_batch_is_contiguous_float32() -> None:
+    batch = as_batch([[1, 2], [3, 4]])
+    assert batch.dtype == np.float32
+    assert batch.flags["C_CONTIGUOUS"]
+    with pytest.raises(ValueError):
+        as_batch([1.0, 2.0])
+
+
+def test_as_vector_validates_shape() -> None:
+    assert as_vector([1.0, 2.0]).dtype == np.float32
+    with pytest.raises(ValueError):
+        as_vector([])
+
+
+def test_storage_dtype(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("VECTOR_STORAGE_DTYPE", "float16")
+    assert storage_dtype() is np.float16
+    assert storage_dtype("float32") is np.float32
+    with pytest.raises(ValueError):
+        storage_dtype("float64")
+
+
+def test_to_list_converts_at_boundary() -> None:
+    values = to_list(np.array([0.5, 0.25], dtype=np.float32))
+    assert values == [0.5, 0.25]
+    assert all(type(v) is float for v in values)